@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+
+"""\
+Benchmarks for wellmap.
+
+These benchmarks are not part of the regular test suite.  To run them:
+
+    $ pip install '.[bench]'
+    $ pytest benchmarks
+
+See the `pytest-benchmark` documentation for options to save and compare 
+results between runs.  The benchmarks in `test_pipeline.py` time each stage 
+of `wellmap.load()` separately, and also record the peak memory used by each 
+stage.  The peak memory is printed at the end of the run, and is saved in the 
+"extra_info" field of the results (e.g. with ``--benchmark-json``).
+"""
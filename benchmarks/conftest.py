@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+
+from .helpers import PEAK_MEMORY
+
+def pytest_terminal_summary(terminalreporter):
+    if not PEAK_MEMORY:
+        return
+
+    terminalreporter.section("peak memory")
+
+    width = max(len(k) for k in PEAK_MEMORY)
+    for name, peak in sorted(PEAK_MEMORY.items()):
+        terminalreporter.write_line(f"{name:<{width}}  {peak / 2**20:>10.2f} MiB")
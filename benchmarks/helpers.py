@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+import pytest
+import pandas as pd
+import tracemalloc
+
+# Peak memory usage of each benchmark that uses `benchmark_with_memory()`, in 
+# bytes.  These values are reported at the end of the test run by 
+# `pytest_terminal_summary()` in `conftest.py`.
+PEAK_MEMORY = {}
+
+@pytest.fixture
+def make_plates(tmp_path):
+    """
+    Write a layout with the given number of plates, each of which is 
+    associated with its own (empty) data file.
+    """
+
+    def _make_plates(num_plates):
+        lines = [
+                "[meta]",
+                "paths = 'plate_{}.csv'",
+                "",
+                "[row]",
+                "A.x = 1",
+                "B.x = 2",
+                "[col]",
+                "1.y = 1",
+                "2.y = 2",
+                "",
+        ]
+        for i in range(num_plates):
+            lines += [f"[plate.{i}]", f"z = {i}"]
+            (tmp_path / f'plate_{i}.csv').touch()
+
+        toml_path = tmp_path / 'layout.toml'
+        toml_path.write_text('\n'.join(lines))
+        return toml_path
+
+    return _make_plates
+
+def fake_data_loader(path):
+    """
+    Return a data frame with one row for every well in a 96-well plate, 
+    without doing any I/O.
+    """
+    return pd.DataFrame({
+        'Well': [f'{r}{c}' for r in 'ABCDEFGH' for c in range(1, 13)],
+        'Data': range(96),
+    })
+
+def benchmark_with_memory(benchmark, f, *args, **kwargs):
+    """
+    Benchmark the given function, and also record the peak amount of memory 
+    allocated while calling it.
+
+    The memory is measured in a separate call before the timed calls, because 
+    `tracemalloc` slows everything down considerably.  The result is stored in 
+    the ``peak_memory`` field of the benchmark's extra info (so it will be 
+    included in any saved results) and reported at the end of the run.
+    """
+    tracemalloc.start()
+    try:
+        f(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    benchmark.extra_info['peak_memory'] = peak
+    PEAK_MEMORY[benchmark.fullname] = peak
+
+    return benchmark(f, *args, **kwargs)
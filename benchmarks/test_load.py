@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+import wellmap
+import pytest
+
+from .helpers import *
+
+@pytest.mark.parametrize('num_paths', [1, 10, 100, 1000])
+def test_load_data_files(benchmark, make_plates, num_paths):
+    toml_path = make_plates(num_paths)
+    layout, data = benchmark(
+            wellmap.load,
+            toml_path,
+            data_loader=fake_data_loader,
+    )
+    assert len(data) == 96 * num_paths
+
+@pytest.mark.parametrize('num_shared', [1, 96])
+@pytest.mark.parametrize('num_plates', [1, 10, 100])
+def test_load_shared_plates(benchmark, tmp_path, num_plates, num_shared):
+    # The top-level layout is the same size for every plate, so the time should 
+    # scale with the number of plates, but not with the number of plates times 
+    # the number of shared wells.
+    wells = [f'{r}{c}' for r in 'ABCDEFGH' for c in range(1, 13)]
+    lines = ["[block.12x8.A1]"]
+    lines += [f"[well.{well}]\nx = {k}" for k, well in enumerate(wells[:num_shared])]
+    lines += [f"[plate.{i}]\ny = {i}" for i in range(num_plates)]
+
+    toml_path = tmp_path / 'layout.toml'
+    toml_path.write_text('\n'.join(lines))
+
+    layout = benchmark(wellmap.load, toml_path)
+    assert len(layout) == 96 * num_plates
+
+@pytest.mark.parametrize('categorical', [False, True])
+def test_load_merge(benchmark, make_plates, categorical):
+    toml_path = make_plates(100)
+    merged = benchmark(
+            wellmap.load,
+            toml_path,
+            data_loader=fake_data_loader,
+            merge_cols={'well': 'Well'},
+            categorical=categorical,
+    )
+    assert len(merged) == 4 * 100
+
+@pytest.mark.parametrize('merge', ['join', 'indices'])
+@pytest.mark.parametrize('num_time_points', [1, 100, 1000])
+def test_load_merge_time_course(benchmark, make_plates, num_time_points, merge):
+    toml_path = make_plates(10)
+
+    def data_loader(path):
+        # Only include wells that are in the layout, so that the 'indices' 
+        # merge doesn't spend time warning about unmatched wells.
+        df = fake_data_loader(path)
+        df = df[df['Well'].isin(['A1', 'A2', 'B1', 'B2'])]
+        return pd.concat([df] * num_time_points, ignore_index=True)
+
+    merged = benchmark(
+            wellmap.load,
+            toml_path,
+            data_loader=data_loader,
+            merge_cols={'well': 'Well'},
+            merge=merge,
+    )
+    assert len(merged) == 4 * 10 * num_time_points
+
+@pytest.mark.parametrize('num_plates', [1, 10, 100])
+def test_to_arrow(benchmark, make_plates, num_plates):
+    pytest.importorskip('pyarrow')
+    toml_path = make_plates(num_plates)
+    table = benchmark(wellmap.to_arrow, toml_path)
+    assert len(table) == 4 * num_plates
+
+@pytest.mark.parametrize('workers', [None, 4])
+@pytest.mark.parametrize('num_layouts', [10, 100])
+def test_load_many(benchmark, tmp_path, num_layouts, workers):
+    # Every layout includes the same 96-well file, which should only need to 
+    # be parsed once.
+    wells = [f'{r}{c}' for r in 'ABCDEFGH' for c in range(1, 13)]
+    lines = [f"[well.{well}]\nx = {k}" for k, well in enumerate(wells)]
+    (tmp_path / 'shared.toml').write_text('\n'.join(lines))
+
+    toml_paths = []
+    for i in range(num_layouts):
+        toml_path = tmp_path / f'layout_{i}.toml'
+        toml_path.write_text(f"[meta]\ninclude = 'shared.toml'\n[row.A]\ny = {i}")
+        toml_paths.append(toml_path)
+
+    df, errors = benchmark(
+            wellmap.load_many,
+            toml_paths,
+            workers=workers,
+            concat=True,
+    )
+    assert not errors
+    assert len(df) == 96 * num_layouts
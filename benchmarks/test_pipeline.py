@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+
+"""\
+Benchmark each stage of the pipeline used by `wellmap.load()`:
+
+- `config_from_toml()`: Parse the TOML files, including any includes.
+- `iter_wells_from_config()`: Work out which parameters apply to which wells.
+- `table_from_wells()`: Build a data frame from those wells.
+- `data_from_layout()`: Load and concatenate the data files.
+- `merge_layout_and_data()`: Merge the layout with the data.
+
+Each stage is benchmarked on synthetic layouts that scale along one dimension 
+at a time (wells per plate, plates, parameters, include depth, and data rows 
+per file), starting from a baseline of modest size.  The peak memory used by 
+each stage is reported at the end of the run.
+"""
+
+import wellmap
+import wellmap.file
+import pytest
+import pandas as pd
+
+from dataclasses import dataclass, replace
+from .helpers import *
+
+@dataclass(frozen=True)
+class Scale:
+    num_rows: int = 8
+    num_cols: int = 12
+    num_plates: int = 10
+    num_params: int = 10
+    include_depth: int = 1
+    num_time_points: int = 1
+
+    @property
+    def num_wells(self):
+        return self.num_rows * self.num_cols
+
+def iter_scales():
+    baseline = Scale()
+
+    plate_sizes = {384: (16, 24), 1536: (32, 48)}
+    for num_wells, (num_rows, num_cols) in plate_sizes.items():
+        yield pytest.param(
+                replace(baseline, num_rows=num_rows, num_cols=num_cols),
+                id=f'wells={num_wells}',
+        )
+
+    yield pytest.param(baseline, id='baseline')
+
+    for num_plates in [1, 100]:
+        yield pytest.param(
+                replace(baseline, num_plates=num_plates),
+                id=f'plates={num_plates}',
+        )
+    for num_params in [1, 50]:
+        yield pytest.param(
+                replace(baseline, num_params=num_params),
+                id=f'params={num_params}',
+        )
+    for include_depth in [0, 5]:
+        yield pytest.param(
+                replace(baseline, include_depth=include_depth),
+                id=f'includes={include_depth}',
+        )
+    for num_time_points in [10, 100]:
+        yield pytest.param(
+                replace(baseline, num_time_points=num_time_points),
+                id=f'time_points={num_time_points}',
+        )
+
+SCALES = list(iter_scales())
+
+@pytest.fixture(autouse=True)
+def no_include_cache(monkeypatch):
+    # Otherwise every round after the first would skip parsing the included 
+    # files.
+    monkeypatch.setattr(wellmap.file, 'include_cache', wellmap.file.IncludeCache(0))
+
+@pytest.fixture
+def make_layout(tmp_path):
+    """
+    Write a layout with the given scale.
+
+    The row and column parameters are defined in the most deeply included 
+    file.  Each file in between defines one experiment-wide parameter.  The 
+    top-level file defines the plates, each of which has its own (empty) data 
+    file.
+    """
+
+    def _make_layout(scale):
+        rows = [wellmap.row_from_i(i) for i in range(scale.num_rows)]
+        cols = [wellmap.col_from_j(j) for j in range(scale.num_cols)]
+
+        # Split the parameters between the rows and the columns.
+        row_params = range(0, scale.num_params, 2)
+        col_params = range(1, scale.num_params, 2)
+
+        lines = []
+        for i, row in enumerate(rows):
+            lines += [f"[row.{row}]"]
+            lines += [f"p{k} = {i}" for k in row_params]
+        for j, col in enumerate(cols):
+            lines += [f"[col.{col}]"]
+            lines += [f"p{k} = 'c{j}'" for k in col_params]
+
+        for depth in reversed(range(scale.include_depth)):
+            (tmp_path / f'include_{depth}.toml').write_text('\n'.join(lines))
+            lines = [
+                    "[meta]",
+                    f"include = 'include_{depth}.toml'",
+                    "[expt]",
+                    f"depth_{depth} = {depth}",
+            ]
+
+        if lines[0] == "[meta]":
+            lines.insert(1, "paths = 'plate_{}.csv'")
+        else:
+            lines = ["[meta]", "paths = 'plate_{}.csv'", *lines]
+
+        for i in range(scale.num_plates):
+            lines += [f"[plate.{i}]", f"z = {i}"]
+            (tmp_path / f'plate_{i}.csv').touch()
+
+        toml_path = tmp_path / 'layout.toml'
+        toml_path.write_text('\n'.join(lines))
+        return toml_path
+
+    return _make_layout
+
+def make_data_loader(scale):
+    """
+    Return a data loader that makes a data frame with one row for every well 
+    and time point, without doing any I/O.
+    """
+    df = pd.DataFrame({
+        'Well': [
+            wellmap.well_from_ij(i, j)
+            for i in range(scale.num_rows)
+            for j in range(scale.num_cols)
+        ] * scale.num_time_points,
+        'Data': range(scale.num_wells * scale.num_time_points),
+    })
+
+    def data_loader(path):
+        return df.copy()
+
+    return data_loader
+
+def config_from_toml(toml_path):
+    return wellmap.file.config_from_toml(toml_path, path_required=True)
+
+def wells_from_config(config, paths):
+    return list(wellmap.file.iter_wells_from_config(config, paths))
+
+def table_from_wells(plates):
+    tables = [
+            wellmap.file.table_from_wells(wells, index)
+            for plate, wells, index in plates
+    ]
+    return pd.concat(tables, sort=False)
+
+def data_from_layout(layout, data_loader):
+    return wellmap.file.data_from_layout(layout, data_loader, {})
+
+@pytest.mark.parametrize('scale', SCALES)
+def test_config_from_toml(benchmark, make_layout, scale):
+    toml_path = make_layout(scale)
+    config, paths, concats, meta = benchmark_with_memory(
+            benchmark, config_from_toml, toml_path,
+    )
+    assert len(meta.dependencies) == scale.include_depth + 1
+
+@pytest.mark.parametrize('scale', SCALES)
+def test_wells_from_config(benchmark, make_layout, scale):
+    toml_path = make_layout(scale)
+    config, paths, *_ = config_from_toml(toml_path)
+
+    plates = benchmark_with_memory(
+            benchmark, wells_from_config, config, paths,
+    )
+    assert len(plates) == scale.num_plates
+
+@pytest.mark.parametrize('scale', SCALES)
+def test_table_from_wells(benchmark, make_layout, scale):
+    toml_path = make_layout(scale)
+    config, paths, *_ = config_from_toml(toml_path)
+    plates = wells_from_config(config, paths)
+
+    layout = benchmark_with_memory(benchmark, table_from_wells, plates)
+    assert len(layout) == scale.num_wells * scale.num_plates
+
+@pytest.mark.parametrize('scale', SCALES)
+def test_data_from_layout(benchmark, make_layout, scale):
+    toml_path = make_layout(scale)
+    layout = wellmap.load(toml_path)
+    data_loader = make_data_loader(scale)
+
+    data = benchmark_with_memory(
+            benchmark, data_from_layout, layout, data_loader,
+    )
+    assert len(data) == \
+            scale.num_wells * scale.num_plates * scale.num_time_points
+
+@pytest.mark.parametrize('merge', ['join', 'indices'])
+@pytest.mark.parametrize('scale', SCALES)
+def test_merge_layout_and_data(benchmark, make_layout, scale, merge):
+    toml_path = make_layout(scale)
+    layout = wellmap.load(toml_path)
+    data = data_from_layout(layout, make_data_loader(scale))
+
+    merged = benchmark_with_memory(
+            benchmark,
+            wellmap.file.merge_layout_and_data,
+            layout, data, {'well': 'Well'}, merge,
+    )
+    assert len(merged) == \
+            scale.num_wells * scale.num_plates * scale.num_time_points
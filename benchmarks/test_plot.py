@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import wellmap
+import pytest
+import pandas as pd
+import matplotlib.pyplot as plt
+
+@pytest.mark.parametrize('superimpose_values', [False, True])
+@pytest.mark.parametrize('num_plates', [1, 8])
+def test_show_df_384(benchmark, num_plates, superimpose_values):
+    # Several 384-well plates (16 rows, 24 columns), each with a few 
+    # parameters that vary by row, column, and well.
+    df = pd.DataFrame({
+        'plate': [f'p{k}' for k in range(num_plates) for i in range(384)],
+        'row_i': [i // 24 for k in range(num_plates) for i in range(384)],
+        'col_j': [i % 24 for k in range(num_plates) for i in range(384)],
+    })
+    df['x'] = df['row_i'] % 4
+    df['y'] = df['col_j'] % 6
+    df['z'] = (df.index % 10).map(lambda i: f'z{i}')
+
+    style = wellmap.Style(superimpose_values=superimpose_values)
+
+    def show_df():
+        fig = wellmap.show_df(df, style=style)
+        plt.close(fig)
+
+    benchmark(show_df)
+
+@pytest.mark.parametrize('format', ['png', 'svg'])
+def test_show_df_1536_superimpose(benchmark, tmp_path, format):
+    # A single 1536-well plate (32 rows, 48 columns), with a value superimposed 
+    # on every well.
+    df = pd.DataFrame({
+        'row_i': [i // 48 for i in range(1536)],
+        'col_j': [i % 48 for i in range(1536)],
+    })
+    df['x'] = df.index % 100
+
+    style = wellmap.Style(superimpose_values=True)
+
+    def show_df():
+        fig = wellmap.show_df(df, style=style)
+        fig.savefig(tmp_path / f'layout.{format}')
+        plt.close(fig)
+
+    benchmark(show_df)
+
+@pytest.mark.parametrize('method', ['show', 'render'])
+def test_render_many(benchmark, tmp_path, method):
+    # Many layouts with the same arrangement of plates and parameters, like 
+    # those that would be produced by a single experimental protocol.
+    toml_paths = []
+    for i in range(20):
+        toml_path = tmp_path / f'layout_{i}.toml'
+        toml_path.write_text(f"""\
+[row]
+A.x = {i}
+B.x = {i + 1}
+[col]
+1.y = 'a'
+2.y = 'b'
+[plate.p]
+[plate.q]
+z = 1
+""")
+        toml_paths.append(toml_path)
+
+    out_dir = tmp_path / 'out'
+    out_dir.mkdir()
+
+    def show():
+        for toml_path in toml_paths:
+            fig = wellmap.show(toml_path)
+            fig.savefig(out_dir / f'{toml_path.stem}.png')
+            plt.close(fig)
+
+    def render():
+        wellmap.render(toml_paths, out_dir)
+
+    benchmark(locals()[method])
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+import wellmap
+import pytest
+
+# A 1536-well plate has 32 rows and 48 columns.
+I = [i for i in range(32) for j in range(48)]
+J = [j for i in range(32) for j in range(48)]
+ROWS = [wellmap.row_from_i(i) for i in I]
+COLS = [wellmap.col_from_j(j) for j in J]
+WELLS = [wellmap.well_from_ij(i, j) for i, j in zip(I, J)]
+WELL0S = [wellmap.well0_from_well(x) for x in WELLS]
+
+SCALAR_CONVERSIONS = [
+        (wellmap.row_from_i, [I]),
+        (wellmap.col_from_j, [J]),
+        (wellmap.i_from_row, [ROWS]),
+        (wellmap.j_from_col, [COLS]),
+        (wellmap.well_from_ij, [I, J]),
+        (wellmap.well_from_row_col, [ROWS, COLS]),
+        (wellmap.well0_from_well, [WELLS]),
+        (wellmap.row_col_from_well, [WELL0S]),
+        (wellmap.ij_from_well, [WELL0S]),
+]
+ARRAY_CONVERSIONS = [
+        (wellmap.rows_from_i, [I]),
+        (wellmap.cols_from_j, [J]),
+        (wellmap.i_from_rows, [ROWS]),
+        (wellmap.j_from_cols, [COLS]),
+        (wellmap.wells_from_ij, [I, J]),
+        (wellmap.wells_from_row_cols, [ROWS, COLS]),
+        (wellmap.well0s_from_wells, [WELLS]),
+        (wellmap.row_cols_from_wells, [WELL0S]),
+        (wellmap.ij_from_wells, [WELL0S]),
+]
+
+def convert_each(f, *args):
+    return [f(*x) for x in zip(*args)]
+
+@pytest.mark.parametrize(
+        'f, args', SCALAR_CONVERSIONS,
+        ids=[f.__name__ for f, _ in SCALAR_CONVERSIONS],
+)
+def test_scalar_conversions(benchmark, f, args):
+    benchmark(convert_each, f, *args)
+
+@pytest.mark.parametrize(
+        'f, args', ARRAY_CONVERSIONS,
+        ids=[f.__name__ for f, _ in ARRAY_CONVERSIONS],
+)
+def test_array_conversions(benchmark, f, args):
+    benchmark(f, *args)
+
+@pytest.mark.parametrize(
+        'f', [
+            lambda x: list(wellmap.iter_well_indices(x)),
+            wellmap.well_indices_from_pattern,
+        ],
+        ids=['iter_well_indices', 'well_indices_from_pattern'],
+)
+def test_pattern_expansion(benchmark, f):
+    benchmark(f, 'A1,C3,...,O23')
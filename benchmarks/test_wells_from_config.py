@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+
+import wellmap
+import pytest
+
+@pytest.mark.parametrize('engine', ['merge', 'numpy'])
+@pytest.mark.parametrize('num_params', [1, 10, 50])
+def test_wells_from_config_1536(benchmark, engine, num_params):
+    # A 1536-well plate (32 rows, 48 columns), with parameters specified at 
+    # every level of precedence.
+    config = {
+            'row': {
+                wellmap.row_from_i(i): {f'row_{k}': i for k in range(num_params)}
+                for i in range(32)
+            },
+            'col': {
+                wellmap.col_from_j(j): {f'col_{k}': j for k in range(num_params)}
+                for j in range(48)
+            },
+            'block': {
+                '4x4': {
+                    'A1,E5,...,AC45': {f'block_{k}': k for k in range(num_params)},
+                },
+            },
+            'well': {
+                'A1,B2,...,AF32': {f'well_{k}': k for k in range(num_params)},
+            },
+            'expt': {f'expt_{k}': k for k in range(num_params)},
+    }
+    wells = benchmark(wellmap.wells_from_config, config, engine=engine)
+    assert len(wells) == 1536
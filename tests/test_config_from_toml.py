@@ -70,3 +70,117 @@ def test_config_from_toml(files, kwargs, config, concats, extras, deps, style, a
 
 
 
+def test_include_extras_shared(tmp_path, monkeypatch):
+    import wellmap.file
+
+    (tmp_path / 'main.toml').write_text("""\
+[meta]
+include = 'sub.toml'
+
+[a]
+x = 1
+
+[well.A1]
+x = 1
+""")
+    (tmp_path / 'sub.toml').write_text("""\
+[a]
+x = 2
+y = [1, 2, 3]
+
+[well.A1]
+y = 2
+""")
+
+    cache = wellmap.file.IncludeCache()
+    monkeypatch.setattr(wellmap.file, 'include_cache', cache)
+
+    config, _, _, meta = config_from_toml(tmp_path / 'main.toml')
+    subconfig, _, _, submeta = cache.config_from_toml(tmp_path / 'sub.toml')
+
+    assert config == {
+            'a': {'x': 1, 'y': [1, 2, 3]},
+            'well': {'A1': {'x': 1, 'y': 2}},
+    }
+    assert meta.extras == {'a': {'x': 1, 'y': [1, 2, 3]}}
+
+    # Values from the included layout are shared by reference, rather than 
+    # being copied...
+    assert config['a']['y'] is subconfig['a']['y']
+    assert meta.extras['a']['y'] is submeta.extras['a']['y']
+
+    # ...but merging them must not modify the cached layout.
+    assert subconfig == {
+            'a': {'x': 2, 'y': [1, 2, 3]},
+            'well': {'A1': {'y': 2}},
+    }
+    assert submeta.extras == {'a': {'x': 2, 'y': [1, 2, 3]}}
+
+
+def test_include_cache(tmp_path, monkeypatch):
+    import wellmap.file
+
+    main_toml = tmp_path / 'main.toml'
+    main_toml.write_text("""\
+[meta]
+include = [
+    {path='sub.toml', shift='A1 to A2'},
+    {path='sub.toml', shift='A1 to A3'},
+]
+""")
+    sub_toml = tmp_path / 'sub.toml'
+    sub_toml.write_text("""\
+[meta]
+alert = 'hello'
+
+[well.A1]
+x = 1
+""")
+
+    cache = wellmap.file.IncludeCache()
+    monkeypatch.setattr(wellmap.file, 'include_cache', cache)
+
+    parsed = []
+    config_from_toml = wellmap.file.config_from_toml
+
+    def spy(toml_path, **kwargs):
+        parsed.append(toml_path)
+        return config_from_toml(toml_path, **kwargs)
+
+    monkeypatch.setattr(wellmap.file, 'config_from_toml', spy)
+
+    def load():
+        alerts = []
+        config, *_ = wellmap.file.config_from_toml(
+                main_toml,
+                on_alert=lambda p, m: alerts.append(m),
+        )
+        assert config == {'well': {'A2': {'x': 1}, 'A3': {'x': 1}}}
+        assert alerts == ['hello', 'hello']
+
+    load()
+    assert len(parsed) == 3
+    assert len(cache) == 2
+
+    # Nothing changed, so the included files shouldn't be parsed again.
+    load()
+    assert len(parsed) == 4
+
+    # Modified files should be parsed again.
+    sub_toml.write_text(sub_toml.read_text() + '\n')
+    load()
+    assert len(parsed) == 7
+
+    # Explicit invalidation:
+    cache.invalidate(sub_toml)
+    assert len(cache) == 0
+    load()
+    assert len(parsed) == 10
+
+    cache.clear()
+    assert len(cache) == 0
+
+    cache.maxsize = 1
+    load()
+    assert len(cache) == 1
+    assert len(parsed) == 13
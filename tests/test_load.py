@@ -3,10 +3,14 @@
 import wellmap
 import pytest
 import sys
+import os
 import re
+import warnings
 
 from pytest_unordered import unordered
 from contextlib import nullcontext
+from hypothesis import given
+from hypothesis.strategies import lists, sampled_from, tuples
 from .param_helpers import *
 
 if sys.version_info >= (3, 10, 0):
@@ -104,3 +108,734 @@ def test_load(files, kwargs, expected, deprecated, error, subtests):
                 with subtests.test(retval=key):
                     comparisons[key](actual, expected_i)
 
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_load_data_loader_err(tmp_path, workers):
+    (tmp_path / 'main.toml').write_text("""\
+[meta.paths]
+a = 'a.csv'
+b = 'b.csv'
+
+[plate.a.well.A1]
+x = 1
+[plate.b.well.A1]
+x = 2
+""")
+    (tmp_path / 'a.csv').write_text('')
+    (tmp_path / 'b.csv').write_text('')
+
+    def data_loader(path):
+        if path.name == 'b.csv':
+            raise ZeroDivisionError
+        return pd.DataFrame({'Well': ['A1']})
+
+    with pytest.raises(ZeroDivisionError) as err:
+        wellmap.load(
+                tmp_path / 'main.toml',
+                data_loader=data_loader,
+                workers=workers,
+        )
+
+    assert err.value.data_path == tmp_path / 'b.csv'
+
+def test_load_data_loader_shared_frame(tmp_path):
+    (tmp_path / 'main.toml').write_text("""\
+[meta.paths]
+a = 'a.csv'
+b = 'b.csv'
+
+[plate.a.well.A1]
+x = 1
+[plate.b.well.A1]
+x = 2
+""")
+    (tmp_path / 'a.csv').write_text('')
+    (tmp_path / 'b.csv').write_text('')
+
+    # Data loaders may return the same data frame for different paths, e.g. 
+    # if they cache their results.
+    shared = pd.DataFrame({'Well': ['A1'], 'Data': [1]})
+
+    def data_loader(path):
+        return shared
+
+    df = wellmap.load(
+            tmp_path / 'main.toml',
+            data_loader=data_loader,
+            merge_cols={'well': 'Well'},
+    )
+    assert list(df['plate']) == ['a', 'b']
+    assert list(df['x']) == [1, 2]
+    assert list(shared.columns) == ['Well', 'Data']
+
+def test_load_cache(tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    main_toml = tmp_path / 'main.toml'
+    main_toml.write_text("""\
+[meta]
+include = 'sub.toml'
+alert = 'hello'
+
+[well.A1]
+x = 1
+""")
+    sub_toml = tmp_path / 'sub.toml'
+    sub_toml.write_text("""\
+[well.A1]
+y = 2
+""")
+
+    alerts = []
+    def on_alert(path, message):
+        alerts.append((path, message))
+
+    def load():
+        return wellmap.load(
+                main_toml,
+                meta=True,
+                cache_dir=cache_dir,
+                on_alert=on_alert,
+        )
+
+    df1, meta1 = load()
+    assert df1.to_dict('records') == [
+            dict(well='A1', well0='A01', row='A', col='1', row_i=0, col_j=0, x=1, y=2),
+    ]
+    assert meta1.dependencies == {main_toml, sub_toml}
+    assert alerts == [(main_toml, 'hello')]
+
+    # The cached layout should be used, so the TOML files shouldn't be parsed 
+    # again.  Alerts should still be reported.
+    def config_from_toml(*args, **kwargs):
+        raise AssertionError("layout should've been cached")
+
+    with monkeypatch.context() as m:
+        m.setattr(wellmap.file, 'config_from_toml', config_from_toml)
+        df2, meta2 = load()
+
+    assert df2.to_dict('records') == df1.to_dict('records')
+    assert meta2 == meta1
+    assert alerts == 2 * [(main_toml, 'hello')]
+
+    # Changing a dependency should invalidate the cache.  Change the size of 
+    # the file, in case the filesystem has coarse timestamps.
+    sub_toml.write_text("""\
+[well.A1]
+y = 30
+""")
+    df3, meta3 = load()
+    assert df3.to_dict('records') == [
+            dict(well='A1', well0='A01', row='A', col='1', row_i=0, col_j=0, x=1, y=30),
+    ]
+
+def test_load_cache_env(tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    monkeypatch.setenv('WELLMAP_CACHE', str(cache_dir))
+
+    main_toml = tmp_path / 'main.toml'
+    main_toml.write_text("""\
+[well.A1]
+x = 1
+""")
+
+    wellmap.load(main_toml)
+    assert len(list(cache_dir.glob('*.pkl'))) == 1
+
+def test_load_cache_missing_path(tmp_path):
+    main_toml = tmp_path / 'main.toml'
+    main_toml.write_text("""\
+[well.A1]
+x = 1
+""")
+
+    for i in range(2):
+        with pytest.raises(LayoutError, match="Did you mean to set `meta.path`?"):
+            wellmap.load(
+                    main_toml,
+                    path_required=True,
+                    cache_dir=tmp_path / 'cache',
+            )
+
+def test_load_cache_deleted_data(tmp_path):
+    main_toml = tmp_path / 'main.toml'
+    main_toml.write_text("""\
+[meta]
+path = 'data.csv'
+
+[well.A1]
+x = 1
+""")
+    data_csv = tmp_path / 'data.csv'
+    data_csv.write_text("Well,Data\nA1,1\n")
+
+    def load():
+        return wellmap.load(
+                main_toml,
+                data_loader=pd.read_csv,
+                merge_cols={'well': 'Well'},
+                cache_dir=tmp_path / 'cache',
+        )
+
+    assert list(load()['Data']) == [1]
+
+    # The cached layout refers to the data file, so it shouldn't be used once 
+    # that file is gone.
+    data_csv.unlink()
+
+    with pytest.raises(LayoutError, match="data.csv' does not exist"):
+        load()
+
+    data_csv.write_text("Well,Data\nA1,2\n")
+    assert list(load()['Data']) == [2]
+
+@pytest.mark.skipif(
+        hasattr(os, 'geteuid') and os.geteuid() == 0,
+        reason="root can write to read-only directories",
+)
+def test_load_cache_read_only(tmp_path):
+    main_toml = tmp_path / 'main.toml'
+    main_toml.write_text("""\
+[well.A1]
+x = 1
+""")
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    cache_dir.chmod(0o500)
+
+    try:
+        with pytest.warns(UserWarning, match="Couldn't write to the layout cache"):
+            df = wellmap.load(main_toml, cache_dir=cache_dir)
+    finally:
+        cache_dir.chmod(0o700)
+
+    assert df.to_dict('records') == [
+            dict(well='A1', well0='A01', row='A', col='1', row_i=0, col_j=0, x=1),
+    ]
+    assert list(cache_dir.iterdir()) == []
+
+def test_load_cache_not_dir(tmp_path):
+    main_toml = tmp_path / 'main.toml'
+    main_toml.write_text("""\
+[well.A1]
+x = 1
+""")
+
+    # A regular file in place of the cache directory can't be written to, 
+    # even by root.
+    cache_dir = tmp_path / 'cache'
+    cache_dir.write_text('')
+
+    with pytest.warns(UserWarning, match="Couldn't write to the layout cache"):
+        df = wellmap.load(main_toml, cache_dir=cache_dir)
+
+    assert df.to_dict('records') == [
+            dict(well='A1', well0='A01', row='A', col='1', row_i=0, col_j=0, x=1),
+    ]
+
+def test_iter_load(tmp_path):
+    (tmp_path / 'main.toml').write_text("""\
+[meta]
+paths = '{}.csv'
+concat = {c = 'concat.toml'}
+
+[expt]
+x = 1
+
+[plate.a.well.A1]
+y = 2
+[plate.b.well.A1]
+z = 3
+""")
+    (tmp_path / 'concat.toml').write_text("""\
+[meta]
+path = 'c.csv'
+
+[well.A1]
+x = 4
+""")
+    for name in 'abc':
+        (tmp_path / f'{name}.csv').write_text(f'Well,Data\nA1,{name}\n')
+
+    # Check that each plate is loaded only when requested.
+    loaded_paths = []
+
+    def data_loader(path):
+        loaded_paths.append(path.name)
+        return pd.read_csv(path)
+
+    chunks = wellmap.iter_load(
+            tmp_path / 'main.toml',
+            data_loader=data_loader,
+            merge_cols={'well': 'Well'},
+    )
+
+    plate, merged = next(chunks)
+    assert plate == 'a'
+    assert loaded_paths == ['a.csv']
+    assert merged[['plate', 'well', 'x', 'y', 'Data']].to_dict('records') == [
+            dict(plate='a', well='A1', x=1, y=2, Data='a'),
+    ]
+    assert 'z' not in merged
+
+    plate, merged = next(chunks)
+    assert plate == 'b'
+    assert loaded_paths == ['a.csv', 'b.csv']
+    assert merged[['plate', 'well', 'x', 'z', 'Data']].to_dict('records') == [
+            dict(plate='b', well='A1', x=1, z=3, Data='b'),
+    ]
+
+    plate, merged = next(chunks)
+    assert plate == 'c'
+    assert loaded_paths == ['a.csv', 'b.csv', 'c.csv']
+    assert merged[['plate', 'well', 'x', 'Data']].to_dict('records') == [
+            dict(plate='c', well='A1', x=4, Data='c'),
+    ]
+
+    with pytest.raises(StopIteration):
+        next(chunks)
+
+@pytest.mark.parametrize(
+        'kwargs', [
+            {},
+            {'data_loader': pd.read_csv},
+            {'data_loader': pd.read_csv, 'merge_cols': {'well': 'Well'}},
+        ],
+)
+def test_iter_load_vs_load(tmp_path, kwargs):
+    (tmp_path / 'main.toml').write_text("""\
+[meta]
+path = 'data.csv'
+
+[row.A]
+x = 1
+[col.1-2]
+y = 2
+""")
+    (tmp_path / 'data.csv').write_text('Well,Data\nA1,1\nA2,2\n')
+
+    expected = wellmap.load(tmp_path / 'main.toml', **kwargs)
+    if not isinstance(expected, tuple):
+        expected = expected,
+
+    chunks = list(wellmap.iter_load(tmp_path / 'main.toml', **kwargs))
+    assert len(chunks) == 1
+
+    plate, *actual = chunks[0]
+    assert plate is None
+    for actual_i, expected_i in zip_equal(actual, expected):
+        pd.testing.assert_frame_equal(actual_i, expected_i)
+
+def test_iter_load_concat_unnamed_plate(tmp_path):
+    (tmp_path / 'main.toml').write_text("""\
+[meta]
+concat = 'a.toml'
+""")
+    (tmp_path / 'a.toml').write_text("""\
+[meta]
+concat = 'b.toml'
+
+[plate.p.well.A1]
+x = 1
+""")
+    (tmp_path / 'b.toml').write_text("""\
+[well.A1]
+x = 2
+""")
+
+    chunks = list(wellmap.iter_load(tmp_path / 'main.toml'))
+    assert [plate for plate, _ in chunks] == ['p', None]
+    assert [list(df['x']) for _, df in chunks] == [[1], [2]]
+
+def test_iter_load_concat_copy(tmp_path):
+    (tmp_path / 'main.toml').write_text("""\
+[meta]
+include = 'sub.toml'
+""")
+    (tmp_path / 'sub.toml').write_text("""\
+[meta]
+concat = 'a.toml'
+""")
+    (tmp_path / 'a.toml').write_text("""\
+[well.A1]
+x = 1
+""")
+
+    # Modifying the yielded data frames shouldn't affect later loads, even 
+    # though the concatenated layouts are cached.
+    for i in range(2):
+        [(plate, df)] = wellmap.iter_load(tmp_path / 'main.toml')
+        assert plate is None
+        assert list(df['x']) == [1]
+        df['x'] = 2
+
+def test_iter_load_err(tmp_path):
+    (tmp_path / 'main.toml').write_text("")
+
+    with pytest.raises(LayoutError, match="No wells defined") as err:
+        list(wellmap.iter_load(tmp_path / 'main.toml'))
+
+    assert err.value.toml_path == tmp_path / 'main.toml'
+
+    with pytest.raises(ValueError, match="no function to load data"):
+        list(wellmap.iter_load(tmp_path / 'main.toml', merge_cols=True))
+
+@pytest.mark.parametrize(
+        'categorical, expected', [
+            (False, set()),
+            (True, {'plate', 'path', 'well', 'well0', 'row', 'col', 'x'}),
+            (0.25, {'plate', 'path', 'row', 'col', 'x'}),
+        ],
+)
+def test_load_categorical(tmp_path, categorical, expected):
+    (tmp_path / 'main.toml').write_text("""\
+[meta]
+paths = '{}.csv'
+
+[row.A]
+x = 'a'
+[row.B]
+x = 'b'
+
+[col.1]
+y = [1, 2]
+[col.2]
+y = 'c'
+z = 1
+
+[plate.p]
+[plate.q]
+""")
+    for plate in 'pq':
+        (tmp_path / f'{plate}.csv').write_text('Well,Data\nA1,1\nA2,2\nB1,3\nB2,4\n')
+
+    def get_categorical_cols(df):
+        return {
+                k for k, v in df.dtypes.items()
+                if isinstance(v, pd.CategoricalDtype)
+        }
+
+    layout = wellmap.load(tmp_path / 'main.toml', categorical=categorical)
+    assert get_categorical_cols(layout) == expected
+
+    for plate, layout in wellmap.iter_load(
+            tmp_path / 'main.toml',
+            categorical=categorical,
+    ):
+        assert get_categorical_cols(layout) <= expected
+
+    # The categorical columns shouldn't affect the merge.
+    kwargs = dict(
+            data_loader=pd.read_csv,
+            merge_cols={'well': 'Well'},
+    )
+    merged_object = wellmap.load(tmp_path / 'main.toml', **kwargs)
+    merged_categorical = wellmap.load(
+            tmp_path / 'main.toml',
+            categorical=categorical,
+            **kwargs,
+    )
+    pd.testing.assert_frame_equal(
+            merged_categorical.astype(object),
+            merged_object.astype(object),
+    )
+
+@pytest.mark.parametrize('categorical', [-1, 2])
+def test_load_categorical_err(tmp_path, categorical):
+    (tmp_path / 'main.toml').write_text("""\
+[well.A1]
+x = 1
+""")
+
+    with pytest.raises(ValueError, match="expected \\*categorical\\*"):
+        wellmap.load(tmp_path / 'main.toml', categorical=categorical)
+
+@given(
+        layout_wells=lists(
+            tuples(sampled_from('pq'), sampled_from(['A1', 'A2', 'B1', 'C12'])),
+            min_size=1,
+            unique=True,
+        ),
+        data_wells=lists(
+            tuples(
+                sampled_from('pqr'),
+                sampled_from(['A1', 'A01', 'a1', 'A2', 'B1', 'C12', 'Z', '', None]),
+            ),
+            min_size=1,
+        ),
+        merge_cols=sampled_from([
+            {'well': 'Well'},
+            {'well0': 'Well'},
+            {'well': 'Well', 'row': 'Row'},
+            {'row': 'Row', 'col': 'Col'},
+        ]),
+)
+def test_merge_on_well_indices(layout_wells, data_wells, merge_cols):
+    from wellmap.file import merge_layout_and_data
+
+    paths, wells = zip(*layout_wells)
+    row_i, col_j = wellmap.ij_from_wells(wells)
+    layout = pd.DataFrame({
+        'well': list(wells),
+        'well0': wellmap.well0s_from_wells(wells),
+        'row': wellmap.rows_from_i(row_i),
+        'col': wellmap.cols_from_j(col_j),
+        'row_i': row_i,
+        'col_j': col_j,
+        'path': list(paths),
+        'x': range(len(wells)),
+    })
+
+    paths, wells = zip(*data_wells)
+    data = pd.DataFrame({
+        'Well': list(wells),
+        'Row': [w and w[0] for w in wells],
+        'Col': [w and w[1:] for w in wells],
+        'path': list(paths),
+        'Data': range(len(wells)),
+    })
+
+    expected = pd.merge(
+            layout, data,
+            left_on=['path', *merge_cols.keys()],
+            right_on=['path', *merge_cols.values()],
+    )
+
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        actual = merge_layout_and_data(layout, data, merge_cols, 'indices')
+
+    # Each data row matches at most one well, so there are unmatched rows 
+    # exactly when the merge has fewer rows than the data.
+    assert bool(w) == (len(expected) < len(data))
+
+    # `pandas.merge()` doesn't always keep the rows in the same order when 
+    # merging on multiple columns.  The optimized merge keeps the layout rows 
+    # in order, and the data rows in order within each well.
+    def sort(df):
+        return df.sort_values(['x', 'Data']).reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(sort(actual), sort(expected))
+    assert actual.equals(actual.sort_values(['x', 'Data']))
+
+@pytest.mark.parametrize('categorical', [False, True])
+def test_load_merge_indices(tmp_path, categorical):
+    (tmp_path / 'main.toml').write_text("""\
+[meta]
+path = 'data.csv'
+
+[well.A1]
+x = 1
+[well.A2]
+x = 2
+""")
+    (tmp_path / 'data.csv').write_text("""\
+Well,Data
+A1,1
+A2,2
+A1,3
+A3,4
+""")
+
+    def read_csv(path):
+        return pd.read_csv(path)
+
+    with pytest.warns(UserWarning, match="1 data row\\(s\\) don't match") as w:
+        df = wellmap.load(
+                tmp_path / 'main.toml',
+                data_loader=read_csv,
+                merge_cols={'well': 'Well'},
+                merge='indices',
+                categorical=categorical,
+        )
+
+    assert 'A3' in str(w[0].message)
+    assert list(df['well']) == ['A1', 'A1', 'A2']
+    assert list(df['x']) == [1, 1, 2]
+    assert list(df['Data']) == [1, 3, 2]
+
+    # The default merge drops unmatched rows silently, like `pandas.merge()`.
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        df = wellmap.load(
+                tmp_path / 'main.toml',
+                data_loader=read_csv,
+                merge_cols={'well': 'Well'},
+                categorical=categorical,
+        )
+
+    assert len(df) == 3
+
+@pytest.mark.parametrize(
+        'merge_cols, merge, error', [
+            ({'row': 'Well'}, 'indices', "Can only merge on well indices"),
+            ({'row_i': 'Data'}, 'indices', "Can only merge on well indices"),
+            ({'well': 'Well'}, 'strings', "Unknown merge 'strings'"),
+        ]
+)
+def test_load_merge_err(tmp_path, merge_cols, merge, error):
+    (tmp_path / 'main.toml').write_text("""\
+[meta]
+path = 'data.csv'
+
+[well.A1]
+x = 1
+""")
+    (tmp_path / 'data.csv').write_text("""\
+Well,Data
+A1,1
+""")
+
+    with pytest.raises(ValueError, match=error):
+        wellmap.load(
+                tmp_path / 'main.toml',
+                data_loader=pd.read_csv,
+                merge_cols=merge_cols,
+                merge=merge,
+        )
+
+def test_load_merge_indices_shared_cols(tmp_path):
+    (tmp_path / 'main.toml').write_text("""\
+[meta]
+path = 'data.csv'
+
+[well.A1]
+x = 1
+""")
+    (tmp_path / 'data.csv').write_text("""\
+Well,x
+A1,1
+""")
+
+    with pytest.raises(ValueError, match="columns in common: 'x'"):
+        wellmap.load(
+                tmp_path / 'main.toml',
+                data_loader=pd.read_csv,
+                merge_cols={'well': 'Well'},
+                merge='indices',
+        )
+
+@pytest.mark.parametrize(
+        'kwargs', [
+            {},
+            {'data_loader': True},
+            {'data_loader': True, 'merge_cols': True},
+            {'data_loader': True, 'merge_cols': {'well': 'Well'}},
+            {'categorical': True},
+        ],
+)
+def test_load_polars(tmp_path, kwargs):
+    pl = pytest.importorskip('polars', minversion='1.17')
+    pytest.importorskip('pyarrow')
+
+    (tmp_path / 'main.toml').write_text("""\
+[meta]
+paths = '{}.csv'
+
+[row.A]
+x = 'a'
+[row.B]
+x = 'b'
+
+[col.1]
+y = 1.5
+[col.2]
+y = 2.5
+
+[plate.p]
+[plate.q]
+""")
+    for plate in 'pq':
+        (tmp_path / f'{plate}.csv').write_text(
+                'Well,Data\nA1,1\nA2,2\nB1,3\nB2,4\nC1,5\n')
+
+    if kwargs.get('merge_cols') is True:
+        for plate in 'pq':
+            (tmp_path / f'{plate}.csv').write_text(
+                    'well,Data\nA1,1\nA2,2\nB1,3\nB2,4\nC1,5\n')
+
+    def polars_kwargs():
+        if kwargs.get('data_loader'):
+            return {**kwargs, 'data_loader': pl.read_csv}
+        return kwargs
+
+    def pandas_kwargs():
+        if kwargs.get('data_loader'):
+            return {**kwargs, 'data_loader': pd.read_csv}
+        return kwargs
+
+    expected = wellmap.load(tmp_path / 'main.toml', **pandas_kwargs())
+    actual = wellmap.load(
+            tmp_path / 'main.toml',
+            backend='polars',
+            **polars_kwargs(),
+    )
+
+    if not isinstance(expected, tuple):
+        expected, actual = (expected,), (actual,)
+
+    for actual_i, expected_i in zip_equal(actual, expected):
+        assert isinstance(actual_i, pl.DataFrame)
+
+        expected_i = expected_i.assign(path=expected_i['path'].map(str))
+        actual_i = actual_i.to_pandas()
+
+        # Polars joins don't keep the data columns that were merged on.
+        expected_i = expected_i[actual_i.columns]
+
+        pd.testing.assert_frame_equal(
+                actual_i.astype(object),
+                expected_i.reset_index(drop=True).astype(object),
+                check_dtype=False,
+        )
+
+def test_load_polars_categorical(tmp_path):
+    pl = pytest.importorskip('polars', minversion='1.17')
+    pytest.importorskip('pyarrow')
+
+    (tmp_path / 'main.toml').write_text("""\
+[row.A]
+x = 'a'
+[row.B]
+x = 'b'
+[col.1-4]
+y = 'c'
+[well.A1]
+z = 'd'
+""")
+
+    def get_categorical_cols(df):
+        return {k for k, v in df.schema.items() if v == pl.Categorical}
+
+    layout = wellmap.load(tmp_path / 'main.toml', backend='polars')
+    assert get_categorical_cols(layout) == set()
+
+    layout = wellmap.load(
+            tmp_path / 'main.toml',
+            backend='polars',
+            categorical=0.5,
+    )
+    assert get_categorical_cols(layout) == {'row', 'col', 'x', 'y', 'z'}
+
+def test_load_polars_int_float(tmp_path):
+    pl = pytest.importorskip('polars', minversion='1.17')
+    pytest.importorskip('pyarrow')
+
+    (tmp_path / 'main.toml').write_text("""\
+[plate.p.well.A1]
+x = 1
+[plate.q.well.A1]
+x = 1.5
+""")
+
+    layout = wellmap.load(tmp_path / 'main.toml', backend='polars')
+    assert layout.schema['x'] == pl.Float64
+    assert layout['x'].to_list() == [1.0, 1.5]
+
+def test_load_backend_err(tmp_path):
+    (tmp_path / 'main.toml').write_text("""\
+[well.A1]
+x = 1
+""")
+
+    with pytest.raises(ValueError, match="Unknown backend 'xyz'"):
+        wellmap.load(tmp_path / 'main.toml', backend='xyz')
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+import wellmap
+import pytest
+import os
+
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from .param_helpers import *
+
+@pytest.fixture
+def layouts(tmp_path):
+    (tmp_path / 'shared.toml').write_text("""\
+[well.A1]
+x = 1
+""")
+    for name, y in [('a', 2), ('b', 3)]:
+        (tmp_path / f'{name}.toml').write_text(f"""\
+[meta]
+include = 'shared.toml'
+path = '{name}.csv'
+
+[well.A2]
+y = {y}
+""")
+        (tmp_path / f'{name}.csv').write_text('Well,Data\nA1,1\nA2,2\n')
+
+    (tmp_path / 'err.toml').write_text("""\
+[meta]
+alert = 'no wells'
+""")
+    return tmp_path
+
+@pytest.mark.parametrize(
+        'workers', [None, 2, ThreadPoolExecutor(2)],
+)
+def test_load_many(layouts, workers, monkeypatch):
+    import wellmap.file
+
+    cache = wellmap.file.IncludeCache()
+    monkeypatch.setattr(wellmap.file, 'include_cache', cache)
+
+    parsed = []
+    config_from_toml = wellmap.file.config_from_toml
+
+    def spy(toml_path, **kwargs):
+        parsed.append(Path(toml_path).name)
+        return config_from_toml(toml_path, **kwargs)
+
+    monkeypatch.setattr(wellmap.file, 'config_from_toml', spy)
+
+    toml_paths = [
+            layouts / 'a.toml',
+            layouts / 'err.toml',
+            layouts / 'b.toml',
+            os.path.join(layouts, '.', 'a.toml'),
+    ]
+    results, errors = wellmap.load_many(
+            toml_paths,
+            workers=workers,
+            on_alert=lambda *args: None,
+    )
+
+    # Every path gets its own result, but paths that refer to the same file 
+    # are only loaded once.
+    assert list(results) == [toml_paths[0], toml_paths[2], toml_paths[3]]
+    assert list(errors) == [toml_paths[1]]
+    assert results[toml_paths[3]] is results[toml_paths[0]]
+    assert parsed.count('a.toml') == 1
+
+    for toml_path, df in results.items():
+        pd.testing.assert_frame_equal(df, wellmap.load(toml_path))
+
+    err = errors[toml_paths[1]]
+    assert isinstance(err, wellmap.LayoutError)
+    assert err.toml_path == toml_paths[1]
+
+    # The shared file is only parsed once.
+    assert parsed.count('shared.toml') == 1
+    assert sorted(parsed[:4]) == ['a.toml', 'b.toml', 'err.toml', 'shared.toml']
+
+def test_load_many_concat(layouts):
+    toml_paths = [layouts / 'a.toml', layouts / 'b.toml']
+
+    df, errors = wellmap.load_many(toml_paths, concat=True)
+    assert errors == {}
+    assert list(df['toml_path']) == [toml_paths[0]] * 2 + [toml_paths[1]] * 2
+    assert sorted(df['y'].fillna(0)) == [0, 0, 2, 3]
+
+    layout, data = wellmap.load_many(
+            toml_paths,
+            data_loader=pd.read_csv,
+            concat=True,
+    )[0]
+    assert list(layout['toml_path']) == [toml_paths[0]] * 2 + [toml_paths[1]] * 2
+    assert list(data['toml_path']) == [toml_paths[0]] * 2 + [toml_paths[1]] * 2
+    assert list(data['Data']) == [1, 2, 1, 2]
+
+    merged, errors = wellmap.load_many(
+            [*toml_paths, layouts / 'err.toml'],
+            data_loader=pd.read_csv,
+            merge_cols={'well': 'Well'},
+            concat=True,
+    )
+    assert list(errors) == [layouts / 'err.toml']
+    assert list(merged['toml_path']) == [toml_paths[0]] * 2 + [toml_paths[1]] * 2
+    assert sorted(merged['Data']) == [1, 1, 2, 2]
+
+def test_load_many_concat_duplicates(layouts):
+    toml_paths = [
+            layouts / 'a.toml',
+            os.path.join(layouts, '.', 'a.toml'),
+    ]
+    df, errors = wellmap.load_many(toml_paths, concat=True)
+
+    assert errors == {}
+    assert list(df['toml_path']) == [toml_paths[0]] * 2 + [toml_paths[1]] * 2
+
+def test_load_many_concat_empty(layouts):
+    df, errors = wellmap.load_many([layouts / 'err.toml'], concat=True)
+    assert df.empty
+    assert list(errors) == [layouts / 'err.toml']
+
+    # The number of return values shouldn't depend on whether any layouts 
+    # were loaded successfully.
+    (layout, data), errors = wellmap.load_many(
+            [layouts / 'err.toml'],
+            data_loader=pd.read_csv,
+            concat=True,
+    )
+    assert layout.empty
+    assert data.empty
+    assert list(errors) == [layouts / 'err.toml']
+
+@pytest.mark.parametrize('key', ['meta', 'extras', 'report_dependencies'])
+def test_load_many_err(layouts, key):
+    with pytest.raises(ValueError, match=f"Can't concatenate \\*{key}\\*"):
+        wellmap.load_many([layouts / 'a.toml'], concat=True, **{key: True})
@@ -57,6 +57,74 @@ def test_pick_params(df, params, expected, error):
 def test_choose_foreground_color(bg, fg):
     assert wellmap.plot.choose_foreground_color(bg) == fg
 
+@parametrize_from_file(
+        key='test_choose_foreground_color',
+        schema=cast(bg=to_rgb),
+)
+def test_choose_foreground_colors(bg, fg):
+    fgs = wellmap.plot.choose_foreground_colors([(*bg, 1), (*bg, 0.5)])
+    assert list(fgs) == [fg, fg]
+
+@pytest.mark.parametrize(
+        'kwargs, fg', [
+            ({}, ['white', 'white']),
+            ({'color': 'red'}, ['red', 'red']),
+        ],
+)
+def test_superimposed_values(tmp_path, kwargs, fg):
+    df = pd.DataFrame({'well': ['A1', 'A2'], 'x': [1, 2]})
+    style = Style(superimpose_values=True, superimpose_kwargs=kwargs)
+    fig = show_df(df, style=style)
+
+    # All of the labels should be drawn by a single artist.
+    ax = fig.axes[0]
+    assert len(ax.texts) == 0
+
+    labels, = [
+            x for x in ax.get_children()
+            if isinstance(x, wellmap.plot.SuperimposedValues)
+    ]
+    texts = [
+            (x, y, text.get_text(), text.get_color())
+            for x, y, text in labels._iter_labels()
+    ]
+    assert texts == [(0, 0, '1', fg[0]), (1, 0, '2', fg[1])]
+
+    fig.savefig(tmp_path / 'layout.svg', bbox_inches='tight')
+    svg = (tmp_path / 'layout.svg').read_text()
+    assert svg.count('<g id="text_') > 0
+
+    plt.close(fig)
+
+@pytest.mark.parametrize(
+        'labels', [
+            ['a', 'bbb'],
+            [1, 2.5, float('nan')],
+            ['$x^2$', r'\$5'],
+            ['two\nlines', 'x'],
+            [True, False],
+            [' ', ''],
+        ],
+)
+def test_guess_param_label_width(labels):
+    from wellmap.plot import guess_param_label_width
+
+    # Compare to the width of the same labels on a real figure.
+    fig, ax = plt.subplots()
+    ax.set_yticks(range(len(labels)))
+    ax.set_yticklabels(labels)
+
+    renderer = fig.canvas.get_renderer()
+    expected = max(
+            x.get_window_extent(renderer).width
+            for x in ax.get_yticklabels()
+    )
+    expected /= fig.get_dpi()
+    plt.close(fig)
+
+    df = pd.DataFrame({'x': labels, 'y': ['']  * len(labels)})
+    assert guess_param_label_width(df, ['x', 'y']) == pytest.approx(expected)
+
 def test_style_init_signature():
     from inspect import signature
     assert str(signature(Style)) == (
@@ -323,6 +391,21 @@ def test_show_df(df, tol, expected, error, tmp_path):
 
     plt.close()
 
+def test_show_df_polars(tmp_path):
+    pl = pytest.importorskip('polars')
+
+    df = pd.DataFrame({'well': ['A1', 'A2', 'B1', 'B2'], 'x': [1, 2, 3, 4]})
+
+    expected = tmp_path / 'pandas.png'
+    show_df(df).savefig(expected)
+    plt.close()
+
+    actual = tmp_path / 'polars.png'
+    show_df(pl.from_pandas(df)).savefig(actual)
+    plt.close()
+
+    compare_images(expected, actual, TEST_IMAGES, tol=0)
+
 @parametrize_from_file(
         key='test_show',
         schema=[
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+import wellmap
+import pytest
+import matplotlib.pyplot as plt
+
+from matplotlib.image import imread
+from .test_plot import run_cli
+from .param_helpers import *
+
+@pytest.fixture
+def layouts(tmp_path):
+    # The first two layouts have the same arrangement of axes, so they should 
+    # share a figure.
+    (tmp_path / 'a.toml').write_text("""\
+[row.A]
+x = 1
+[row.B]
+x = 2
+[col.1-3]
+y = 'abc'
+""")
+    (tmp_path / 'b.toml').write_text("""\
+[row.A]
+x = 4
+[row.B]
+x = 3
+[col.1-3]
+y = 'def'
+""")
+    (tmp_path / 'c.toml').write_text("""\
+[row.A-D]
+x = 'long label'
+[well.A1]
+x = 'short'
+""")
+    (tmp_path / 'err.toml').write_text("""\
+[well.A1]
+""")
+    return tmp_path
+
+def assert_images_equal(expected, actual):
+    assert (imread(expected) == imread(actual)).all()
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_render(layouts, workers, monkeypatch):
+    templates = wellmap.plot.FigureTemplates()
+    monkeypatch.setattr(wellmap.plot, '_figure_templates', templates)
+
+    toml_paths = [layouts / f'{x}.toml' for x in ['a', 'err', 'b', 'c']]
+    style = wellmap.Style(superimpose_values=True)
+
+    out_paths, errors = wellmap.render(
+            toml_paths,
+            layouts / 'out',
+            style=style,
+            workers=workers,
+    )
+
+    assert out_paths == {
+            toml_paths[0]: layouts / 'out' / 'a.png',
+            toml_paths[2]: layouts / 'out' / 'b.png',
+            toml_paths[3]: layouts / 'out' / 'c.png',
+    }
+    assert list(errors) == [toml_paths[1]]
+    assert isinstance(errors[toml_paths[1]], LayoutError)
+
+    if workers is None:
+        assert len(templates) == 2
+
+    # The images should be the same as those made by `show()`, even those 
+    # drawn on reused figures.
+    for toml_path, out_path in out_paths.items():
+        fig = wellmap.show(toml_path, style=style)
+        fig.savefig(layouts / 'expected.png')
+        plt.close(fig)
+
+        assert_images_equal(layouts / 'expected.png', out_path)
+
+def test_render_format(layouts):
+    out_paths, errors = wellmap.render(
+            [layouts / 'a.toml'],
+            layouts,
+            format='svg',
+    )
+    assert out_paths == {layouts / 'a.toml': layouts / 'a.svg'}
+    assert (layouts / 'a.svg').read_text().startswith('<?xml')
+
+def test_render_err(layouts):
+    (layouts / 'sub').mkdir()
+    (layouts / 'sub' / 'a.toml').write_text((layouts / 'a.toml').read_text())
+
+    with pytest.raises(ValueError, match="same path"):
+        wellmap.render(
+                [layouts / 'a.toml', layouts / 'sub' / 'a.toml'],
+                layouts / 'out',
+        )
+
+def test_render_cli_err(layouts):
+    run_cli(
+            [
+                'wellmap', 'render',
+                layouts / 'a.toml',
+                layouts / 'a.toml',
+                '-d', layouts / 'out',
+            ],
+            "Multiple layouts would be rendered to the same path",
+    )
+    assert not (layouts / 'out' / 'a.png').exists()
+
+def test_render_cli(layouts):
+    run_cli(
+            [
+                'wellmap', 'render',
+                layouts / 'a.toml',
+                layouts / 'err.toml',
+                '-d', layouts / 'out',
+                '-c', 'viridis',
+            ],
+            [
+                "Layout written to:",
+                "No experimental parameters found",
+                "Failed to render 1 layout.",
+            ],
+    )
+    assert (layouts / 'out' / 'a.png').exists()
+
+    fig = wellmap.show(
+            layouts / 'a.toml',
+            style=wellmap.Style(color_scheme='viridis'),
+    )
+    fig.savefig(layouts / 'expected.png')
+    plt.close(fig)
+
+    assert_images_equal(layouts / 'expected.png', layouts / 'out' / 'a.png')
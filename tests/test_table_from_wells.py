@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 
 import wellmap
+import pandas as pd
 from pytest_unordered import unordered
+from hypothesis import given, example, assume
+from .test_wells_from_config import configs
 from .param_helpers import *
 
 @parametrize_from_file(
@@ -18,3 +21,42 @@ def test_table_from_wells(wells, index, expected):
     df = wellmap.table_from_wells(wells, index)
     assert df.to_dict('records') == unordered(expected)
 
+def test_table_from_wells_engines():
+    config = {
+            'well': {'A1': {'x': 1, 'y': 'a'}},
+            'row': {'A,B': {'z': [1, 2]}},
+            'col': {'1-100': {'y': 'b'}},
+            'expt': {'w': {'v': True}},
+    }
+    index = {'plate': 'Z'}
+    tables = [
+            wellmap.table_from_wells(
+                wellmap.wells_from_config(config, engine=engine),
+                index,
+            )
+            for engine in ['merge', 'numpy']
+    ]
+    pd.testing.assert_frame_equal(*tables)
+
+    df = tables[0]
+    assert list(df.columns) == [
+            'well', 'well0', 'row', 'col', 'row_i', 'col_j', 'plate',
+            'x', 'y', 'z', 'w',
+    ]
+    assert list(df['well0'][:3]) == ['A001', 'A002', 'A003']
+
+@given(configs())
+@example({
+        'well': {'A1': {}, 'B1,B3,...,B5': {'x': 0}},
+        'expt': {'y': 0, 'x': 0},
+})
+def test_table_from_wells_engines_column_order(config):
+    tables = []
+    for engine in ['merge', 'numpy']:
+        try:
+            wells = wellmap.wells_from_config(config, engine=engine)
+        except LayoutError:
+            assume(False)
+        tables.append(wellmap.table_from_wells(wells, {}))
+
+    assert list(tables[0].columns) == list(tables[1].columns)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+import wellmap
+import pytest
+import re
+
+from .param_helpers import *
+
+pa = pytest.importorskip('pyarrow')
+
+def test_to_arrow(tmp_path):
+    (tmp_path / 'main.toml').write_text("""\
+[meta]
+paths = '{}.csv'
+concat = {c = 'concat.toml'}
+
+[row.A]
+x = 'a'
+[row.B]
+x = 'b'
+
+[col.1]
+y = [1, 2]
+[col.2]
+z = 1.5
+
+[plate.p]
+[plate.q]
+""")
+    (tmp_path / 'concat.toml').write_text("""\
+[meta]
+path = 'c.csv'
+
+[well.A1]
+x = 'c'
+""")
+    for name in 'pqc':
+        (tmp_path / f'{name}.csv').touch()
+
+    table = wellmap.to_arrow(tmp_path / 'main.toml')
+
+    for col in ['well', 'well0', 'row', 'col', 'plate', 'path', 'x']:
+        assert pa.types.is_dictionary(table.schema.field(col).type)
+
+    assert table.schema.field('row_i').type == pa.int64()
+    assert table.schema.field('y').type == pa.list_(pa.int64())
+    assert table.schema.field('z').type == pa.float64()
+
+    # Compare to the pandas layout:
+    expected = wellmap.load(tmp_path / 'main.toml')
+    expected['path'] = expected['path'].map(str)
+    expected = expected.astype(object).where(expected.notna(), None)
+
+    assert table.column_names == expected.columns.tolist()
+    assert table.to_pylist() == expected.to_dict('records')
+
+def test_to_arrow_int_float(tmp_path):
+    (tmp_path / 'main.toml').write_text("""\
+[plate.p.well.A1]
+x = 1
+[plate.q.well.A1]
+x = 1.5
+""")
+    table = wellmap.to_arrow(tmp_path / 'main.toml')
+
+    assert table.schema.field('x').type == pa.float64()
+    assert table['x'].to_pylist() == [1.0, 1.5]
+    assert table['x'].to_pylist() == list(wellmap.load(tmp_path / 'main.toml')['x'])
+
+def test_to_arrow_parquet(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    from .test_plot import run_cli
+
+    (tmp_path / 'main.toml').write_text("""\
+[well.A1]
+x = 1
+""")
+
+    run_cli(['wellmap', 'export', tmp_path / 'main.toml'])
+
+    table = pq.read_table(tmp_path / 'main.parquet')
+    assert table.to_pylist() == [
+            dict(well='A1', well0='A01', row='A', col='1', row_i=0, col_j=0, x=1),
+    ]
+
+    run_cli([
+        'wellmap', 'export', tmp_path / 'main.toml',
+        '-o', tmp_path / '$_2.parquet',
+        '--parquet',
+    ])
+    assert pq.read_table(tmp_path / 'main_2.parquet') == table
+
+@pytest.mark.parametrize(
+        'layout, path_required, error', [
+            ("", False, "No wells defined"),
+            ("[well.A1]\nx = 1\n", True, "Did you mean to set `meta.path`?"),
+            ("[well.A1]\nx = 1\n[well.A2]\nx = 'a'\n", False, "Can't convert 'x' to an Arrow column"),
+            ("[plate.p.well.A1]\nx = 1\n[plate.q.well.A1]\nx = 'a'\n", False, "Can't combine the values of 'x' from different plates"),
+        ],
+)
+def test_to_arrow_err(tmp_path, layout, path_required, error):
+    (tmp_path / 'main.toml').write_text(layout)
+
+    with pytest.raises(LayoutError, match=re.escape(error)) as err:
+        wellmap.to_arrow(tmp_path / 'main.toml', path_required=path_required)
+
+    assert err.value.toml_path == tmp_path / 'main.toml'
@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 
 import pytest
+import numpy as np
+import pandas as pd
 from pytest import raises
 from hypothesis import given
-from hypothesis.strategies import integers
+from hypothesis.strategies import integers, lists, tuples
 from wellmap import *
 from .param_helpers import *
 
@@ -187,6 +189,100 @@ def test_ij_from_well(well, i, j):
 def test_ij_from_row_col(row, col, i, j):
     assert ij_from_row_col(row, col) == (i, j)
 
+def test_i_from_rows():
+    rows = pd.Series(['A', 'b', 'A', 'AA'], index=[3, 2, 1, 0])
+    np.testing.assert_array_equal(i_from_rows(rows), [0, 1, 0, 26])
+    np.testing.assert_array_equal(i_from_rows([]), [])
+
+@pytest.mark.parametrize(
+        'rows', [['A', ''], ['A', '1'], ['A', 'A1']]
+)
+def test_i_from_rows_err(rows):
+    with raises(LayoutError):
+        i_from_rows(rows)
+
+def test_j_from_cols():
+    cols = pd.Series(['1', '02', '1', '12'], index=[3, 2, 1, 0])
+    np.testing.assert_array_equal(j_from_cols(cols), [0, 1, 0, 11])
+    np.testing.assert_array_equal(j_from_cols([]), [])
+
+@pytest.mark.parametrize(
+        'cols', [['1', ''], ['1', 'A'], ['1', 'A1']]
+)
+def test_j_from_cols_err(cols):
+    with raises(LayoutError):
+        j_from_cols(cols)
+
+def test_ij_from_wells():
+    wells = pd.Series(['A1', 'A02', 'b1', 'A1', 'AA12'], index=[4, 3, 2, 1, 0])
+    i, j = ij_from_wells(wells)
+    np.testing.assert_array_equal(i, [0, 0, 1, 0, 26])
+    np.testing.assert_array_equal(j, [0, 1, 0, 0, 11])
+
+    i, j = ij_from_wells([])
+    np.testing.assert_array_equal(i, [])
+    np.testing.assert_array_equal(j, [])
+
+@pytest.mark.parametrize(
+        'well', ['XXX', '123', '1A']
+)
+def test_ij_from_wells_err(well):
+    with raises(LayoutError, match=well):
+        ij_from_wells(['A1', well])
+
+@given(lists(tuples(integers(0, 60), integers(0, 60))), integers(1, 4))
+def test_bulk_conversions(ijs, digits):
+    i = [i for i, j in ijs]
+    j = [j for i, j in ijs]
+    rows = [row_from_i(x) for x in i]
+    cols = [col_from_j(x) for x in j]
+    wells = [well_from_ij(*ij) for ij in ijs]
+    well0s = [well0_from_well(x, digits) for x in wells]
+
+    def assert_equal(actual, expected):
+        np.testing.assert_array_equal(actual, np.array(expected, dtype=object))
+
+    assert_equal(wells_from_row_cols(rows, cols), wells)
+    assert_equal(wells_from_ij(i, j), wells)
+    assert_equal(well0s_from_wells(wells, digits), well0s)
+    assert_equal(well0s_from_row_cols(rows, cols, digits), well0s)
+    assert_equal(well0s_from_ij(i, j, digits), well0s)
+    assert_equal(rows_from_i(i), rows)
+    assert_equal(cols_from_j(j), cols)
+
+    for actual, expected in [
+            (row_cols_from_ij(i, j), (rows, cols)),
+            (row_cols_from_wells(well0s), (rows, cols)),
+            (ij_from_wells(well0s), (i, j)),
+            (ij_from_row_cols(rows, cols), (i, j)),
+    ]:
+        assert len(actual) == 2
+        assert_equal(actual[0], expected[0])
+        assert_equal(actual[1], expected[1])
+
+def test_bulk_conversions_series():
+    index = [3, 2, 1]
+    i = pd.Series([0, 1, 26], index=index)
+    j = pd.Series([0, 1, 11], index=index)
+
+    wells = wells_from_ij(i, j)
+    assert isinstance(wells, pd.Series)
+    assert list(wells.index) == index
+    assert list(wells) == ['A1', 'B2', 'AA12']
+
+    i2, j2 = ij_from_wells(wells)
+    pd.testing.assert_series_equal(i2, i)
+    pd.testing.assert_series_equal(j2, j)
+
+@pytest.mark.parametrize(
+        'i, j', [
+            ([0, -1], [0, 0]),
+            ([0, 0], [0, -1]),
+])
+def test_wells_from_ij_err(i, j):
+    with pytest.raises(LayoutError):
+        wells_from_ij(i, j)
+
 @pytest.mark.parametrize(
         'a, b, x', [
             (0, 0, 0), (1, 0, 1), (2, 0, 2), (3, 0, 3),
@@ -297,6 +393,7 @@ def test_range_from_indices(xs, expected):
 ])
 def test_iter_row_indices(key, indices):
     assert list(iter_row_indices(key)) == indices
+    assert row_indices_from_pattern(key) == tuple(indices)
 
 @pytest.mark.parametrize(
         'key, err', [
@@ -316,6 +413,11 @@ def test_iter_row_indices_err(key, err):
     with raises(LayoutError, match=err):
         list(iter_row_indices(key))
 
+    # Make sure errors aren't cached.
+    for i in range(2):
+        with raises(LayoutError, match=err):
+            row_indices_from_pattern(key)
+
 @pytest.mark.parametrize(
         'key, indices', [
             ('1', [0]),
@@ -345,6 +447,7 @@ def test_iter_row_indices_err(key, err):
 ])
 def test_iter_col_indices(key, indices):
     assert list(iter_col_indices(key)) == indices
+    assert col_indices_from_pattern(key) == tuple(indices)
 
 @pytest.mark.parametrize(
         'key, err', [
@@ -364,6 +467,11 @@ def test_iter_col_indices_err(key, err):
     with raises(LayoutError, match=err):
         list(iter_col_indices(key))
 
+    # Make sure errors aren't cached.
+    for i in range(2):
+        with raises(LayoutError, match=err):
+            col_indices_from_pattern(key)
+
 @pytest.mark.parametrize(
         'key, indices', [
             ('A1', {(0,0)}),
@@ -419,6 +527,7 @@ def test_iter_col_indices_err(key, err):
 ])
 def test_iter_well_indices(key, indices):
     assert set(iter_well_indices(key)) == indices
+    assert well_indices_from_pattern(key) == tuple(iter_well_indices(key))
 
 @pytest.mark.parametrize(
         'key, err', [
@@ -443,6 +552,11 @@ def test_iter_well_indices(key, indices):
 def test_iter_well_indices_err(key, err):
     with raises(LayoutError, match=err):
         list(iter_well_indices(key))
+
+    # Make sure errors aren't cached.
+    for i in range(2):
+        with raises(LayoutError, match=err):
+            well_indices_from_pattern(key)
         
 @pytest.mark.parametrize(
         'given, expected', [
@@ -553,6 +667,39 @@ def test_shift_row_col_err(row_col, shift):
 def test_shift_pattern(key, shift, expected):
     assert shift_pattern(key, shift) == expected
 
+@pytest.mark.parametrize(
+        'key, shift, indices_from_pattern', [
+            ('A1', (1, 2), well_indices_from_pattern),
+            ('A1,B2', (1, 2), well_indices_from_pattern),
+            ('A1,C3,...,E5', (1, 2), well_indices_from_pattern),
+            ('A,B', (1, 2), row_indices_from_pattern),
+            ('A,C,...,G', (1, 2), row_indices_from_pattern),
+            ('1,2', (1, 2), col_indices_from_pattern),
+            ('1,3,...,7', (1, 2), col_indices_from_pattern),
+        ],
+)
+def test_shifted_pattern(key, shift, indices_from_pattern):
+    import pickle
+
+    shifted = ShiftedPattern(key, shift)
+    expected = shift_pattern(key, shift)
+
+    assert shifted == expected
+    assert hash(shifted) == hash(expected)
+    assert {expected: 1}[shifted] == 1
+    assert shifted.pattern == key
+    assert shifted.shift == shift
+    assert indices_from_pattern(shifted) == indices_from_pattern(expected)
+
+    unpickled = pickle.loads(pickle.dumps(shifted))
+    assert unpickled == expected
+    assert unpickled.pattern == key
+    assert unpickled.shift == shift
+
+def test_shifted_pattern_err():
+    with raises(LayoutError, match="Cannot parse row 'B2'"):
+        row_indices_from_pattern(ShiftedPattern('A1', (1, 1)))
+
 @pytest.mark.parametrize(
         'a, b, expected', [
             ((0, 0), (0, 0), (0, 0)),
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+
+import wellmap
+import pytest
+import os
+import matplotlib.pyplot as plt
+
+from wellmap.plot import LayoutWatcher
+from .test_plot import run_cli
+from .param_helpers import *
+
+def edit(path, text):
+    # `LayoutWatcher` notices changes by comparing modification times and 
+    # sizes.  Edits in quick succession can keep the same modification time 
+    # (depending on the resolution of the filesystem), so make sure it 
+    # changes, in case the new text happens to be the same size as the old.
+    mtime_ns = path.stat().st_mtime_ns
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+@pytest.fixture
+def layout(tmp_path, monkeypatch):
+    import wellmap.file
+    monkeypatch.setattr(wellmap.file, 'include_cache', wellmap.file.IncludeCache())
+
+    (tmp_path / 'main.toml').write_text("""\
+[meta]
+include = 'sub.toml'
+
+[row.A]
+x = 1
+[row.B]
+x = 2
+""")
+    (tmp_path / 'sub.toml').write_text("""\
+[col.1]
+y = 'a'
+[col.2]
+y = 'b'
+""")
+    return tmp_path
+
+def test_layout_watcher(layout, monkeypatch):
+    import wellmap.file
+
+    parsed = []
+    config_from_toml = wellmap.file.config_from_toml
+
+    def spy(toml_path, **kwargs):
+        parsed.append(toml_path.name)
+        return config_from_toml(toml_path, **kwargs)
+
+    monkeypatch.setattr(wellmap.file, 'config_from_toml', spy)
+
+    watcher = LayoutWatcher(layout / 'main.toml')
+
+    assert watcher.poll()
+    fig = watcher.fig
+    assert watcher.poll() == False
+
+    # Changing an included file should trigger an update.  The arrangement of 
+    # the axes is the same, so the figure should be reused.
+    edit(layout / 'sub.toml', """\
+[col.1]
+y = 'c'
+[col.2]
+y = 'd'
+""")
+    assert watcher.poll()
+    assert watcher.fig is fig
+    assert [x.get_text() for x in fig.axes[-1].get_yticklabels()] == ['c', 'd']
+
+    # Changes that don't affect the layout shouldn't cause it to be redrawn.  
+    # The included file didn't change, so it shouldn't be parsed again.
+    parsed.clear()
+    edit(layout / 'main.toml',
+            (layout / 'main.toml').read_text() + "# comment\n")
+    assert watcher.poll() == False
+    assert parsed == ['main.toml']
+
+    # Changes that affect the arrangement of the axes require a new figure.
+    edit(layout / 'main.toml',
+            (layout / 'main.toml').read_text() + "[row.C]\nx = 3\n")
+    assert watcher.poll()
+    assert watcher.fig is not fig
+
+def test_layout_watcher_err(layout):
+    watcher = LayoutWatcher(layout / 'main.toml')
+    assert watcher.poll()
+    fig = watcher.fig
+
+    # Errors are raised once, but don't prevent future updates.
+    edit(layout / 'sub.toml', "[col.1]\ny = 'a'\n[col.A]\n")
+    with pytest.raises(LayoutError):
+        watcher.poll()
+
+    assert watcher.poll() == False
+    assert watcher.fig is fig
+
+    edit(layout / 'sub.toml', "[col.1]\ny = 'a'\n[col.2]\ny = 'd'\n")
+    assert watcher.poll()
+    assert watcher.fig is fig
+
+def test_watch_cli(layout, monkeypatch):
+    import time
+
+    out_path = layout / 'main.png'
+    edits = iter([
+        # Introduce an error:
+        lambda: edit(layout / 'sub.toml', "[col.A]\n"),
+
+        # Fix the error:
+        lambda: edit(layout / 'sub.toml', "[col.1]\ny = 'c'\n[col.2]\ny = 'd'\n"),
+    ])
+    mtimes = []
+
+    def sleep(interval):
+        mtimes.append(out_path.stat().st_mtime_ns if out_path.exists() else None)
+        try:
+            next(edits)()
+        except StopIteration:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(time, 'sleep', sleep)
+
+    run_cli(
+            ['wellmap', layout / 'main.toml', '-o', out_path, '-w'],
+            [
+                "Layout written to:",
+                "Cannot parse column 'A'",
+            ],
+    )
+    assert out_path.exists()
+    assert mtimes[0] is not None
+    assert mtimes[0] == mtimes[1]
+    assert mtimes[1] != out_path.stat().st_mtime_ns
+
+def test_watch_cli_gui_foreground(layout, monkeypatch):
+    import os, time
+
+    def fork():
+        raise AssertionError("shouldn't fork while watching")
+
+    def sleep(interval):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(os, 'fork', fork)
+    monkeypatch.setattr(time, 'sleep', sleep)
+
+    # If the layout can't be loaded, no window is opened.  The program should 
+    # still be in the foreground, so Ctrl-C can stop it.
+    (layout / 'sub.toml').write_text("[col.A]\n")
+
+    run_cli(
+            ['wellmap', layout / 'main.toml', '-w'],
+            "Cannot parse column 'A'",
+    )
+
+def test_watch_cli_err(layout):
+    run_cli(
+            ['wellmap', layout / 'main.toml', '-p', '-w'],
+            "Can't print a layout while watching it for changes.",
+    )
@@ -1,45 +1,65 @@
 #!/usr/bin/env python3
 
+import pytest
+import wellmap
+import re
+import itertools
+
 from wellmap import *
+from wellmap.file import configdict
+from wellmap.util import (
+        iter_well_indices, iter_row_indices, iter_col_indices,
+        iter_ij_in_block, range_from_indices, interleave, recursive_merge,
+)
 from pytest import raises
-
-def test_one_well():
+from copy import deepcopy
+from inform import plural
+from hypothesis import given
+from hypothesis.strategies import (
+        composite, dictionaries, sampled_from, one_of, integers, lists,
+)
+
+@pytest.fixture(params=['merge', 'numpy'])
+def engine(request):
+    return request.param
+
+def test_one_well(engine):
     config = {
             'well': {
                 'XXX': {'x': 1},
             },
     }
     with raises(LayoutError, match='XXX'):
-        wells_from_config(config)
+        wells_from_config(config, engine=engine)
 
     config = {
             'well': {
                 'A1': {'x': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1},
     }
 
-def test_multiple_wells():
+def test_multiple_wells(engine):
     config = {
             'well': {
                 'A1': {'x': 1},
                 'B2': {'x': 2},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1},
             (1,1): {'x': 2},
     }
 
-def test_well_range():
+def test_well_range(engine):
     config = {
             'well': {
                 'A1,A2': {'x': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1},
             (0,1): {'x': 1},
     }
@@ -49,7 +69,7 @@ def test_well_range():
                 'A1,A3,...,A5': {'x': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1},
             (0,2): {'x': 1},
             (0,4): {'x': 1},
@@ -60,7 +80,7 @@ def test_well_range():
                 'A1,C1,...,E1': {'x': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1},
             (2,0): {'x': 1},
             (4,0): {'x': 1},
@@ -71,7 +91,7 @@ def test_well_range():
                 'A1,C3,...,E7': {'x': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1},
             (0,2): {'x': 1},
             (0,4): {'x': 1},
@@ -86,14 +106,14 @@ def test_well_range():
             (4,6): {'x': 1},
     }
 
-def test_one_block():
+def test_one_block(engine):
     config_err = {
             'block': {
                 'err': {}
             },
     }
     with raises(LayoutError, match="err"):
-        wells_from_config(config_err)
+        wells_from_config(config_err, engine=engine)
 
     config_0x0 = {
             'block': {
@@ -103,7 +123,7 @@ def test_one_block():
             },
     }
     with raises(LayoutError, match="0x0"):
-        wells_from_config(config_0x0)
+        wells_from_config(config_0x0, engine=engine)
 
     config_0x1 = {
             'block': {
@@ -113,7 +133,7 @@ def test_one_block():
             },
     }
     with raises(LayoutError, match="0x1"):
-        wells_from_config(config_0x1)
+        wells_from_config(config_0x1, engine=engine)
 
     config_1x0 = {
             'block': {
@@ -123,7 +143,7 @@ def test_one_block():
             },
     }
     with raises(LayoutError, match="1x0"):
-        wells_from_config(config_1x0)
+        wells_from_config(config_1x0, engine=engine)
 
     config_1x1 = {
             'block': {
@@ -132,7 +152,7 @@ def test_one_block():
                 },
             },
     }
-    assert wells_from_config(config_1x1) == {
+    assert wells_from_config(config_1x1, engine=engine) == {
             (0,0): {'x': 1},
     }
 
@@ -143,7 +163,7 @@ def test_one_block():
                 },
             },
     }
-    assert wells_from_config(config_1x2) == {
+    assert wells_from_config(config_1x2, engine=engine) == {
             (0,0): {'x': 1},
             (1,0): {'x': 1},
     }
@@ -155,7 +175,7 @@ def test_one_block():
                 },
             },
     }
-    assert wells_from_config(config_2x1) == {
+    assert wells_from_config(config_2x1, engine=engine) == {
             (0,0): {'x': 1},
             (0,1): {'x': 1},
     }
@@ -167,14 +187,14 @@ def test_one_block():
                 },
             },
     }
-    assert wells_from_config(config_2x2) == {
+    assert wells_from_config(config_2x2, engine=engine) == {
             (0,0): {'x': 1},
             (0,1): {'x': 1},
             (1,0): {'x': 1},
             (1,1): {'x': 1},
     }
 
-def test_multiple_blocks():
+def test_multiple_blocks(engine):
     config = {
             'block': {
                 '1x1': {
@@ -183,7 +203,7 @@ def test_multiple_blocks():
                 },
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1},
             (1,1): {'x': 2},
     }
@@ -198,13 +218,13 @@ def test_multiple_blocks():
                 },
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (0,1): {'x': 1        },
             (1,0): {        'y': 1},
     }
 
-def test_block_range():
+def test_block_range(engine):
     config_1x2 = {
             'block': {
                 '2x1': {
@@ -212,7 +232,7 @@ def test_block_range():
                 },
             },
     }
-    assert wells_from_config(config_1x2) == {
+    assert wells_from_config(config_1x2, engine=engine) == {
             (0,0): {'x': 1},
             (0,1): {'x': 1},
             (2,0): {'x': 1},
@@ -226,7 +246,7 @@ def test_block_range():
                 },
             },
     }
-    assert wells_from_config(config_1x2) == {
+    assert wells_from_config(config_1x2, engine=engine) == {
             (0,0): {'x': 1},
             (0,1): {'x': 1},
             (0,4): {'x': 1},
@@ -235,7 +255,7 @@ def test_block_range():
             (0,9): {'x': 1},
     }
 
-def test_one_row_col():
+def test_one_row_col(engine):
     config = {
             'row': {
                 '1': {'x': 1},
@@ -245,7 +265,7 @@ def test_one_row_col():
             },
     }
     with raises(LayoutError, match='1'):
-        wells_from_config(config)
+        wells_from_config(config, engine=engine)
 
     config = {
             'row': {
@@ -256,7 +276,7 @@ def test_one_row_col():
             },
     }
     with raises(LayoutError, match='A'):
-        wells_from_config(config)
+        wells_from_config(config, engine=engine)
 
     config = {
             'row': {
@@ -266,11 +286,11 @@ def test_one_row_col():
                 '1': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
     }
 
-def test_multiple_rows():
+def test_multiple_rows(engine):
     config = {
             'row': {
                 'A': {'x': 1},
@@ -280,7 +300,7 @@ def test_multiple_rows():
                 '1': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (1,0): {'x': 2, 'y': 1},
     }
@@ -294,13 +314,13 @@ def test_multiple_rows():
                 '1': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (1,0): {        'y': 1},
             (2,0): {'x': 2, 'y': 1},
     }
 
-def test_multiple_cols():
+def test_multiple_cols(engine):
     config = {
             'row': {
                 'A': {'x': 1},
@@ -310,7 +330,7 @@ def test_multiple_cols():
                 '2': {'y': 2},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (0,1): {'x': 1, 'y': 2},
     }
@@ -324,13 +344,13 @@ def test_multiple_cols():
                 '3': {'y': 2},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (0,1): {'x': 1        },
             (0,2): {'x': 1, 'y': 2},
     }
 
-def test_row_range():
+def test_row_range(engine):
     config = {
             'row': {
                 'A,C': {'x': 1},
@@ -339,7 +359,7 @@ def test_row_range():
                 '1': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (1,0): {        'y': 1},
             (2,0): {'x': 1, 'y': 1},
@@ -353,7 +373,7 @@ def test_row_range():
                 '1': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (1,0): {'x': 1, 'y': 1},
             (2,0): {'x': 1, 'y': 1},
@@ -367,13 +387,13 @@ def test_row_range():
                 '1': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (1,0): {'x': 1, 'y': 1},
             (2,0): {'x': 1, 'y': 1},
     }
 
-def test_col_range():
+def test_col_range(engine):
     config = {
             'row': {
                 'A': {'x': 1},
@@ -382,7 +402,7 @@ def test_col_range():
                 '1,3': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (0,1): {'x': 1        },
             (0,2): {'x': 1, 'y': 1},
@@ -396,7 +416,7 @@ def test_col_range():
                 '1-3': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (0,1): {'x': 1, 'y': 1},
             (0,2): {'x': 1, 'y': 1},
@@ -410,20 +430,20 @@ def test_col_range():
                 '1,2,...,3': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (0,1): {'x': 1, 'y': 1},
             (0,2): {'x': 1, 'y': 1},
     }
 
-def test_row_without_col():
+def test_row_without_col(engine):
     config = {
             'row': {
                 'A': {'x': 1},
             },
     }
     with raises(LayoutError, match="row"):
-        wells_from_config(config)
+        wells_from_config(config, engine=engine)
 
     config = {
             'well': {
@@ -433,7 +453,7 @@ def test_row_without_col():
                 'A': {'x': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
     }
 
@@ -447,21 +467,21 @@ def test_row_without_col():
                 'A': {'x': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (0,1): {'x': 1, 'y': 1},
             (1,0): {        'y': 1},
             (1,1): {        'y': 1},
     }
 
-def test_col_without_row():
+def test_col_without_row(engine):
     config = {
             'col': {
                 '1': {'y': 1},
             },
     }
     with raises(LayoutError, match="col"):
-        wells_from_config(config)
+        wells_from_config(config, engine=engine)
 
     config = {
             'well': {
@@ -471,7 +491,7 @@ def test_col_without_row():
                 '1': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
     }
 
@@ -485,14 +505,14 @@ def test_col_without_row():
                 '1': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (0,1): {'x': 1,       },
             (1,0): {'x': 1, 'y': 1},
             (1,1): {'x': 1,       },
     }
 
-def test_one_irow():
+def test_one_irow(engine):
     config = {
             'irow': {
                 'A': {'x': 1},
@@ -504,7 +524,7 @@ def test_one_irow():
                 '4': {'y': 4},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (0,1): {        'y': 2},
             (0,2): {'x': 1, 'y': 3},
@@ -526,7 +546,7 @@ def test_one_irow():
                 '4': {'y': 4},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {        'y': 1},
             (0,1): {'x': 2, 'y': 2},
             (0,2): {        'y': 3},
@@ -537,7 +557,7 @@ def test_one_irow():
             (1,3): {        'y': 4},
     }
 
-def test_one_icol():
+def test_one_icol(engine):
     config = {
             'row': {
                 'A': {'x': 1},
@@ -549,7 +569,7 @@ def test_one_icol():
                 '1': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (0,1): {'x': 1        },
             (1,0): {'x': 2        },
@@ -571,7 +591,7 @@ def test_one_icol():
                 '2': {'y': 2},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1        },
             (0,1): {'x': 1, 'y': 2},
             (1,0): {'x': 2, 'y': 2},
@@ -582,14 +602,14 @@ def test_one_icol():
             (3,1): {'x': 4        },
     }
 
-def test_irow_without_col():
+def test_irow_without_col(engine):
     config = {
             'irow': {
                 'A': {'x': 1},
             },
     }
     with raises(LayoutError, match="irow"):
-        wells_from_config(config)
+        wells_from_config(config, engine=engine)
 
     config = {
             'well': {
@@ -599,7 +619,7 @@ def test_irow_without_col():
                 'A': {'x': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
     }
 
@@ -613,7 +633,7 @@ def test_irow_without_col():
                 'A': {'x': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (0,1): {        'y': 1},
             (1,1): {'x': 1        },
@@ -629,7 +649,7 @@ def test_irow_without_col():
                 'B': {'x': 2},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {        'y': 1},
             (0,1): {'x': 2, 'y': 1},
             (1,0): {'x': 2        },
@@ -645,7 +665,7 @@ def test_irow_without_col():
                 'A': {'x': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (1,0): {        'y': 1},
     }
@@ -660,19 +680,19 @@ def test_irow_without_col():
                 'B': {'x': 2},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {        'y': 1},
             (1,0): {'x': 2, 'y': 1},
     }
 
-def test_icol_without_row():
+def test_icol_without_row(engine):
     config = {
             'icol': {
                 '1': {'y': 1},
             },
     }
     with raises(LayoutError, match="icol"):
-        wells_from_config(config)
+        wells_from_config(config, engine=engine)
 
     config = {
             'well': {
@@ -682,7 +702,7 @@ def test_icol_without_row():
                 '1': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
     }
 
@@ -696,7 +716,7 @@ def test_icol_without_row():
                 '1': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (1,0): {'x': 1,       },
             (1,1): {        'y': 1},
@@ -712,7 +732,7 @@ def test_icol_without_row():
                 '2': {'y': 2},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1        },
             (0,1): {        'y': 2},
             (1,0): {'x': 1, 'y': 2},
@@ -728,7 +748,7 @@ def test_icol_without_row():
                 '1': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (0,1): {'x': 1,       },
     }
@@ -743,21 +763,21 @@ def test_icol_without_row():
                 '2': {'y': 2},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1        },
             (0,1): {'x': 1, 'y': 2},
     }
 
-def test_top_level_params():
+def test_top_level_params(engine):
     config = {
             'expt': {'x': 1},
             'well': {'A1': {}},
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1},
     }
 
-def test_precedence():
+def test_precedence(engine):
     config = {
             'well': {
                 'A1': {'a': 1},
@@ -777,7 +797,7 @@ def test_precedence():
                 'a': 5, 'b': 5, 'c': 5, 'd': 5, 'e': 5,
             },
     }
-    wells = wells_from_config(config)
+    wells = wells_from_config(config, engine=engine)
     assert wells[0,0] == {
             'a': 1,
             'b': 2,
@@ -786,7 +806,7 @@ def test_precedence():
             'e': 5,
     }
 
-def test_block_precedence():
+def test_block_precedence(engine):
     # For block of different size: smaller blocks have higher precedence.
     config = {
             'block': {
@@ -801,7 +821,7 @@ def test_block_precedence():
                 },
             },
     }
-    wells = wells_from_config(config)
+    wells = wells_from_config(config, engine=engine)
     assert wells == {
             (0, 0): {'p': '1x1'},
             (0, 1): {'p': '2x1'},
@@ -821,20 +841,20 @@ def test_block_precedence():
                 },
             },
     }
-    wells = wells_from_config(config)
+    wells = wells_from_config(config, engine=engine)
     assert wells == {
             (0, 0): {'p': '1x2'},
             (0, 1): {'p': '2x1'},
             (1, 0): {'p': '1x2'},
     }
 
-def test_multi_letter_well():
+def test_multi_letter_well(engine):
     config = {
             'well': {
                 'AA1': {'x': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (26,0): {'x': 1},
     }
 
@@ -843,11 +863,11 @@ def test_multi_letter_well():
                 'AA01': {'x': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (26,0): {'x': 1},
     }
 
-def test_redundant_wells_alias():
+def test_redundant_wells_alias(engine):
     # Referring to the same well with two different names like this is 
     # definitely a bad idea, but it's not really practical to forbid this while 
     # allowing patterns to have overlapping wells.
@@ -857,23 +877,23 @@ def test_redundant_wells_alias():
                 'A01': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
     }
 
-def test_redundant_wells_diff():
+def test_redundant_wells_diff(engine):
     config = {
             'well': {
                 'A1': {'x': 1},
                 'A1,A2': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (0,1): {        'y': 1},
     }
 
-def test_redundant_wells_same():
+def test_redundant_wells_same(engine):
     config = {
             'well': {
                 'A1':    {'x': 1},
@@ -882,12 +902,12 @@ def test_redundant_wells_same():
 
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 2},
             (0,1): {'x': 3},
     }
 
-def test_redundant_cols_diff():
+def test_redundant_cols_diff(engine):
     config = {
             'row': {
                 'A': {},
@@ -897,12 +917,12 @@ def test_redundant_cols_diff():
                 '1,2': {'y': 1},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (0,1): {        'y': 1},
     }
 
-def test_redundant_cols_same():
+def test_redundant_cols_same(engine):
     config = {
             'row': {
                 'A': {},
@@ -913,12 +933,12 @@ def test_redundant_cols_same():
                 '2':   {'x': 3},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 2},
             (0,1): {'x': 3},
     }
 
-def test_redundant_rows_diff():
+def test_redundant_rows_diff(engine):
     config = {
             'row': {
                 'A': {'x': 1},
@@ -928,12 +948,12 @@ def test_redundant_rows_diff():
                 '1': {},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 1, 'y': 1},
             (1,0): {        'y': 1},
     }
 
-def test_redundant_rows_same():
+def test_redundant_rows_same(engine):
     config = {
             'row': {
                 'A':   {'x': 1},
@@ -944,7 +964,183 @@ def test_redundant_rows_same():
                 '1': {},
             },
     }
-    assert wells_from_config(config) == {
+    assert wells_from_config(config, engine=engine) == {
             (0,0): {'x': 2},
             (1,0): {'x': 3},
     }
+
+def test_unknown_engine():
+    with raises(ValueError, match="'xxx'"):
+        wellmap.wells_from_config({}, engine='xxx')
+
+@composite
+def configs(draw):
+    values = one_of(
+            integers(0, 2),
+            lists(integers(0, 2), max_size=2),
+            dictionaries(sampled_from('ab'), integers(0, 2), max_size=2),
+    )
+    params = dictionaries(sampled_from('xyz'), values, max_size=3)
+
+    def patterns(*keys):
+        return dictionaries(sampled_from(keys), params, max_size=3)
+
+    dims = {
+            'well': patterns('A1', 'B2', 'A1,A2', 'A1-B2', 'B1,B3,...,B5'),
+            'block': dictionaries(
+                sampled_from(['1x1', '2x1', '1x2', '2x2']),
+                patterns('A1', 'B2', 'A1,A2', 'A1,B3,...,C5'),
+                max_size=3,
+            ),
+            'row': patterns('A', 'B', 'A,B', 'A-C'),
+            'col': patterns('1', '2', '1,2', '1-3'),
+            'irow': patterns('A', 'B'),
+            'icol': patterns('1', '2'),
+            'expt': params,
+    }
+    return {
+            dim: draw(dims[dim])
+            for dim in draw(lists(sampled_from(list(dims)), unique=True))
+    }
+
+def wells_from_config_reference(config):
+    """
+    Fill in each well one at a time, by merging every block that applies to 
+    it.  This is how `wells_from_config()` worked before it was rewritten in 
+    terms of layers, and it's kept here as an independent reference for both 
+    engines.
+    """
+    config = configdict(config)
+    wells = {}
+
+    def iter_wells(config):
+        for key in config:
+            for ij in iter_well_indices(key):
+                yield ij, config[key]
+
+    def iter_rows(config):
+        for key in config:
+            for i in iter_row_indices(key):
+                yield i, config[key]
+
+    def iter_cols(config):
+        for key in config:
+            for j in iter_col_indices(key):
+                yield j, config[key]
+
+    for ij, subconfig in iter_wells(config.wells):
+        wells.setdefault(ij, {})
+        recursive_merge(wells[ij], subconfig, overwrite=True)
+
+    blocks = {}
+    pattern = re.compile(r'(\d+)x(\d+)')
+
+    for size in config.blocks:
+        match = pattern.match(size)
+        if not match:
+            raise LayoutError(f"Unknown [block] size '{size}', expected 'WxH' (where W and H are both positive integers).")
+
+        width, height = map(int, match.groups())
+        if width == 0:
+            raise LayoutError(f"[block.{size}] has no width.  No wells defined.")
+        if height == 0:
+            raise LayoutError(f"[block.{size}] has no height.  No wells defined.")
+
+        for top_left, subconfig in iter_wells(config.blocks[size]):
+            for ij in iter_ij_in_block(top_left, width, height):
+                block = width * height, deepcopy(subconfig)
+                blocks.setdefault(ij, [])
+                blocks[ij].insert(0, block)
+                wells.setdefault(ij, {})
+
+    def simplify_keys(dim):
+        before = config.get(dim, {})
+        after = {}
+        iter = {
+                'row': iter_rows,
+                'col': iter_cols,
+                'irow': iter_rows,
+                'icol': iter_cols,
+        }
+
+        for a, subconfig in iter[dim](before):
+            after.setdefault(a, {})
+            recursive_merge(after[a], subconfig, overwrite=True)
+
+        return after
+
+    def sanity_check(dim1, dim2, span):
+        if config.get(dim1) and not span:
+            raise LayoutError(f"Found {plural(config[dim1]):# [{dim1}] spec/s}, but no {dim2}.  No wells defined.")
+
+    rows = simplify_keys('row')
+    cols = simplify_keys('col')
+    irows = simplify_keys('irow')
+    icols = simplify_keys('icol')
+
+    occupied_non_irow_rows = range_from_indices(
+            *(i for i,j in wells.keys()),
+            *rows.keys(),
+    )
+    occupied_non_icol_cols = range_from_indices(
+            *(j for i,j in wells.keys()),
+            *cols.keys(),
+    )
+    occupied_rows = range_from_indices(
+            *occupied_non_irow_rows,
+            *(interleave(ii,j) for ii,j in itertools.product(
+                irows.keys(), occupied_non_icol_cols))
+    )
+    occupied_cols = range_from_indices(
+            *occupied_non_icol_cols,
+            *(interleave(jj,i) for i,jj in itertools.product(
+                occupied_non_irow_rows, icols.keys()))
+    )
+
+    sanity_check('row', 'columns', occupied_cols)
+    sanity_check('irow', 'columns', occupied_cols)
+    sanity_check('col', 'rows', occupied_rows)
+    sanity_check('icol', 'rows', occupied_rows)
+
+    for ij in itertools.product(rows, occupied_cols):
+        wells.setdefault(ij, {})
+    for ij in itertools.product(occupied_rows, cols):
+        wells.setdefault(ij, {})
+    for ii, j in itertools.product(irows, occupied_cols):
+        ij = interleave(ii, j), j
+        wells.setdefault(ij, {})
+    for i, jj in itertools.product(occupied_rows, icols):
+        ij = i, interleave(jj, i)
+        wells.setdefault(ij, {})
+
+    for ij in wells:
+        i, j = ij
+        ii = interleave(i, j)
+        jj = interleave(j, i)
+
+        blocks_by_area = sorted(blocks.get(ij, []), key=lambda x: x[0])
+        for area, block in blocks_by_area:
+            recursive_merge(wells[ij], block)
+
+        recursive_merge(wells[ij], rows.get(i, {}))
+        recursive_merge(wells[ij], cols.get(j, {}))
+        recursive_merge(wells[ij], irows.get(ii, {}))
+        recursive_merge(wells[ij], icols.get(jj, {}))
+        recursive_merge(wells[ij], config.expt)
+
+    return wells
+
+@given(configs())
+def test_engines_agree(config):
+    try:
+        expected = wells_from_config_reference(config)
+    except LayoutError as err:
+        for engine in ['merge', 'numpy']:
+            with raises(LayoutError) as actual_err:
+                wellmap.wells_from_config(config, engine=engine)
+            assert actual_err.value.message == err.message
+    else:
+        for engine in ['merge', 'numpy']:
+            actual = wellmap.wells_from_config(config, engine=engine)
+            assert actual == expected
+            assert list(actual) == list(expected)
@@ -8,5 +8,5 @@ __version__ = '3.5.2'
 
 from .util import *
 from .file import *
-from .plot import show, show_df, Style, UsageError
+from .plot import show, show_df, render, Style, UsageError
 from . import plot
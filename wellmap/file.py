@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 
-import sys, re, itertools, inspect
+import sys, os, re, itertools, functools, inspect, contextlib
+import hashlib, pickle, tempfile, threading
+import numpy as np
 import pandas as pd
 
 from pathlib import Path
+from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass
+from collections import OrderedDict
+from collections.abc import Mapping
 from inform import plural
-from copy import deepcopy
 from warnings import warn
 from typing import Dict, Set, Any
 from .plot import Style
@@ -41,12 +45,18 @@ def load(
         *,
         data_loader=None,
         merge_cols=None,
+        merge='join',
         path_guess=None, 
         path_required=False,
         on_alert=None,
         meta=False,
         extras=False,
         report_dependencies=False, 
+        workers=None,
+        cache_dir=None,
+        engine='merge',
+        categorical=False,
+        backend='pandas',
 ):
     """
     Load a microplate layout from a TOML file.
@@ -120,6 +130,25 @@ def load(
           merge and never has to be specified (although it is not an error to 
           do so).  The reason for this special-case is that `load()` itself 
           knows what path each data frame was loaded from.
+
+    :param str merge:
+        The algorithm used to merge the layout and the data, if 
+        **merge_cols** is given.  The options are:
+
+        - ``'join'``: Join the data frames on the values in the columns being 
+          merged, using `pandas.merge()` (or `polars.DataFrame.join()`).  Any 
+          rows in the data that don't match a well in the layout are silently 
+          left out.  This is the default.
+
+        - ``'indices'``: Convert the well names in the data to integer row and 
+          column indices, and join the data frames on those.  This gives the 
+          same result, but is much faster when there are many data points for 
+          each well (e.g. time courses).  **merge_cols** must be a dictionary 
+          that only merges on well names, i.e. *well*, *well0*, or *row* and 
+          *col*, and the layout and data must not have any other columns in 
+          common.  A warning is issued for any rows in the data that don't 
+          match a well in the layout.  This option is only supported by the 
+          pandas backend.
        
     :param str path_guess:
         Where to look for a data file if none is specified in the given TOML 
@@ -151,6 +180,72 @@ def load(
     :param bool report_dependencies:
         `Deprecated <load-extras-deps>`.
 
+    :param int,concurrent.futures.Executor workers:
+        Call **data_loader** on multiple data files concurrently.  If an 
+        integer, a `concurrent.futures.ThreadPoolExecutor` with that many 
+        workers will be used.  This is a good choice when the data loader 
+        spends most of its time reading files.  If an executor (e.g. a 
+        `concurrent.futures.ProcessPoolExecutor`), that executor will be used 
+        as-is and will not be shut down afterwards.  Note that process pools 
+        require **data_loader** to be picklable.  The default is to load each 
+        data file serially.  In all cases, the data are concatenated in the 
+        same order as they would be if they were loaded serially.  If 
+        **data_loader** raises an exception, that exception will be re-raised 
+        with an attribute named *data_path* indicating which file was being 
+        loaded.
+
+    :param str,pathlib.Path cache_dir:
+        A directory where parsed layouts can be stored and reused by later 
+        calls to `load()`.  A cached layout is reused only if none of the TOML 
+        files it depends on (see `Meta.dependencies`) have been modified since 
+        it was stored, and if it was loaded with the same **path_guess** and 
+        **path_required** arguments.  Reusing a cached layout skips parsing 
+        the TOML files and expanding the wells entirely.  Any alerts in the 
+        cached layout are still reported via **on_alert**.  If not specified, 
+        the ``$WELLMAP_CACHE`` environment variable will be used.  If that 
+        isn't set either, layouts won't be cached.
+
+    :param str engine:
+        The algorithm used to work out which parameters apply to which wells.  
+        The options are:
+
+        - ``'merge'``: Merge the parameters for each well one well at a time.  
+          This is the default.
+
+        - ``'numpy'``: Merge the parameters for each well one parameter at a 
+          time, using vectorized numpy operations.  This gives the same result, 
+          but is faster for layouts with many wells (e.g. 1536-well plates).
+
+    :param bool,float categorical:
+        Store columns of the layout that contain strings (or other non-numeric 
+        values) as `pandas.Categorical`.  Such columns, e.g. *plate*, *path*, 
+        *row*, and most user-defined parameters, usually have only a few 
+        distinct values repeated over many wells, so this can greatly reduce 
+        the amount of memory needed to store the layout and speed up merges 
+        and groupby operations.  If True, every such column will be 
+        converted.  If a number between 0 and 1, only columns where the 
+        number of distinct values is no more than that fraction of the number 
+        of rows will be converted.  Columns containing unhashable values 
+        (e.g. lists) are never converted.  The default is to not convert any 
+        columns.
+
+    :param str backend:
+        The library used to represent the data frames that are returned.  The 
+        options are:
+
+        - ``'pandas'``: Return `pandas.DataFrame` objects.  This is the 
+          default.
+
+        - ``'polars'``: Return `polars.DataFrame` objects.  The layout is built 
+          directly from the TOML file (via Arrow) and merged with the data 
+          using polars, so neither the layout nor the data pass through pandas 
+          (except for layouts included via `meta.concat`, which are still 
+          loaded with pandas before being converted).  This requires 
+          `polars>=1.17` and `pyarrow` to be installed, and **data_loader** 
+          (if given) must return `polars.DataFrame` objects.  
+          See `PolarsBackend` for the ways in which the results differ from 
+          those of the pandas backend.
+
     :param callable on_alert:
         A callback to invoke if the given TOML file contains a warning for the 
         user.  The default behavior is to print the warning to the terminal via
@@ -209,12 +304,21 @@ def load(
         meta_requested = meta
         extras_requested = extras
 
-        config, paths, concats, meta = config_from_toml(
-                toml_path,
+        backend = get_backend(backend)
+        cache_dir = cache_dir or os.environ.get('WELLMAP_CACHE')
+        layout_kwargs = dict(
                 path_guess=path_guess,
+                path_required=bool(path_required or data_loader),
                 on_alert=on_alert,
-                path_required=path_required or data_loader,
+                engine=engine,
+                backend=backend.name,
         )
+        if cache_dir:
+            layout, meta, missing_path_error = layout_from_cache(
+                    cache_dir, toml_path, **layout_kwargs)
+        else:
+            layout, meta, missing_path_error = layout_from_toml(
+                    toml_path, **layout_kwargs)
 
         def augment_return_value(*args):
             """
@@ -250,82 +354,461 @@ def load(
             if (not extras_requested) and (not meta_requested):
                 return {}
 
-            sig = inspect.signature(data_loader)
-
-            if 'extras' not in sig.parameters:
-                return {}
-            if sig.parameters['extras'].kind not in {
-                    inspect.Parameter.POSITIONAL_OR_KEYWORD,
-                    inspect.Parameter.KEYWORD_ONLY,
-            }:
-                return {}
-
-            return {'extras': meta.extras}
-
-        layout = table_from_config(config, paths)
-        layout = pd.concat([layout, *concats], sort=False)
+            return extras_kwarg(data_loader, meta)
 
         if path_required or data_loader:
             if 'path' not in layout:
-                raise paths.missing_path_error
+                raise missing_path_error
 
             # It shouldn't be possible for only some wells to have paths.
-            assert not layout['path'].isnull().any()
+            assert not backend.has_missing_values(layout, 'path')
 
         if len(layout) == 0:
             raise LayoutError("No wells defined.")
 
+        layout = backend.categorize_columns(layout, categorical)
+
         ## Load the data associated with each well:
         if data_loader is None:
             if merge_cols is not None:
                 raise ValueError("Specified columns to merge, but no function to load data!")
             return augment_return_value(layout)
 
-        data = pd.DataFrame()
-
-        for path in layout['path'].unique():
-            df = data_loader(path, **get_extras_kwarg())
-            df['path'] = path
-            data = pd.concat([data, df], sort=False)
+        data = data_from_layout(
+                layout,
+                data_loader,
+                get_extras_kwarg(),
+                workers=workers,
+                backend=backend,
+        )
 
         ## Merge the layout and the data into a single data frame:
         if merge_cols is None:
             return augment_return_value(layout, data)
 
-        if merge_cols is True:
-            # Merge on any columns with matching names.  Complain if the only 
-            # matching column is "path", because we made that column ourselves.
+        merged = backend.merge(layout, data, merge_cols, merge)
+        return augment_return_value(merged)
 
-            kwargs = {
-                'on': list(set(layout.columns) & set(data.columns))
-            }
-            if kwargs['on'] == ['path']:
-                raise ValueError(f"No common columns (expect 'path') to perform merge on:\nlayout cols: {quoted_join(layout.columns)}\ndata cols: {quoted_join(data.columns)}")
+    except LayoutError as err:
+        err.toml_path = err.toml_path or toml_path
+        raise
+
+def load_many(
+        toml_paths,
+        *,
+        workers=None,
+        concat=False,
+        **kwargs,
+):
+    """
+    Load many microplate layouts at once.
+
+    This is equivalent to calling `load()` on each of the given TOML files, 
+    except that (i) the files can be loaded concurrently and (ii) an error in 
+    one file doesn't prevent the others from being loaded.  Files that are 
+    included by more than one layout are only parsed once (see 
+    `IncludeCache`), as long as the layouts are loaded in the same process.  
+    Paths that refer to the same file (e.g. relative and absolute paths) are 
+    only loaded once, but each path still gets its own entry in the results.
+
+    :param list toml_paths:
+        The paths to the files describing each layout.
+
+    :param int,concurrent.futures.Executor workers:
+        Load multiple layouts concurrently.  If an integer, a 
+        `concurrent.futures.ThreadPoolExecutor` with that many workers will be 
+        used.  If an executor (e.g. a `concurrent.futures.ProcessPoolExecutor`), 
+        that executor will be used as-is and will not be shut down afterwards.  
+        Note that process pools require all of the arguments to be picklable, 
+        and that included files are only shared between layouts loaded by the 
+        same process.  The default is to load each layout serially.  The data 
+        files for each layout are always loaded serially.
+
+    :param bool concat:
+        If true, concatenate the data frames loaded from each layout into a 
+        single data frame, with an additional column named *toml_path* 
+        identifying the layout that each row came from.  This cannot be used 
+        with the **meta**, **extras**, or **report_dependencies** arguments.
+
+    :returns:
+        - **results** – If **concat** is false, a dictionary mapping each of 
+          the given paths to the value that `load()` returned for it.  If 
+          **concat** is true, the same value that `load()` would return (e.g. 
+          a single data frame, or **layout** and **data** data frames if 
+          **data_loader** was given but **merge_cols** was not), but 
+          describing every layout that was successfully loaded.
+
+        - **errors** (`dict`) – A dictionary mapping the path of each layout 
+          that could not be loaded to the exception that was raised.
+
+    All other keyword arguments are passed on to `load()`.
+    """
+    if concat:
+        for key in ['meta', 'extras', 'report_dependencies']:
+            if kwargs.get(key):
+                raise ValueError(f"Can't concatenate *{key}* return values, use `concat=False` instead")
+
+    toml_paths = list(toml_paths)
+    abs_paths = [Path(x).resolve() for x in toml_paths]
+    unique_paths = list(dict.fromkeys(abs_paths))
+
+    load_one = functools.partial(_load_one, **kwargs)
+
+    if workers is None:
+        outcomes = [load_one(x) for x in unique_paths]
+    elif isinstance(workers, Executor):
+        outcomes = list(workers.map(load_one, unique_paths))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(load_one, unique_paths))
+
+    outcomes = dict(zip(unique_paths, outcomes))
+    results = {}
+    errors = {}
+
+    for toml_path, abs_path in zip(toml_paths, abs_paths):
+        result, error = outcomes[abs_path]
+        if error is None:
+            results[toml_path] = result
         else:
-            if not merge_cols:
-                raise ValueError("Must specify at least one column to merge on (i.e. cannot specify empty `merge_cols` dict).")
-
-            def check_merge_cols(cols, known_cols, attrs):
-                unknown_cols = set(cols) - set(known_cols)
-                if unknown_cols:
-                    raise ValueError(f"Cannot merge on {quoted_join(unknown_cols)}.  Allowed {attrs} of the `merge_cols` dict: {quoted_join(known_cols)}.")
-                return list(cols)
-
-            left_ok = 'well', 'well0', 'row', 'col', 'row_i', 'col_i', 'plate'
-            kwargs = {
-                    'left_on': ['path'] + check_merge_cols(
-                        merge_cols.keys(), left_ok, 'keys'),
-                    'right_on': ['path'] + check_merge_cols(
-                        merge_cols.values(), data.columns, 'values'),
-            }
+            errors[toml_path] = error
+
+    if concat:
+        # Work out how many data frames `load()` returns from the arguments, 
+        # rather than from the results, in case every layout failed to load.
+        if kwargs.get('data_loader') is not None \
+                and kwargs.get('merge_cols') is None:
+            num_values = 2
+        else:
+            num_values = 1
 
-        merged = pd.merge(layout, data, **kwargs)
-        return augment_return_value(merged)
+        backend = get_backend(kwargs.get('backend', 'pandas'))
+        results = concat_results(backend, results, num_values)
+
+    return results, errors
+
+def _load_one(toml_path, **kwargs):
+    # This function needs to be defined at the module level, so that it can be 
+    # pickled and sent to other processes.
+    try:
+        return load(toml_path, **kwargs), None
+    except Exception as err:
+        return None, err
+
+def concat_results(backend, results, num_values):
+    """
+    Concatenate the values returned by `load()` for several layouts, adding a 
+    *toml_path* column to each data frame.  Each value must consist of the 
+    given number of data frames.
+    """
+    toml_paths = list(results)
+    values = [
+            x if isinstance(x, tuple) else (x,)
+            for x in results.values()
+    ]
+    concats = tuple(
+            backend.concat_with_column(
+                [x[i] for x in values],
+                'toml_path',
+                toml_paths,
+            )
+            for i in range(num_values)
+    )
+    return concats if num_values != 1 else concats[0]
+
+def iter_load(
+        toml_path,
+        *,
+        data_loader=None,
+        merge_cols=None,
+        merge='join',
+        path_guess=None, 
+        path_required=False,
+        on_alert=None,
+        engine='merge',
+        categorical=False,
+):
+    """
+    Load a microplate layout from a TOML file, one plate at a time.
+
+    This function is a generator.  It takes the same arguments as `load()` 
+    (except for those that only make sense when loading everything at once), 
+    but instead of returning a single data frame describing every plate, it 
+    yields a separate data frame for each plate.  The wells for each plate are 
+    only worked out, and the data for each plate is only loaded, when that 
+    plate is requested.  This means that the memory needed to process a 
+    layout is bounded by the size of the largest plate, which can be useful 
+    for layouts with many plates and lots of data.
+
+    :returns:
+        Each item yielded by the generator is a tuple.  The first value in the 
+        tuple is the name of the plate, or None if the layout doesn't have any 
+        named plates.  The remaining values are the same as those returned by 
+        `load()`, but limited to a single plate:
+
+        - If neither **data_loader** nor **merge_cols** were provided: 
+          **layout**
+
+        - If **data_loader** was provided but **merge_cols** was not: 
+          **layout**, **data**
+
+        - If **data_loader** and **merge_cols** were both provided: **merged**
+
+        The columns of each data frame only include the parameters used by 
+        that plate.  If **data_loader** takes an argument named "extras", it 
+        will always be provided.  Layouts included via `meta.concat` are 
+        yielded after all of the plates in the main layout, one plate at a 
+        time.  However, concatenated layouts are loaded all at once.
+    """
+
+    try:
+        if data_loader is None and merge_cols is not None:
+            raise ValueError("Specified columns to merge, but no function to load data!")
+
+        config, paths, concats, meta = config_from_toml(
+                toml_path,
+                path_guess=path_guess,
+                path_required=bool(path_required or data_loader),
+                on_alert=on_alert,
+        )
+
+        def iter_layouts():
+            yield from iter_tables_from_config(config, paths, engine=engine)
+
+            for df in concats:
+                # Concatenated layouts are cached (see `IncludeCache`), so 
+                # don't give the caller a frame that later loads will reuse.
+                if 'plate' not in df:
+                    yield None, df.copy()
+                    continue
+
+                # Concatenated layouts may themselves concatenate layouts 
+                # with and without named plates, so don't drop wells that 
+                # aren't on a named plate.
+                for plate, plate_df in df.groupby('plate', sort=False, dropna=False):
+                    yield (None if pd.isna(plate) else plate), plate_df
+
+        num_wells = 0
+
+        for plate, layout in iter_layouts():
+            if len(layout) == 0:
+                continue
+
+            if path_required or data_loader:
+                if 'path' not in layout:
+                    raise paths.missing_path_error
+
+                # It shouldn't be possible for only some wells to have paths.
+                assert not layout['path'].isnull().any()
+
+            num_wells += len(layout)
+            layout = categorize_columns(layout, categorical)
+
+            if data_loader is None:
+                yield plate, layout
+                continue
+
+            data = data_from_layout(
+                    layout,
+                    data_loader,
+                    extras_kwarg(data_loader, meta),
+            )
+
+            if merge_cols is None:
+                yield plate, layout, data
+            else:
+                yield plate, merge_layout_and_data(
+                        layout, data, merge_cols, merge)
+
+        if num_wells == 0:
+            raise LayoutError("No wells defined.")
+
+    except LayoutError as err:
+        err.toml_path = err.toml_path or toml_path
+        raise
+
+def to_arrow(
+        toml_path,
+        *,
+        path_guess=None,
+        path_required=False,
+        on_alert=None,
+        engine='merge',
+):
+    """
+    Load a microplate layout from a TOML file into an Arrow table.
+
+    The table has the same columns as the data frame returned by `load()`, 
+    but is built directly from the wells described by the TOML file, without 
+    making a `pandas.DataFrame` first.  This is useful for passing layouts to 
+    tools that understand Arrow, e.g. DuckDB, Spark, or polars, or for 
+    writing layouts to Parquet files.  Note that `pyarrow` must be installed 
+    to use this function.
+
+    All string columns are dictionary-encoded, since most have only a few 
+    distinct values repeated over many wells.  The *path* column contains 
+    strings rather than `pathlib.Path` objects, and wells that don't have a 
+    value for a parameter get null rather than NaN.  Each column must have 
+    values of a single type (e.g. not numbers in some wells and strings in 
+    others), otherwise a `LayoutError` is raised.
+
+    :param str,pathlib.Path toml_path:
+        The path to a file describing the layout of one or more plates.  See 
+        the :doc:`/file_format` page for details about this file.
+
+    :returns: `pyarrow.Table`
+
+    See `load()` for a description of the other arguments.  There is no way 
+    to load data files with this function.
+    """
+
+    try:
+        config, paths, concats, meta = config_from_toml(
+                toml_path,
+                path_guess=path_guess,
+                path_required=path_required,
+                on_alert=on_alert,
+        )
+        table = arrow_table_from_config(config, paths, concats, engine=engine)
+
+        if len(table) == 0:
+            raise LayoutError("No wells defined.")
+
+        if path_required:
+            if 'path' not in table.column_names or table['path'].null_count:
+                raise paths.missing_path_error
+
+        return table
 
     except LayoutError as err:
         err.toml_path = err.toml_path or toml_path
         raise
 
+def layout_from_toml(
+        toml_path,
+        *,
+        path_guess,
+        path_required,
+        on_alert,
+        engine='merge',
+        backend='pandas',
+):
+    """
+    Parse the given TOML file into a data frame with a row for each well.
+
+    Return the layout, the `Meta` object, and the error to raise if the layout 
+    turns out to need a data file that wasn't specified.
+    """
+    config, paths, concats, meta = config_from_toml(
+            toml_path,
+            path_guess=path_guess,
+            on_alert=on_alert,
+            path_required=path_required,
+    )
+    layout = get_backend(backend).layout_from_config(
+            config, paths, concats, engine=engine)
+
+    return layout, meta, paths.missing_path_error
+
+def layout_from_cache(cache_dir, toml_path, *, on_alert, **kwargs):
+    """
+    Same as `layout_from_toml()`, but reuse a result previously stored in the 
+    given directory if none of its dependencies have changed.
+    """
+    from . import __version__
+
+    toml_path = Path(toml_path).resolve()
+    cache_key = repr((__version__, str(toml_path), sorted(kwargs.items())))
+    cache_name = hashlib.sha256(cache_key.encode()).hexdigest() + '.pkl'
+    cache_path = Path(cache_dir) / cache_name
+
+    def report_alerts(alerts):
+        for path, message in alerts:
+            (on_alert or print_alert)(path, message)
+
+    # Any problem reading the cache (e.g. a truncated file, or a file written 
+    # by an incompatible version of pandas) just means that the layout needs 
+    # to be parsed again.
+    try:
+        with open(cache_path, 'rb') as f:
+            cache = pickle.load(f)
+    except Exception:
+        pass
+    else:
+        # The layout also depends on the data files existing, but not on 
+        # their contents.  If any have disappeared, parse the layout again so 
+        # that `PathManager` can raise the appropriate error.
+        is_fresh = (
+                get_fingerprints(cache['fingerprints']) == cache['fingerprints']
+                and all(os.path.exists(x) for x in cache['data_paths'])
+        )
+        if is_fresh:
+            report_alerts(cache['alerts'])
+            missing_path_error = cache['missing_path_error']
+            if missing_path_error is not None:
+                missing_path_error = LayoutError(missing_path_error)
+            return cache['layout'], cache['meta'], missing_path_error
+
+    alerts = []
+
+    def record_alert(path, message):
+        alerts.append((path, message))
+
+    layout, meta, missing_path_error = layout_from_toml(
+            toml_path,
+            on_alert=record_alert,
+            **kwargs,
+    )
+    report_alerts(alerts)
+
+    if 'path' in layout.columns:
+        data_paths = get_backend(kwargs['backend']).unique_paths(layout)
+    else:
+        data_paths = []
+
+    cache = {
+            'fingerprints': get_fingerprints(meta.dependencies),
+            'data_paths': [str(x) for x in data_paths],
+            'layout': layout,
+            'meta': meta,
+            'missing_path_error': getattr(missing_path_error, 'message', None),
+            'alerts': alerts,
+    }
+
+    # Write to a temporary file first, so that other processes never see a 
+    # partially written cache.  Failing to write the cache (e.g. because the 
+    # directory is read-only) shouldn't prevent the layout from being loaded.
+    tmp_path = None
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+                dir=cache_path.parent, suffix='.tmp', delete=False) as f:
+            tmp_path = f.name
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+
+    except OSError as err:
+        warn(f"Couldn't write to the layout cache: {err}")
+        if tmp_path:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+
+    return layout, meta, missing_path_error
+
+def get_fingerprints(paths):
+    """
+    Return a dictionary that can be used to tell if any of the given files 
+    have changed, or None if any of the files don't exist.
+    """
+    fingerprints = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        fingerprints[path] = stat.st_mtime_ns, stat.st_size
+    return fingerprints
+
 def config_from_toml(
         toml_path,
         *,
@@ -415,7 +898,7 @@ def config_from_toml(
         # for any philosophical reason, just because it would be tricky to 
         # implement (and not very useful).  Note that the *path_required* 
         # argument isn't provided to the recursive call; this is why.
-        subconfig, _, subconcats, submeta = config_from_toml(
+        subconfig, _, subconcats, submeta = include_cache.config_from_toml(
                 subpath,
                 shift=subshift,
                 on_alert=on_alert,
@@ -461,23 +944,23 @@ def config_from_toml(
         # Should do something with style and extras, see #37.
 
     if 'alert' in config.meta:
-        if on_alert:
-            on_alert(toml_path, config.meta['alert'])
-        else:
-            try: print(f"{toml_path.relative_to(Path.cwd())}:", file=sys.stderr)
-            except ValueError: print(f"{toml_path}:", file=sys.stderr)
-            print(config.meta['alert'], file=sys.stderr)
+        (on_alert or print_alert)(toml_path, config.meta['alert'])
 
     config.pop('meta', None)
     return config, paths, concats, meta
 
+def print_alert(toml_path, message):
+    try: print(f"{toml_path.relative_to(Path.cwd())}:", file=sys.stderr)
+    except ValueError: print(f"{toml_path}:", file=sys.stderr)
+    print(message, file=sys.stderr)
+
 def shift_config(config, shift):
     if shift == (0, 0):
         return config
 
     shifted_config = {}
 
-    f = lambda d: shift_pattern(d, shift)
+    f = lambda d: ShiftedPattern(d, shift)
     def cant_shift_irow_icol():
         raise LayoutError("can't use 'meta.include.shift' on layouts that use [irow] and/or [icol]")
 
@@ -499,20 +982,49 @@ def shift_config(config, shift):
 
     return shifted_config
 
-def table_from_config(config, paths):
+def table_from_config(config, paths, *, engine='merge'):
     config = configdict(config)
+    tables = [
+            table
+            for plate, table in iter_tables_from_config(
+                config, paths, engine=engine)
+    ]
 
     if not config.plates:
-        wells = wells_from_config(config)
+        return tables[0]
+
+    # Make an effort to keep the columns in a reasonable order.  I don't know 
+    # why `pd.concat()` doesn't do this on its own...
+    cols = tables[-1].columns
+    return pd.concat(tables, sort=False)[cols]
+
+def iter_tables_from_config(config, paths, *, engine='merge'):
+    """
+    Yield the name and table of each plate in the given config, one plate at a 
+    time.  The name is None if the config doesn't have any [plate] blocks.
+    """
+    for plate, wells, index in iter_wells_from_config(
+            config, paths, engine=engine):
+        yield plate, table_from_wells(wells, index)
+
+def iter_wells_from_config(config, paths, *, engine='merge'):
+    """
+    Yield the name, wells, and index (i.e. the plate and path columns) of each 
+    plate in the given config, one plate at a time.
+    """
+    config = configdict(config)
+
+    if not config.plates:
+        wells = wells_from_config(config, engine=engine)
         # Getting the index can raise errors we might not care about if there 
         # aren't any wells (e.g. it doesn't matter if a path doesn't exist if 
         # it won't be associated with any wells).  Skipping the call is a bit 
         # of a hacky way to avoid these errors, but it works.
         index = paths.get_index_for_only_plate() if wells else {}
-        return table_from_wells(wells, index)
+        yield None, wells, index
 
     else:
-        tables = []
+        shared = None
         paths.check_named_plates(config.plates)
 
         for key, plate_config in config.plates.items():
@@ -527,44 +1039,78 @@ def table_from_config(config, paths):
             # avoid infinite recursion.
             plate_config = plate_config.copy()
             plate_config['expt'] = configdict(plate_config).user
+            plate = expand_config(plate_config)
+
+            # The top-level config is the same for every plate, so only expand 
+            # it once.  Each plate is then applied on top of it, with higher 
+            # precedence than the same well group outside the plate.
+            if shared is None:
+                shared = expand_config(config)
 
-            plate_config = recursive_merge(plate_config, config)
-            wells = wells_from_config(plate_config)
+            wells = wells_from_expansions([plate, shared], engine=engine)
 
             index = paths.get_index_for_named_plate(key) if wells else {}
-            tables += [table_from_wells(wells, index)]
+            yield key, wells, index
 
-        # Make an effort to keep the columns in a reasonable order.  I don't 
-        # know why `pd.concat()` doesn't do this on its own...
-        cols = tables[-1].columns
-        return pd.concat(tables, sort=False)[cols]
+def wells_from_config(config, *, engine='merge'):
+    return wells_from_expansions([expand_config(config)], engine=engine)
 
-def wells_from_config(config):
-    config = configdict(config)
-    wells = {}
+def wells_from_expansions(expansions, *, engine='merge'):
+    engines = {
+            'merge': wells_from_layers_merge,
+            'numpy': wells_from_layers_numpy,
+    }
+    try:
+        wells_from_layers = engines[engine]
+    except KeyError:
+        raise ValueError(f"Unknown engine {engine!r}, expected one of: {quoted_join(engines)}") from None
 
-    def iter_wells(config):
-        for key in config:
-            for ij in iter_well_indices(key):
-                yield ij, config[key]
+    ijs, layers = layers_from_expansions(expansions)
+    return wells_from_layers(ijs, layers)
+
+def expand_config(config):
+    """
+    Resolve all of the well, row, and column names in the given config into 
+    indices.
+
+    Nothing here depends on any other config, so the result can be reused each 
+    time the same config is combined with another (e.g. when the top-level 
+    config is combined with each plate).
+    """
+    config = configdict(config)
 
     def iter_rows(config):
         for key in config:
-            for i in iter_row_indices(key):
+            for i in row_indices_from_pattern(key):
                 yield i, config[key]
 
     def iter_cols(config):
         for key in config:
-            for j in iter_col_indices(key):
+            for j in col_indices_from_pattern(key):
                 yield j, config[key]
 
-    ## Create and fill in wells defined by 'well' blocks.
-    for ij, subconfig in iter_wells(config.wells):
-        wells.setdefault(ij, {})
-        recursive_merge(wells[ij], subconfig, overwrite=True)
+    def simplify_keys(dim):
+        before = config.get(dim, {})
+        after = {}
+        iter = {
+                'row': iter_rows,
+                'col': iter_cols,
+                'irow': iter_rows,
+                'icol': iter_cols,
+        }
+        
+        for a, subconfig in iter[dim](before):
+            after.setdefault(a, {})
+            recursive_merge(after[a], subconfig, overwrite=True)
+
+        return after
 
-    ## Create new wells implied by any 'block' blocks:
-    blocks = {}
+    wells = [
+            (well_indices_from_pattern(key), config.wells[key])
+            for key in config.wells
+    ]
+
+    blocks = []
     pattern = re.compile(r'(\d+)x(\d+)')
 
     for size in config.blocks:
@@ -578,39 +1124,90 @@ def wells_from_config(config):
         if height == 0:
             raise LayoutError(f"[block.{size}] has no height.  No wells defined.")
 
-        for top_left, subconfig in iter_wells(config.blocks[size]):
-            for ij in iter_ij_in_block(top_left, width, height):
-                block = width * height, deepcopy(subconfig)
-                blocks.setdefault(ij, [])
-                blocks[ij].insert(0, block)
-                wells.setdefault(ij, {})
-    
-    ## Create new wells implied by any 'row' & 'col' blocks.
+        for key in config.blocks[size]:
+            for top_left in well_indices_from_pattern(key):
+                ijs = list(iter_ij_in_block(top_left, width, height))
+                blocks.append((width * height, ijs, config.blocks[size][key]))
+
+    return ConfigExpansion(
+            wells=wells,
+            blocks=blocks,
+            rows=simplify_keys('row'),
+            cols=simplify_keys('col'),
+            irows=simplify_keys('irow'),
+            icols=simplify_keys('icol'),
+            expt=config.expt,
+            specs={
+                dim: list(config.get(dim, {}))
+                for dim in ['row', 'col', 'irow', 'icol']
+            },
+    )
 
-    def simplify_keys(dim):
-        before = config.get(dim, {})
-        after = {}
-        iter = {
-                'row': iter_rows,
-                'col': iter_cols,
-                'irow': iter_rows,
-                'icol': iter_cols,
-        }
-        
-        for a, subconfig in iter[dim](before):
-            after.setdefault(a, {})
-            recursive_merge(after[a], subconfig, overwrite=True)
+def layers_from_expansions(expansions):
+    """
+    Work out which wells are defined by the given expanded configs, and which 
+    parameters apply to which wells.
+
+    The expanded configs should be given in order of precedence, highest 
+    first.  Each well group in one config has higher precedence than the same 
+    well group in any of the following configs, but lower precedence than any 
+    higher well group.
+
+    Return a list of the (row, col) indices of every well, in the order they 
+    were defined, and a list of "layers".  Each layer is a tuple of (i) an 
+    array of positions in the list of wells, (ii) the parameters that apply to 
+    those wells, and (iii) whether or not those parameters should overwrite 
+    any that were already applied.  Merging the layers in order gives the 
+    parameters for each well.
+    """
+    wells = {}
+    layers = []
+
+    def add_well(ij):
+        return wells.setdefault(ij, len(wells))
+
+    def add_wells(ijs):
+        return np.array([add_well(ij) for ij in ijs], dtype=int)
+
+    def merge_dims(dim):
+        merged = {}
+        for expansion in expansions:
+            for a, subconfig in getattr(expansion, dim).items():
+                merged.setdefault(a, []).append(subconfig)
+        return merged
+
+    ## Create and fill in wells defined by 'well' blocks.  These layers 
+    ## overwrite any previous values, so the highest precedence comes last.
+    well_layers = [
+            [(add_wells(ijs), subconfig, True) for ijs, subconfig in x.wells]
+            for x in expansions
+    ]
+    for x in reversed(well_layers):
+        layers += x
 
-        return after
+    ## Create new wells implied by any 'block' blocks:
+    blocks = [
+            ((area, rank, -order), add_wells(ijs), subconfig)
+            for rank, expansion in enumerate(expansions)
+            for order, (area, ijs, subconfig) in enumerate(expansion.blocks)
+    ]
+
+    # Smaller blocks take precedence over larger ones.  For blocks of the same 
+    # size, the block defined later takes precedence.
+    for _, indices, subconfig in sorted(blocks, key=lambda x: x[0]):
+        layers.append((indices, subconfig, False))
+    
+    ## Create new wells implied by any 'row' & 'col' blocks.
 
     def sanity_check(dim1, dim2, span):
-        if config.get(dim1) and not span:
-            raise LayoutError(f"Found {plural(config[dim1]):# [{dim1}] spec/s}, but no {dim2}.  No wells defined.")
+        specs = {k: None for x in expansions for k in x.specs[dim1]}
+        if specs and not span:
+            raise LayoutError(f"Found {plural(specs):# [{dim1}] spec/s}, but no {dim2}.  No wells defined.")
 
-    rows = simplify_keys('row')
-    cols = simplify_keys('col')
-    irows = simplify_keys('irow')
-    icols = simplify_keys('icol')
+    rows = merge_dims('rows')
+    cols = merge_dims('cols')
+    irows = merge_dims('irows')
+    icols = merge_dims('icols')
 
     occupied_non_irow_rows = range_from_indices(
             *(i for i,j in wells.keys()),
@@ -637,62 +1234,657 @@ def wells_from_config(config):
     sanity_check('icol', 'rows', occupied_rows)
 
     for ij in itertools.product(rows, occupied_cols):
-        wells.setdefault(ij, {})
+        add_well(ij)
     for ij in itertools.product(occupied_rows, cols):
-        wells.setdefault(ij, {})
+        add_well(ij)
     for ii, j in itertools.product(irows, occupied_cols):
-        ij = interleave(ii, j), j
-        wells.setdefault(ij, {})
+        add_well((interleave(ii, j), j))
     for i, jj in itertools.product(occupied_rows, icols):
-        ij = i, interleave(jj, i)
-        wells.setdefault(ij, {})
-
-    ## Fill in any wells created above.
-    for ij in wells:
-        i, j = ij
-        ii = interleave(i, j)
-        jj = interleave(j, i)
-
-        # Merge in order of precedence: [block], [row/col], top-level.
-        # [well] is already accounted for.
-        blocks_by_area = sorted(blocks.get(ij, []), key=lambda x: x[0])
-        for area, block in blocks_by_area:
-            recursive_merge(wells[ij], block)
-
-        recursive_merge(wells[ij], rows.get(i, {}))
-        recursive_merge(wells[ij], cols.get(j, {}))
-        recursive_merge(wells[ij], irows.get(ii, {}))
-        recursive_merge(wells[ij], icols.get(jj, {}))
-        recursive_merge(wells[ij], config.expt)
-
-    return wells
+        add_well((i, interleave(jj, i)))
+
+    ## Apply the [row], [col], [irow], [icol], and [expt] parameters to every 
+    ## well created above.  Each well is in at most one of each kind of layer, 
+    ## so merging layer-by-layer is equivalent to merging in order of 
+    ## precedence for each individual well: [block], [row/col], top-level.
+
+    ijs = list(wells)
+    i = np.array([ij[0] for ij in ijs], dtype=int)
+    j = np.array([ij[1] for ij in ijs], dtype=int)
+
+    # Same as `interleave()`, but vectorized.
+    ii = np.where(i % 2 == 0, i + j % 2, i - j % 2)
+    jj = np.where(j % 2 == 0, j + i % 2, j - i % 2)
+
+    for coords, subconfigs in [(i, rows), (j, cols), (ii, irows), (jj, icols)]:
+        for a, subconfigs_a in subconfigs.items():
+            indices = np.flatnonzero(coords == a)
+            for subconfig in subconfigs_a:
+                layers.append((indices, subconfig, False))
+
+    for expansion in expansions:
+        layers.append((np.arange(len(ijs)), expansion.expt, False))
+
+    return ijs, layers
+
+def wells_from_layers_merge(ijs, layers):
+    """
+    Merge the parameters for each well one well at a time.
+    """
+    wells = [{} for _ in ijs]
+
+    for indices, subconfig, overwrite in layers:
+        for k in indices:
+            recursive_merge(wells[k], subconfig, overwrite=overwrite)
+
+    return dict(zip(ijs, wells))
+
+def wells_from_layers_numpy(ijs, layers):
+    """
+    Merge the parameters for each well one parameter at a time.
+
+    This gives the same result as `wells_from_layers_merge()`, but is much 
+    faster for layouts with many wells.  The idea is to record which value each 
+    well should have for each parameter in an integer array, with a row for 
+    each parameter and a column for each well.  Filling in this array is 
+    vectorized, and no dictionaries need to be merged.
+    """
+    keys = list({k: None for _, subconfig, _ in layers for k in subconfig})
+
+    # Parameters that are themselves tables have to be merged recursively.  
+    # This isn't worth vectorizing, so merge these parameters one well at a 
+    # time, like `wells_from_layers_merge()` does.
+    nested_keys = {
+            k
+            for _, subconfig, _ in layers
+            for k, v in subconfig.items()
+            if isinstance(v, dict)
+    }
+    flat_keys = [k for k in keys if k not in nested_keys]
+    key_rows = {k: i for i, k in enumerate(flat_keys)}
+
+    # Layers that overwrite existing values always come first.  Within those 
+    # layers, the last layer to specify a value takes precedence.  Within the 
+    # remaining layers, the first layer to specify a value takes precedence.
+    num_overwrite = sum(overwrite for _, _, overwrite in layers)
+    overwrite_layers = layers[:num_overwrite]
+    other_layers = layers[num_overwrite:]
+    assert all(overwrite for _, _, overwrite in overwrite_layers)
+
+    values = []
+    sources = np.full((len(flat_keys), len(ijs)), -1)
+
+    for indices, subconfig, _ in [*reversed(overwrite_layers), *other_layers]:
+        items = [(k, v) for k, v in subconfig.items() if k in key_rows]
+        if not items or not len(indices):
+            continue
+
+        rows = np.array([key_rows[k] for k, v in items])
+        value_ids = np.arange(len(values), len(values) + len(items))
+        values += [v for k, v in items]
+
+        block = np.ix_(rows, indices)
+        sources[block] = np.where(
+                sources[block] < 0,
+                value_ids[:, np.newaxis],
+                sources[block],
+        )
+
+    # Build an object array by hand, so numpy doesn't try to interpret any 
+    # list values as extra dimensions.  The extra element at the end is what 
+    # the -1 "unset" indices refer to.
+    value_array = np.empty(len(values) + 1, dtype=object)
+    for i, v in enumerate(values):
+        value_array[i] = v
+
+    columns = {}
+
+    for key in keys:
+        if key in nested_keys:
+            merged = {}
+            for indices, subconfig, overwrite in layers:
+                if key in subconfig:
+                    param = {key: subconfig[key]}
+                    for k in indices:
+                        well = merged.setdefault(k, {})
+                        recursive_merge(well, param, overwrite=overwrite)
+
+            column = np.empty(len(ijs), dtype=object)
+            is_set = np.zeros(len(ijs), dtype=bool)
+            for k, well in merged.items():
+                column[k] = well[key]
+                is_set[k] = True
+
+        else:
+            source = sources[key_rows[key]]
+            column = value_array[source]
+            is_set = source >= 0
+
+        columns[key] = column, is_set
+
+    # Order the parameters the same way `wells_from_layers_merge()` does: by 
+    # the first well to have a value for each parameter, and then by the order 
+    # in which the parameters were merged into that well, i.e. by the first 
+    # layer to give that well a value, and the order of the keys within that 
+    # layer.
+    first_wells = {
+            key: np.argmax(is_set)
+            for key, (column, is_set) in columns.items()
+            if is_set.any()
+    }
+    ranks = {}
+
+    for l, (indices, subconfig, _) in enumerate(layers):
+        candidates = [
+                (k, key)
+                for k, key in enumerate(subconfig)
+                if key not in ranks and key in first_wells
+        ]
+        if not candidates:
+            continue
+
+        wells = np.array([first_wells[key] for k, key in candidates])
+        for (k, key), is_covered in zip(candidates, np.isin(wells, indices)):
+            if is_covered:
+                ranks[key] = first_wells[key], l, k
+
+        if len(ranks) == len(first_wells):
+            break
+
+    columns = {
+            key: columns[key]
+            for key in sorted(ranks, key=ranks.get)
+    }
+    return WellColumns(ijs, columns)
     
 def table_from_wells(wells, index):
-    table = []
-    user_cols = []
-    max_j = max([12] + [j for i,j in wells])
+    columns = columns_from_wells(wells, index)
+    return pd.DataFrame(columns, index=range(len(wells)))
+
+def arrow_table_from_config(config, paths, concats, *, engine='merge'):
+    """
+    Same as `table_from_config()`, but return a `pyarrow.Table`, and include 
+    the given concatenated layouts.
+    """
+    import pyarrow as pa
+
+    tables = [
+            arrow_table_from_wells(wells, index)
+            for plate, wells, index in iter_wells_from_config(
+                config, paths, engine=engine)
+            if wells
+    ]
+    tables += [arrow_table_from_df(df) for df in concats if len(df)]
+
+    return concat_arrow_tables(tables) if tables else pa.table({})
+
+def arrow_table_from_wells(wells, index):
+    """
+    Same as `table_from_wells()`, but return a `pyarrow.Table`.
+    """
+    import pyarrow as pa
+
+    columns = columns_from_wells(wells, index)
+
+    # Repeat the index values (e.g. plate names and paths) for every well.
+    for k, v in index.items():
+        v = str(v) if isinstance(v, Path) else v
+        columns[k] = pa.repeat(pa.scalar(v), len(wells)).dictionary_encode()
+
+    return pa.table({
+            k: arrow_array_from_column(k, v)
+            for k, v in columns.items()
+    })
+
+def columns_from_wells(wells, index):
+    """
+    Return a dictionary of the columns needed to make a table from the given 
+    wells.  The values of the index columns are scalars, all other columns are 
+    lists or arrays.
+    """
+    ijs = list(wells)
+    i = np.array([ij[0] for ij in ijs], dtype=int)
+    j = np.array([ij[1] for ij in ijs], dtype=int)
+    max_j = j.max(initial=12)
     digits = len(str(max_j + 1))
-    
-    for i, j in wells:
-        row, col = row_col_from_ij(i, j)
-        well = well_from_ij(i, j)
-        well0 = well0_from_well(well, digits=digits)
-        user_cols += [x for x in wells[i,j] if x not in user_cols]
-
-        table += [{
-                **wells[i,j],
-                **index,
-                'well': well,
-                'well0': well0,
-                'row': row, 'col': col,
-                'row_i': i, 'col_j': j,
-        }]
+
+    rows, cols = row_cols_from_ij(i, j)
+
+    table = {
+            **user_columns_from_wells(wells),
+            **index,
+            'well': wells_from_row_cols(rows, cols),
+            'well0': well0s_from_row_cols(rows, cols, digits),
+            'row': rows, 'col': cols,
+            'row_i': i, 'col_j': j,
+    }
 
     # Make an effort to put the columns in a reasonable order:
     columns = ['well', 'well0', 'row', 'col', 'row_i', 'col_j']
-    columns += list(index) + user_cols
+    columns += list(index) + list(table)
+
+    return {k: table[k] for k in dict.fromkeys(columns)}
+
+def user_columns_from_wells(wells):
+    """
+    Return a list of values for each parameter in the given wells.
+
+    Wells that don't have a value for a parameter get NaN.  The parameters are 
+    ordered by the first well to have a value for each.
+    """
+    nan = float('nan')
+
+    if isinstance(wells, WellColumns):
+        # The columns are already in the right order; see 
+        # `wells_from_layers_numpy()`.  Convert each to a list, so pandas 
+        # will infer the column's data type the same way it would for the 
+        # dictionary-based `wells`.
+        return {
+                key: [
+                    x if set else nan
+                    for x, set in zip(column.tolist(), is_set.tolist())
+                ]
+                for key, (column, is_set) in wells.columns.items()
+                if is_set.any()
+        }
+
+    else:
+        keys = dict.fromkeys(k for params in wells.values() for k in params)
+        return {
+                k: [params.get(k, nan) for params in wells.values()]
+                for k in keys
+        }
+
+def arrow_array_from_column(key, values):
+    """
+    Convert the given column of a layout into an Arrow array, with 
+    dictionary-encoded strings.  Missing values (NaN) become nulls.
+    """
+    import pyarrow as pa
+
+    if isinstance(values, (pa.Array, pa.ChunkedArray)):
+        return values
+
+    try:
+        values = pa.array(values, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as err:
+        raise LayoutError(f"Can't convert {key!r} to an Arrow column: {err}") from None
+
+    if pa.types.is_string(values.type):
+        values = values.dictionary_encode()
+
+    return values
+
+def arrow_table_from_df(df):
+    """
+    Convert the given layout data frame into a `pyarrow.Table`, with the same 
+    column types as `arrow_table_from_wells()`.
+    """
+    import pyarrow as pa
+
+    if 'path' in df:
+        df = df.assign(path=df['path'].map(str, na_action='ignore'))
+
+    return pa.table({
+        k: arrow_array_from_column(k, df[k].to_numpy(dtype=object))
+        for k in df.columns
+    })
+
+def concat_arrow_tables(tables):
+    """
+    Concatenate the given tables, filling in nulls for any missing columns.
+
+    Columns that have integer values in some tables and floating-point values 
+    in others (e.g. ``x = 1`` on one plate and ``x = 1.5`` on another) are 
+    converted to floating-point, like pandas would.  Any other combination of 
+    types raises a `LayoutError`.
+    """
+    import pyarrow as pa
+
+    types = {}
+    for table in tables:
+        for field in table.schema:
+            if not pa.types.is_null(field.type):
+                types.setdefault(field.name, {})[field.type] = None
+
+    casts = {}
+    for key, key_types in types.items():
+        if len(key_types) == 1:
+            continue
+
+        is_numeric = all(
+                pa.types.is_integer(x) or pa.types.is_floating(x)
+                for x in key_types
+        )
+        if not is_numeric:
+            names = [
+                    str(x.value_type if pa.types.is_dictionary(x) else x)
+                    for x in key_types
+            ]
+            raise LayoutError(f"Can't combine the values of {key!r} from different plates, found: {quoted_join(names)}")
+
+        casts[key] = pa.float64()
+
+    def cast_table(table):
+        schema = pa.schema([
+            field.with_type(casts[field.name])
+            if field.name in casts and not pa.types.is_null(field.type)
+            else field
+            for field in table.schema
+        ])
+        return table.cast(schema)
+
+    if casts:
+        tables = [cast_table(x) for x in tables]
+
+    if int(pa.__version__.split('.')[0]) >= 14:
+        return pa.concat_tables(tables, promote_options='default')
+    else:
+        return pa.concat_tables(tables, promote=True)
+
+def data_from_layout(layout, data_loader, kwargs, *, workers=None, backend=None):
+    """
+    Load the data files referenced by the given layout, and concatenate them 
+    into a single data frame with a *path* column.
+    """
+    backend = backend or PandasBackend()
+    data_paths = backend.unique_paths(layout)
+    data_frames = load_data_files(
+            data_loader,
+            data_paths,
+            kwargs,
+            workers=workers,
+    )
+    return backend.concat_data(data_frames, data_paths)
+
+def merge_layout_and_data(layout, data, merge_cols, merge='join'):
+    """
+    Merge the given layout and data frames, as described by the *merge_cols* 
+    and *merge* arguments to `load()`.
+    """
+    if isinstance(layout['path'].dtype, pd.CategoricalDtype):
+        # Merging is much faster if both keys have the same categories.
+        data = data.assign(path=data['path'].astype(layout['path'].dtype))
+
+    kwargs = get_merge_kwargs(layout.columns, data.columns, merge_cols)
+
+    if merge == 'join':
+        return pd.merge(layout, data, **kwargs)
+    if merge == 'indices':
+        return merge_on_well_indices(layout, data, merge_cols)
+
+    raise ValueError(f"Unknown merge {merge!r}, expected one of: {quoted_join(['join', 'indices'])}")
+
+def get_merge_kwargs(layout_cols, data_cols, merge_cols):
+    """
+    Return the arguments needed to merge a layout and a data frame with the 
+    given columns, as described by the *merge_cols* argument to `load()`.  The 
+    arguments are understood by both `pandas.merge()` and 
+    `polars.DataFrame.join()`.
+    """
+    if merge_cols is True:
+        # Merge on any columns with matching names.  Complain if the only 
+        # matching column is "path", because we made that column ourselves.
+
+        kwargs = {
+            'on': list(set(layout_cols) & set(data_cols))
+        }
+        if kwargs['on'] == ['path']:
+            raise ValueError(f"No common columns (expect 'path') to perform merge on:\nlayout cols: {quoted_join(layout_cols)}\ndata cols: {quoted_join(data_cols)}")
+    else:
+        if not merge_cols:
+            raise ValueError("Must specify at least one column to merge on (i.e. cannot specify empty `merge_cols` dict).")
+
+        def check_merge_cols(cols, known_cols, attrs):
+            unknown_cols = set(cols) - set(known_cols)
+            if unknown_cols:
+                raise ValueError(f"Cannot merge on {quoted_join(unknown_cols)}.  Allowed {attrs} of the `merge_cols` dict: {quoted_join(known_cols)}.")
+            return list(cols)
+
+        left_ok = 'well', 'well0', 'row', 'col', 'row_i', 'col_i', 'plate'
+        kwargs = {
+                'left_on': ['path'] + check_merge_cols(
+                    merge_cols.keys(), left_ok, 'keys'),
+                'right_on': ['path'] + check_merge_cols(
+                    merge_cols.values(), data_cols, 'values'),
+        }
+
+    return kwargs
+
+def merge_on_well_indices(layout, data, merge_cols):
+    """
+    Merge the given layout and data frames by converting the well names in the 
+    data into integer indices, rather than by comparing strings.
+
+    The result is the same as that of `pandas.merge()`, but this is faster 
+    when there are many data points for each well (e.g. time courses), 
+    because each distinct well name only needs to be parsed once, and the 
+    join itself only involves integers.  Raise a `ValueError` if the merge 
+    can't be done this way, e.g. if the merge involves columns other than the 
+    well names, or if the two data frames have other columns in common.  Warn 
+    about any data rows that don't match a well in the layout.
+    """
+    if merge_cols is True \
+            or not set(merge_cols) <= {'well', 'well0', 'row', 'col'} \
+            or not ({'well', 'well0'} & set(merge_cols) or {'row', 'col'} <= set(merge_cols)):
+        raise ValueError(f"Can only merge on well indices if merging on 'well', 'well0', or both 'row' and 'col', not: {merge_cols!r}")
+
+    shared_cols = set(layout.columns) & set(data.columns) - {'path'}
+    if shared_cols:
+        raise ValueError(f"Can't merge on well indices if the layout and the data have columns in common: {quoted_join(shared_cols)}")
+
+    def parse_names(parse, format, values, failed):
+        # The names in the layout are always formatted the same way, and 
+        # `pandas.merge()` only matches names that are exactly the same (e.g.  
+        # "A01" doesn't match "A1").  So any name that can't be parsed, or 
+        # that isn't formatted the same way as the layout, can't match any 
+        # well.  Such names are given negative indices.
+        def parse_or_fail(x):
+            try:
+                y = parse(x)
+            except Exception:
+                return failed
+            if format and format(y) != x:
+                return failed
+            return y
+
+        codes, results = map_distinct(parse_or_fail, values)
+        return np.array(results, dtype=int)[codes]
+
+    parsers = {
+            'well': lambda x: parse_names(
+                ij_from_well, lambda ij: well_from_ij(*ij), x, (-1, -1)).reshape(-1, 2).T,
+            'well0': lambda x: parse_names(
+                ij_from_well, None, x, (-1, -1)).reshape(-1, 2).T,
+            'row': lambda x: (parse_names(i_from_row, row_from_i, x, -1), None),
+            'col': lambda x: (None, parse_names(j_from_col, col_from_j, x, -1)),
+    }
+
+    # If several columns are being merged on, they all have to refer to the 
+    # same well.
+    i = j = None
+    is_matched = np.ones(len(data), dtype=bool)
+
+    for layout_col, data_col in merge_cols.items():
+        i_col, j_col = parsers[layout_col](data[data_col])
+
+        if i_col is not None:
+            if i is None:
+                i = i_col
+            else:
+                is_matched &= (i == i_col)
+
+        if j_col is not None:
+            if j is None:
+                j = j_col
+            else:
+                is_matched &= (j == j_col)
+
+    is_matched &= (i >= 0) & (j >= 0)
+
+    layout_path_codes, layout_paths = factorize_paths(layout['path'])
+    data_path_codes, data_paths = factorize_paths(data['path'])
+    data_path_codes = pd.Index(layout_paths).get_indexer(data_paths)[data_path_codes]
+
+    # Combine the path, row, and column into a single integer key.
+    layout_i = layout['row_i'].to_numpy()
+    layout_j = layout['col_j'].to_numpy()
+    num_i = max(layout_i.max(initial=0), i.max(initial=0)) + 1
+    num_j = max(layout_j.max(initial=0), j.max(initial=0)) + 1
+
+    def key_from_indices(path, i, j):
+        return (path.astype(np.int64) * num_i + i) * num_j + j
+
+    layout_keys = pd.Index(key_from_indices(layout_path_codes, layout_i, layout_j))
+    if not layout_keys.is_unique:
+        raise ValueError("Can't merge on well indices if the layout has more than one row for the same well and data file.")
+
+    data_keys = key_from_indices(data_path_codes, i, j)
+    indexer = layout_keys.get_indexer(data_keys)
+    is_matched &= (indexer >= 0) & (data_path_codes >= 0)
+
+    # The number of digits in the zero-padded well names depends on the size 
+    # of the layout, so these names have to be compared directly.
+    if 'well0' in merge_cols:
+        layout_well0s = layout['well0'].to_numpy(dtype=object)
+        data_well0s = data[merge_cols['well0']].to_numpy(dtype=object)
+        is_matched[is_matched] = (
+                layout_well0s[indexer[is_matched]] == data_well0s[is_matched]
+        )
+
+    if not is_matched.all():
+        unmatched = data.loc[~is_matched, ['path', *merge_cols.values()]]
+        unmatched = unmatched.drop_duplicates()
+        warn(f"{np.sum(~is_matched)} data row(s) don't match any well in the layout, and will be left out of the merge:\n{unmatched.to_string(index=False, max_rows=20)}")
+
+    # Leave the corner cases of empty merges (e.g. which dtypes to use) to 
+    # pandas.
+    if not is_matched.any():
+        return pd.merge(layout, data, **get_merge_kwargs(
+            layout.columns, data.columns, merge_cols))
+
+    # Keep the layout rows in order, and the data rows in order within each 
+    # well.  This is what `pandas.merge()` does when merging on one column.
+    data_rows = np.flatnonzero(is_matched)
+    data_rows = data_rows[np.argsort(indexer[data_rows], kind='stable')]
+    layout_rows = indexer[data_rows]
+
+    return pd.concat([
+            layout.iloc[layout_rows].reset_index(drop=True),
+            data.iloc[data_rows].drop(columns='path').reset_index(drop=True),
+        ],
+        axis=1,
+    )
+
+def factorize_paths(paths):
+    """
+    Same as `pandas.factorize()`, but faster for the *path* column of a data 
+    frame created by `data_from_layout()`.
+
+    `pathlib.Path` objects are slow to hash, but these columns contain the 
+    same few objects repeated many times.  So only hash one path for each 
+    distinct object.
+    """
+    paths = np.asarray(paths, dtype=object)
+    ids = np.fromiter(map(id, paths), dtype=np.uint64, count=len(paths))
+    id_codes, unique_ids = pd.factorize(ids)
+
+    id_paths = np.empty(len(unique_ids), dtype=object)
+    id_paths[id_codes] = paths
+
+    codes, uniques = pd.factorize(id_paths)
+    return codes[id_codes], uniques
+
+def categorize_columns(df, categorical):
+    """
+    Convert the non-numeric columns of the given data frame to categorical 
+    columns, as described by the *categorical* argument to `load()`.
+
+    The given data frame is not modified.
+    """
+    threshold = get_categorical_threshold(categorical)
+    if threshold is None:
+        return df
+
+    df = df.copy(deep=False)
+
+    for col in df.columns:
+        values = df[col]
+        if not (values.dtype == object or
+                isinstance(values.dtype, pd.StringDtype)):
+            continue
+
+        try:
+            codes, uniques = pd.factorize(values)
+        except TypeError:
+            continue
+
+        if len(uniques) > threshold * len(values):
+            continue
+
+        df[col] = pd.Categorical.from_codes(codes, uniques)
+
+    return df
+
+def get_categorical_threshold(categorical):
+    """
+    Return the largest fraction of distinct values that a column can have and 
+    still be made categorical, or None if no columns should be.
+    """
+    if categorical is False or categorical is None:
+        return None
+
+    threshold = 1 if categorical is True else categorical
+    if not 0 <= threshold <= 1:
+        raise ValueError(f"expected *categorical* to be a boolean or a number between 0 and 1, not: {categorical!r}")
+
+    return threshold
+
+def extras_kwarg(data_loader, meta):
+    """
+    Return the keyword arguments needed to pass the extras from the given 
+    metadata to the given data loader, if it accepts them.
+    """
+    sig = inspect.signature(data_loader)
+
+    if 'extras' not in sig.parameters:
+        return {}
+    if sig.parameters['extras'].kind not in {
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            inspect.Parameter.KEYWORD_ONLY,
+    }:
+        return {}
 
-    return pd.DataFrame(table, columns=columns)
+    return {'extras': meta.extras}
+
+def load_data_files(data_loader, paths, kwargs, *, workers=None):
+    """
+    Call the given data loader on each of the given paths.
+
+    The data frames are returned in the same order as the paths, regardless of 
+    whether or not they were loaded concurrently.  See `load()` for a 
+    description of the *workers* argument.
+    """
+    load_data_file = functools.partial(_load_data_file, data_loader, **kwargs)
+
+    if workers is None:
+        return [load_data_file(x) for x in paths]
+
+    if isinstance(workers, Executor):
+        return list(workers.map(load_data_file, paths))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(load_data_file, paths))
+
+def _load_data_file(data_loader, path, **kwargs):
+    # This function needs to be defined at the module level, so that it can be 
+    # pickled and sent to other processes.
+    try:
+        return data_loader(path, **kwargs)
+    except Exception as err:
+        err.data_path = path
+        if hasattr(err, 'add_note'):
+            err.add_note(f"while loading data file: {path}")
+        raise
 
 def resolve_path(parent_path, child_path):
     parent_dir = Path(parent_path).parent
@@ -703,6 +1895,138 @@ def resolve_path(parent_path, child_path):
     else:
         return parent_dir / child_path
 
+def get_backend(name):
+    backends = {
+            'pandas': PandasBackend,
+            'polars': PolarsBackend,
+    }
+    try:
+        return backends[name]()
+    except KeyError:
+        raise ValueError(f"Unknown backend {name!r}, expected one of: {quoted_join(backends)}") from None
+
+class PandasBackend:
+    """
+    Build layouts, and merge them with data, using `pandas.DataFrame`.
+
+    Each backend provides the handful of data frame operations that `load()` 
+    needs.  Everything else (e.g. parsing the TOML files and working out 
+    which parameters apply to which wells) is the same for every backend.
+    """
+    name = 'pandas'
+
+    def layout_from_config(self, config, paths, concats, *, engine):
+        layout = table_from_config(config, paths, engine=engine)
+        return pd.concat([layout, *concats], sort=False)
+
+    def has_missing_values(self, df, col):
+        return df[col].isnull().any()
+
+    def categorize_columns(self, df, categorical):
+        return categorize_columns(df, categorical)
+
+    def unique_paths(self, df):
+        return df['path'].unique()
+
+    def concat_data(self, data_frames, paths):
+        return self.concat_with_column(data_frames, 'path', paths)
+
+    def concat_with_column(self, data_frames, col, values):
+        if not data_frames:
+            return pd.DataFrame()
+
+        # Concatenate all the data frames at once, rather than one at a time, 
+        # to avoid copying the data over and over again.  Don't add the 
+        # column in place, because the caller may have returned the same data 
+        # frame more than once (e.g. from a cache).
+        return pd.concat([
+            df.assign(**{col: value})
+            for value, df in zip(values, data_frames)
+        ], sort=False)
+
+    def merge(self, layout, data, merge_cols, merge):
+        return merge_layout_and_data(layout, data, merge_cols, merge)
+
+class PolarsBackend:
+    """
+    Build layouts, and merge them with data, using `polars.DataFrame`.
+
+    The layout is built as an Arrow table (see `to_arrow()`) and handed to 
+    polars without copying, so it doesn't pass through pandas.  The one 
+    exception is layouts included via `meta.concat`, which are loaded with 
+    pandas and then converted to Arrow.  Requires ``polars>=1.17``.  The *path* 
+    column contains strings rather than `pathlib.Path` objects, although the 
+    data loader is still called with `pathlib.Path` objects.  The data loader 
+    must return `polars.DataFrame` objects.  The data frames are merged using 
+    `polars.DataFrame.join()`, so the data columns being merged on don't 
+    appear in the merged data frame.
+    """
+    name = 'polars'
+
+    def layout_from_config(self, config, paths, concats, *, engine):
+        import polars as pl
+
+        table = arrow_table_from_config(config, paths, concats, engine=engine)
+
+        # Arrow dictionaries become polars categories.  Only use categories 
+        # if asked to, see `categorize_columns()`.
+        return pl.from_arrow(table).with_columns(
+                pl.col(pl.Categorical).cast(pl.String)
+        )
+
+    def has_missing_values(self, df, col):
+        return df[col].is_null().any()
+
+    def categorize_columns(self, df, categorical):
+        import polars as pl
+
+        threshold = get_categorical_threshold(categorical)
+        if threshold is None:
+            return df
+
+        return df.with_columns(
+                pl.col(k).cast(pl.Categorical)
+                for k, dtype in df.schema.items()
+                if dtype == pl.String
+                if df[k].n_unique() <= threshold * len(df)
+        )
+
+    def unique_paths(self, df):
+        return [Path(x) for x in df['path'].unique(maintain_order=True)]
+
+    def concat_data(self, data_frames, paths):
+        return self.concat_with_column(data_frames, 'path', paths)
+
+    def concat_with_column(self, data_frames, col, values):
+        import polars as pl
+
+        if not data_frames:
+            return pl.DataFrame()
+
+        return pl.concat([
+            df.with_columns(pl.lit(str(value)).alias(col))
+            for value, df in zip(values, data_frames)
+        ], how='diagonal_relaxed')
+
+    def merge(self, layout, data, merge_cols, merge):
+        import polars as pl
+
+        if merge != 'join':
+            raise ValueError(f"The polars backend doesn't support merge={merge!r}, expected: 'join'")
+
+        kwargs = get_merge_kwargs(layout.columns, data.columns, merge_cols)
+        left_on = kwargs.get('left_on', kwargs.get('on'))
+        right_on = kwargs.get('right_on', kwargs.get('on'))
+
+        # Polars won't join categorical columns with string columns.
+        layout = layout.with_columns(
+                pl.col(k).cast(data.schema[v])
+                for k, v in zip(left_on, right_on)
+                if layout.schema[k] == pl.Categorical
+        )
+
+        return layout.join(data, how='inner', maintain_order='left', **kwargs)
+
 @dataclass
 class Meta:
     """
@@ -729,7 +2053,8 @@ class Meta:
     listed in the *path* column of the loaded data frame.  You can use this 
     information in analysis scripts, in conjunction with `os.path.getmtime`, to 
     reliably determine whether or not the layout could have changed, e.g. 
-    before repeating an expensive analysis.
+    before repeating an expensive analysis.  The **cache_dir** argument to 
+    `load()` uses this information to avoid re-parsing unchanged layouts.
     """
 
     style: Style
@@ -738,6 +2063,114 @@ class Meta:
     information in this object comes from `meta.style` and `meta.param_styles`.
     """
 
+class IncludeCache:
+    """
+    Avoid re-parsing layouts that are included by many other layouts.
+
+    It's common for several layouts to include the same file (e.g. a file 
+    describing a set of standards or controls), sometimes more than once with 
+    different shifts.  This cache remembers the result of parsing each included 
+    file with each shift, and reuses it for as long as neither that file nor 
+    any of its own dependencies have been modified.  The cache persists across 
+    calls to `load()`.
+
+    The cache used by `load()` is available as ``wellmap.include_cache``.  Its 
+    size can be changed by setting the `maxsize` attribute (setting it to 0 
+    disables the cache), and it can be emptied by calling `clear()`.
+    """
+
+    def __init__(self, maxsize=128):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def maxsize(self):
+        """
+        The maximum number of parsed layouts to keep.  When this limit is 
+        reached, the least recently used layout is forgotten.
+        """
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize):
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        """
+        Forget every parsed layout.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate(self, path):
+        """
+        Forget any parsed layouts that depend on the given file.
+
+        Modified files are detected automatically, so this is only necessary if 
+        a file is changed in a way that doesn't affect its modification time or 
+        size.
+        """
+        path = Path(path).resolve()
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if path in entry['fingerprints']:
+                    del self._entries[key]
+
+    def config_from_toml(self, toml_path, *, shift=(0,0), on_alert=None):
+        """
+        Same as `config_from_toml()`, but reuse the result of any previous call 
+        with the same arguments if possible.
+
+        The returned objects are shared between every caller, and must not be 
+        modified.
+        """
+        key = Path(toml_path).resolve(), tuple(shift)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None or \
+                get_fingerprints(entry['fingerprints']) != entry['fingerprints']:
+
+            alerts = []
+
+            def record_alert(path, message):
+                alerts.append((path, message))
+
+            result = config_from_toml(
+                    toml_path,
+                    shift=shift,
+                    on_alert=record_alert,
+            )
+            entry = {
+                    'result': result,
+                    'alerts': alerts,
+                    'fingerprints': get_fingerprints(result[3].dependencies),
+            }
+
+            with self._lock:
+                self._entries[key] = entry
+                self._evict()
+
+        for path, message in entry['alerts']:
+            (on_alert or print_alert)(path, message)
+
+        return entry['result']
+
+    def _evict(self):
+        while len(self._entries) > max(self._maxsize, 0):
+            self._entries.popitem(last=False)
+
+include_cache = IncludeCache()
+
 class PathManager:
 
     def __init__(self, path, paths, toml_path, path_guess=None):
@@ -745,7 +2178,10 @@ class PathManager:
         self.paths = paths
         self.toml_path = Path(toml_path)
         self.path_guess = path_guess
-        self.missing_path_error = None
+
+        # This is replaced with a more specific error if it turns out that no 
+        # path was specified for one or more plates.
+        self.missing_path_error = LayoutError("Analysis requires a data file, but none was specified.")
 
     def __str__(self):
         return str({
@@ -825,6 +2261,54 @@ class PathManager:
 
         raise LayoutError(f"Expected `meta.paths` to be dict or str, got {type(self.paths)}: {self.paths}")
 
+@dataclass
+class ConfigExpansion:
+    """
+    A version of the `config` data structure where all of the well, row, and 
+    column names have been resolved to indices.  See `expand_config()`.
+    """
+
+    wells: list
+    blocks: list
+    rows: dict
+    cols: dict
+    irows: dict
+    icols: dict
+    expt: dict
+    specs: dict
+
+class WellColumns(Mapping):
+    """
+    A column-oriented version of the `wells` data structure.
+
+    This class behaves like a read-only dictionary mapping (row, col) well 
+    indices to dictionaries of parameters, but the parameters are stored as 
+    one array per parameter.  This makes it possible to build data frames 
+    without ever creating a dictionary for each well.
+    """
+
+    def __init__(self, ijs, columns):
+        self.ijs = ijs
+        self.columns = columns
+        self._positions = {ij: k for k, ij in enumerate(ijs)}
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({dict(self)!r})'
+
+    def __getitem__(self, ij):
+        k = self._positions[ij]
+        return {
+                key: column[k]
+                for key, (column, is_set) in self.columns.items()
+                if is_set[k]
+        }
+
+    def __iter__(self):
+        return iter(self.ijs)
+
+    def __len__(self):
+        return len(self.ijs)
+
 class configdict(dict):
     special = {
             'meta': 'meta',
@@ -4,7 +4,23 @@
 Visualize the plate layout described by a wellmap TOML file.
 
 Usage:
-    wellmap <toml> [<param>...] [-o <path>] [-p] [-c <color>] [-s] [-f]
+    wellmap export <toml> [-o <path>] [--parquet]
+    wellmap render <toml>... [-d <dir>] [-F <format>] [-j <n>] [-c <color>] [-s]
+    wellmap <toml> [<param>...] [-o <path>] [-p] [-c <color>] [-s] [-f] [-w]
+
+Commands:
+    export
+        Instead of displaying the layout, write it to a file in a format that 
+        can be read by other data analysis tools (e.g. DuckDB, Spark).  By 
+        default, the file will be written next to the <toml> file, with the 
+        same name but a different extension.
+
+    render
+        Write an image of each of the given layouts, without displaying 
+        anything.  This is much faster than rendering each layout separately, 
+        especially for large numbers of similar layouts.  Each image is named 
+        after its <toml> file.  Layouts that can't be rendered are reported, 
+        but don't stop the remaining layouts from being rendered.
 
 Arguments:
     <toml>
@@ -29,7 +45,8 @@ Options:
         Output an image of the layout to the given path.  The file type is 
         inferred from the file extension.  If the path contains a dollar sign 
         (e.g. '$.svg'), the dollar sign will be replaced with the base name of 
-        the <toml> path.
+        the <toml> path.  When exporting, write the exported layout to the 
+        given path instead.
 
     -p --print
         Print a paper copy of the layout, e.g. to reference when setting up an 
@@ -66,20 +83,53 @@ Options:
         more control over the exact formatting of these superimposed values, 
         use the python/R API.
 
+    -d --out-dir DIR
+        When rendering, write the images to the given directory.  The 
+        directory will be created if necessary.  The default is the current 
+        working directory.
+
+    -F --format EXT
+        When rendering, the image format to use, e.g. 'png', 'svg', 'pdf'.  
+        The default is 'png'.
+
+    -j --workers N
+        When rendering, render the given number of layouts in parallel, each 
+        in a separate process.  The default is to render one layout at a time.
+
+    --parquet
+        Export the layout as an Apache Parquet file.  This requires the 
+        `pyarrow` package to be installed.  This is currently the only 
+        supported export format, so it is also the default.
+
     -f --foreground
         Don't attempt to return the terminal to the user while the GUI runs.  
         This is meant to be used on systems where the program crashes if run in 
         the background.
+
+    -w --watch
+        Keep running, and update the layout whenever the <toml> file (or any 
+        file it includes) is modified.  This is meant to be used while editing 
+        a layout.  If an output path is given, the image will be rewritten 
+        after every change.  Otherwise, the layout will be redrawn in the same 
+        window.  Errors in the layout are reported, but don't stop the program 
+        from watching for more changes.  The program stays in the foreground 
+        (as if --foreground were given) while watching.  Press Ctrl-C (or 
+        close the window) to stop.
 """
 
 import wellmap
 import colorcet
 import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
-import sys, os
+import sys, os, itertools, functools
 
 from inform import plural
+from matplotlib.artist import Artist
+from matplotlib.cbook import is_math_text
 from matplotlib.colors import Normalize
+from matplotlib.font_manager import FontProperties
+from collections import OrderedDict, Counter
 from collections.abc import Mapping
 from pathlib import Path
 from .util import *
@@ -95,18 +145,38 @@ def main():
 
     try:
         args = docopt.docopt(__doc__)
-        toml_path = Path(args['<toml>'])
-        show_gui = not args['--output'] and not args['--print']
-
-        if show_gui and not args['--foreground']:
-            if os.fork() != 0:
-                sys.exit()
 
         style = Style()
         if args['--print']: style.color_scheme = 'dimgray'
         if args['--color']: style.color_scheme = args['--color']
         if args['--superimpose']: style.superimpose_values = True
 
+        if args['render']:
+            render_cli(args, style)
+            return
+
+        toml_path = Path(args['<toml>'][0])
+
+        if args['export']:
+            export(toml_path, args['--output'])
+            return
+
+        show_gui = not args['--output'] and not args['--print']
+
+        if args['--watch'] and args['--print']:
+            raise UsageError("Can't print a layout while watching it for changes.")
+
+        # Stay in the foreground while watching, so that Ctrl-C still works, 
+        # and so that the program can't be left running in the background if 
+        # the layout never loads well enough to open a window.
+        if args['--watch']:
+            watch_cli(toml_path, args, style)
+            return
+
+        if show_gui and not args['--foreground']:
+            if os.fork() != 0:
+                sys.exit()
+
         fig = show(toml_path, args['<param>'], style=style)
 
         if args['--output']:
@@ -127,9 +197,7 @@ def main():
             print("Layout sent to printer.")
 
         if show_gui:
-            title = str(toml_path)
-            if args['<param>']: title += f' [{", ".join(args["<param>"])}]'
-            fig.canvas.setWindowTitle(title)
+            set_window_title(fig, toml_path, args['<param>'])
             plt.show()
 
     except UsageError as err:
@@ -138,6 +206,202 @@ def main():
         err.toml_path = toml_path
         print(err)
 
+def watch_cli(toml_path, args, style, *, interval=0.5):
+    import time
+
+    out_path = args['--output']
+    if out_path:
+        out_path = out_path.replace('$', toml_path.stem)
+
+    watcher = LayoutWatcher(
+            toml_path,
+            args['<param>'],
+            style=style,
+            templates=FigureTemplates(maxsize=1, pyplot=not out_path),
+    )
+
+    try:
+        while True:
+            try:
+                updated = watcher.poll()
+            except Exception as err:
+                # Keep watching, since the user is probably still in the 
+                # middle of editing the layout.
+                print(err)
+                updated = False
+
+            if updated:
+                if out_path:
+                    watcher.fig.savefig(out_path)
+                    print("Layout written to:", out_path)
+                else:
+                    set_window_title(watcher.fig, toml_path, args['<param>'])
+                    watcher.fig.canvas.draw_idle()
+
+            if out_path or watcher.fig is None:
+                time.sleep(interval)
+            elif plt.fignum_exists(watcher.fig.number):
+                plt.pause(interval)
+            else:
+                break
+
+    except KeyboardInterrupt:
+        pass
+
+def set_window_title(fig, toml_path, params):
+    title = str(toml_path)
+    if params: title += f' [{", ".join(params)}]'
+    fig.canvas.setWindowTitle(title)
+
+def render_cli(args, style):
+    workers = int(args['--workers']) if args['--workers'] else None
+
+    # `render()` raises ValueError for arguments that can't work at all, e.g. 
+    # layouts that would be rendered to the same path.  Those are the user's 
+    # mistake, so report them like any other usage error.
+    try:
+        out_paths, errors = render(
+                args['<toml>'],
+                args['--out-dir'] or '.',
+                style=style,
+                format=args['--format'] or 'png',
+                workers=workers,
+        )
+    except ValueError as err:
+        raise UsageError(str(err)) from None
+
+    for toml_path in args['<toml>']:
+        if toml_path in out_paths:
+            print("Layout written to:", out_paths[toml_path])
+        else:
+            err = errors[toml_path]
+            if isinstance(err, LayoutError):
+                err.toml_path = err.toml_path or toml_path
+            print(err)
+
+    if errors:
+        print(f"Failed to render {plural(errors):# layout/s}.")
+
+def export(toml_path, out_path=None):
+    import pyarrow.parquet as pq
+
+    if out_path:
+        out_path = out_path.replace('$', toml_path.stem)
+    else:
+        out_path = toml_path.with_suffix('.parquet')
+
+    table = wellmap.to_arrow(toml_path)
+    pq.write_table(table, out_path)
+    print("Layout written to:", out_path)
+
+def render(
+        toml_paths,
+        out_dir,
+        *,
+        params=None,
+        style=None,
+        format='png',
+        workers=None,
+):
+    """
+    Save images of many microplate layouts.
+
+    This is meant for rendering large numbers of layouts without any user 
+    interaction, e.g. to make preview images for a database.  Compared to 
+    calling `show()` and `matplotlib.figure.Figure.savefig()` for each 
+    layout, this function (i) never uses `matplotlib.pyplot` or any GUI 
+    backend, (ii) reuses figures between layouts with the same arrangement of 
+    plates and parameters, (iii) can render layouts in parallel, and (iv) 
+    doesn't stop if some layouts can't be rendered.
+
+    :param list toml_paths:
+        The paths to the files describing each layout.
+
+    :param str,pathlib.Path out_dir:
+        The directory where the images will be written.  Each image is named 
+        after the TOML file it depicts, e.g. ``expt.toml`` would be rendered 
+        to ``expt.png``.  The directory will be created if necessary.
+
+    :param str,list params:
+        Which parameters to visualize.  See `show()`.  The same parameters are 
+        used for every layout.
+
+    :param Style style:
+        Settings that control miscellaneous aspects of the plots.  See 
+        `show()`.  Any styles specified by each layout are merged with these 
+        settings.
+
+    :param str format:
+        The image format, e.g. 'png', 'svg', 'pdf'.
+
+    :param int,concurrent.futures.Executor workers:
+        Render multiple layouts concurrently.  If an integer, a 
+        `concurrent.futures.ProcessPoolExecutor` with that many workers will be 
+        used.  If an executor, that executor will be used as-is and will not be 
+        shut down afterwards.  Note that thread pools won't help, because 
+        matplotlib holds the GIL while drawing.  The default is to render each 
+        layout serially.
+
+    :returns:
+        - **out_paths** (`dict`) – A dictionary mapping the path of each 
+          layout that was successfully rendered to the path of its image.
+
+        - **errors** (`dict`) – A dictionary mapping the path of each layout 
+          that could not be rendered to the exception that was raised.
+    """
+    from concurrent.futures import Executor, ProcessPoolExecutor
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    toml_paths = list(toml_paths)
+    out_paths = [
+            out_dir / f'{Path(x).stem}.{format}'
+            for x in toml_paths
+    ]
+
+    duplicates = [x for x, n in Counter(out_paths).items() if n > 1]
+    if duplicates:
+        raise ValueError(f"Multiple layouts would be rendered to the same path: {quoted_join(sorted(map(str, duplicates)))}")
+
+    render_one = functools.partial(_render_layout, params=params, style=style)
+
+    if workers is None:
+        outcomes = list(map(render_one, toml_paths, out_paths))
+    elif isinstance(workers, Executor):
+        outcomes = list(workers.map(render_one, toml_paths, out_paths))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(render_one, toml_paths, out_paths))
+
+    results = {}
+    errors = {}
+
+    for toml_path, (out_path, error) in zip(toml_paths, outcomes):
+        if error is None:
+            results[toml_path] = out_path
+        else:
+            errors[toml_path] = error
+
+    return results, errors
+
+def _render_layout(toml_path, out_path, *, params, style):
+    # This function needs to be defined at the module level, so that it can be 
+    # pickled and sent to other processes.
+    try:
+        df, meta = wellmap.load(toml_path, meta=True)
+        style = Style.from_merge(style or Style(), meta.style)
+        fig = figure_from_df(
+                df, params,
+                style=style,
+                templates=_figure_templates,
+        )
+        fig.savefig(out_path)
+        return out_path, None
+
+    except Exception as err:
+        return None, err
+
 def show(toml_path, params=None, *, style=None):
     """
     Visualize the given microplate layout.
@@ -213,7 +477,10 @@ def show_df(df, cols=None, *, style=None):
         is also assumed that any redundant columns (e.g. *row* and *row_i*) 
         will be consistent with each other.
 
-        Any scalar-valued columns other than these can be plotted.
+        Any scalar-valued columns other than these can be plotted.  Data frames 
+        from other libraries (e.g. those returned by ``load(..., 
+        backend='polars')``) are accepted too, as long as they can be converted 
+        to pandas via a ``to_pandas()`` method.
 
     :param str,list cols:
         Which columns to plot onto the layout.  The columns used to locate the 
@@ -226,7 +493,13 @@ def show_df(df, cols=None, *, style=None):
 
     :rtype: matplotlib.figure.Figure
     """
+    return figure_from_df(df, cols, style=style)
 
+def figure_from_df(df, cols=None, *, style=None, templates=None):
+    """
+    Same as `show_df()`, but optionally reuse figures from the given 
+    `FigureTemplates`.
+    """
     # The whole architecture of this function is dictated by (what I consider 
     # to be) a small and obscure bug in matplotlib.  That bug is: if you are 
     # displaying a figure in the GUI and you use `set_size_inches()`, the whole 
@@ -245,19 +518,26 @@ def show_df(df, cols=None, *, style=None):
     # In particular, I have to work out the colorbar labels twice.  These are 
     # the most complicated part of the figure layout, because they come from 
     # the TOML file and could be either very narrow or very wide.  So I need to 
-    # do a first pass where I plot all the labels on a dummy figure, get their 
-    # widths, then allocate enough room for them in the main figure.  
+    # measure all the labels first (see `guess_param_label_width()`), then 
+    # allocate enough room for them in the main figure.  
     # 
     # I also need to work out the dimensions of the plates twice, but that's a 
     # simpler calculation.
 
+    if hasattr(df, 'to_pandas'):
+        df = df.to_pandas()
+
     style = style or Style()
 
     df = require_well_locations(df)
     plates = sorted(df['plate'].unique())
     params = pick_params(df, cols)
 
-    fig, axes, dims = setup_axes(df, plates, params, style)
+    # Split the data frame by plate once, rather than once for every 
+    # parameter.
+    plate_dfs = dict(list(df.groupby('plate', sort=False, observed=True)))
+
+    fig, axes, dims = setup_axes(df, plates, params, style, templates=templates)
 
     try:
         for i, param in enumerate(params):
@@ -265,7 +545,8 @@ def show_df(df, cols=None, *, style=None):
             colors = setup_color_bar(axes[i,-1], df, param, cmap)
 
             for j, plate in enumerate(plates):
-                plot_plate(axes[i,j], df, plate, param, style, dims, colors)
+                plot_plate(
+                        axes[i,j], plate_dfs[plate], param, style, dims, colors)
 
         for i, param in enumerate(params):
             axes[i,0].set_ylabel(param)
@@ -279,52 +560,71 @@ def show_df(df, cols=None, *, style=None):
             ax.set_yticklabels([])
 
     except:
-        plt.close(fig)
+        if templates is None:
+            plt.close(fig)
+        else:
+            templates.discard(fig)
         raise
 
     return fig
 
-def plot_plate(ax, df, plate, param, style, dims, colors):
+def plot_plate(ax, df, param, style, dims, colors):
     # Fill in a matrix with integers representing each value of the given 
-    # experimental parameter.
+    # experimental parameter.  The given data frame should only contain wells 
+    # from the plate being plotted.
+    ii = df['row_i'].to_numpy() - dims.i0
+    jj = df['col_j'].to_numpy() - dims.j0
+    xx = colors.transform(df[param])
+
     matrix = np.full(dims.shape, np.nan)
-    q = df.query('plate == @plate')
-
-    for _, well in q.iterrows():
-        i = well['row_i'] - dims.i0
-        j = well['col_j'] - dims.j0
-        matrix[i, j] = x = colors.transform(well[param])
-
-        if style[param].superimpose_values:
-            bg = colors.cmap(colors.norm(x))
-            fg = choose_foreground_color(bg)
-
-            text = format(well[param], style[param].superimpose_format)
-            kwargs = {
-                    'color': fg,
-                    'horizontalalignment': 'center',
-                    'verticalalignment': 'center_baseline',
-                    **style[param].superimpose_kwargs,
-            }
-            ax.text(j, i, text, **kwargs)
+    matrix[ii, jj] = xx
 
-    ax.imshow(
-            matrix,
-            norm=colors.norm,
-            cmap=colors.cmap,
-            origin='upper',
-            interpolation='nearest',
-    )
+    # If these axes were already used to plot a layout with the same 
+    # dimensions (see `FigureTemplates`), just replace the image.  The ticks 
+    # only depend on the dimensions, so they can stay the same.
+    if ax.images:
+        image, = ax.images
+        image.set_data(matrix)
+        image.set_cmap(colors.cmap)
+        image.set_norm(colors.norm)
+
+        for artist in ax.artists:
+            artist.remove()
+
+    else:
+        ax.imshow(
+                matrix,
+                norm=colors.norm,
+                cmap=colors.cmap,
+                origin='upper',
+                interpolation='nearest',
+        )
 
-    ax.set_xticks(dims.xticks)
-    ax.set_yticks(dims.yticks)
-    ax.set_xticks(dims.xticksminor, minor=True)
-    ax.set_yticks(dims.yticksminor, minor=True)
-    ax.set_xticklabels(dims.xticklabels)
-    ax.set_yticklabels(dims.yticklabels)
-    ax.grid(which='minor')
-    ax.tick_params(which='both', axis='both', length=0)
-    ax.xaxis.tick_top()
+        ax.set_xticks(dims.xticks)
+        ax.set_yticks(dims.yticks)
+        ax.set_xticks(dims.xticksminor, minor=True)
+        ax.set_yticks(dims.yticksminor, minor=True)
+        ax.set_xticklabels(dims.xticklabels)
+        ax.set_yticklabels(dims.yticklabels)
+        ax.grid(which='minor')
+        ax.tick_params(which='both', axis='both', length=0)
+        ax.xaxis.tick_top()
+
+    if style[param].superimpose_values:
+        bg = colors.cmap(colors.norm(xx))
+        fg = choose_foreground_colors(bg)
+
+        texts = [
+                format(x, style[param].superimpose_format)
+                for x in df[param]
+        ]
+        kwargs = {
+                'horizontalalignment': 'center',
+                'verticalalignment': 'center_baseline',
+                **style[param].superimpose_kwargs,
+        }
+        labels = SuperimposedValues(ax, jj, ii, texts, fg, **kwargs)
+        ax.add_artist(labels)
 
 def pick_params(df, user_params):
     if isinstance(user_params, str):
@@ -366,10 +666,7 @@ def pick_params(df, user_params):
 
         return non_degenerate_cols
 
-def setup_axes(df, plates, params, style):
-    from mpl_toolkits.axes_grid1 import Divider
-    from mpl_toolkits.axes_grid1.axes_size import Fixed
-
+def setup_axes(df, plates, params, style, *, templates=None):
     # These assumptions let us simplify some code, and should always be true.
     assert len(plates) > 0
     assert len(params) > 0
@@ -415,26 +712,36 @@ def setup_axes(df, plates, params, style):
     figsize = sum(h_divs), sum(v_divs)
 
     # Make the figure:
+    if templates is not None:
+        fig, axes = templates.get_figure(figsize, h_divs, v_divs, dims)
+        return fig, axes, dims
+
     fig, axes = plt.subplots(
             num_params,
             num_plates + 1,  # +1 for the colorbar axes.
             figsize=figsize,
             squeeze=False,
     )
+    position_axes(fig, axes, h_divs, v_divs)
+
+    return fig, axes, dims
+
+def position_axes(fig, axes, h_divs, v_divs):
+    from mpl_toolkits.axes_grid1 import Divider
+    from mpl_toolkits.axes_grid1.axes_size import Fixed
+
+    num_params, num_cols = axes.shape
 
-    # Position the axes:
     rect = 0.0, 0.0, 1, 1
     h_divs = [Fixed(x) for x in h_divs]
     v_divs = [Fixed(x) for x in reversed(v_divs)]
     divider = Divider(fig, rect, h_divs, v_divs, aspect=False)
 
     for i in range(num_params):
-        for j in range(num_plates + 1):
+        for j in range(num_cols):
             loc = divider.new_locator(nx=2*j+1, ny=2*(num_params - i) - 1)
             axes[i,j].set_axes_locator(loc)
 
-    return fig, axes, dims
-
 def setup_color_bar(ax, df, param, cmap):
     from matplotlib.colorbar import ColorbarBase
 
@@ -454,37 +761,39 @@ def setup_color_bar(ax, df, param, cmap):
     return colors
 
 def guess_param_label_width(df, params):
-    # I've seen some posts suggesting that this might not work on Macs.  I 
-    # can't test that, but if this ends up being a problem, I probably need to 
-    # wrap this is a try/except block and fall back to guessing a width based 
-    # on the number of characters in the string representation of each label.
-    #
-    # https://stackoverflow.com/questions/22667224/get-text-bounding-box-independent-of-backend
-
-    width = 0
-    fig, ax = plt.subplots()
-
-    for param in params:
-        labels = df[param].unique()
-        ax.set_yticks(range(len(labels)))
-        ax.set_yticklabels(labels)
-
-        width = max(width, get_yticklabel_width(ax))
-
-    plt.close(fig)
-    return width
+    # Measure each label directly, rather than putting the labels on the axes 
+    # of a scratch figure and then asking for their extents.  The labels will 
+    # be drawn as y-tick labels, so use the same font that those labels will 
+    # use.  The measurements are cached, so each label is only measured once 
+    # even if it's used by many parameters (or many calls to this function).
+
+    font = FontProperties(size=plt.rcParams['ytick.labelsize'])
+    dpi = plt.rcParams['figure.dpi']
+    usetex = plt.rcParams['text.usetex']
+
+    widths = (
+            get_text_width(str(label), font, dpi, usetex)
+            for param in params
+            for label in df[param].unique()
+    )
+    return max(widths, default=0)
 
 def choose_foreground_color(bg_color):
+    return str(choose_foreground_colors([bg_color])[0])
+
+def choose_foreground_colors(bg_colors):
     # Decide whether to use white or black text, based on the background color.  
     # The basic algorithm is to scale the primaries by their perceived 
     # brightness, then to compare to a threshold value that generally works 
-    # well for monitors.
+    # well for monitors.  The colors are given as an (N, 3) or (N, 4) array, 
+    # e.g. as returned by a colormap.
     #
     # https://stackoverflow.com/questions/3942878/how-to-decide-font-color-in-white-or-black-depending-on-background-color
 
-    r, g, b = bg_color[:3]
+    bg_colors = np.asarray(bg_colors)
+    r, g, b = bg_colors[:,0], bg_colors[:,1], bg_colors[:,2]
     grey = r * 0.299 + g * 0.587 + b * 0.114
-    return 'black' if grey > 0.588 else 'white'
+    return np.where(grey > 0.588, 'black', 'white')
 
 def get_colormap(name):
     try:
@@ -492,18 +801,43 @@ def get_colormap(name):
     except KeyError:
         return plt.get_cmap(name)
 
-def get_yticklabel_width(ax):
-    # With some backends, getting the renderer like this may trigger a warning 
-    # and cause matplotlib to drop down to the Agg backend.
-    fig = ax.get_figure()
-    renderer = fig.canvas.get_renderer()
-    width = max(
-            artist.get_window_extent(renderer).width
-            for artist in ax.get_yticklabels()
-    )
-    dpi = fig.get_dpi()
+@functools.lru_cache(maxsize=4096)
+def get_text_width(text, font, dpi, usetex):
+    """
+    Return the width (in inches) that the given text would have when drawn 
+    with the given font.
+
+    This gives the same result as `matplotlib.text.Text.get_window_extent()` 
+    for unrotated text, but doesn't require the text to be part of a figure.
+    """
+    renderer = get_text_renderer(dpi)
+    width = 0
+
+    # Mimic `matplotlib.text.Text._preprocess_math()`, which is applied to 
+    # each line separately.
+    for line in text.split('\n'):
+        if usetex:
+            line, ismath = (r"\ " if line == " " else line), 'TeX'
+        elif is_math_text(line):
+            ismath = True
+        else:
+            line, ismath = line.replace(r"\$", "$"), False
+
+        if line:
+            w, h, d = renderer.get_text_width_height_descent(line, font, ismath)
+            width = max(width, w)
+
     return width / dpi
 
+@functools.lru_cache(maxsize=None)
+def get_text_renderer(dpi):
+    # With some backends, getting the renderer from a figure may trigger a 
+    # warning and cause matplotlib to drop down to the Agg backend, so just 
+    # use Agg directly.  The renderer is only used to measure text, so it 
+    # doesn't need to be any bigger than a single pixel.
+    from matplotlib.backends.backend_agg import RendererAgg
+    return RendererAgg(1, 1, dpi)
+
 _by_param = object()
 
 def _find_param_level_attrs(cls):
@@ -892,6 +1226,169 @@ class Style:
                 )
 
 
+class FigureTemplates:
+    """
+    Reuse figures for layouts that would have the same arrangement of axes.
+
+    Creating a figure and laying out its axes and ticks accounts for much of 
+    the time needed to plot a layout.  When rendering many layouts, though, 
+    it's common for lots of them to have the same number of plates and 
+    parameters, the same plate dimensions, and the same amount of space 
+    needed for the colorbar labels.  This class keeps the figures made for 
+    such layouts, so that the next layout with the same arrangement only has 
+    to replace the images, labels, and colorbars.
+
+    By default, the figures are created directly, without 
+    `matplotlib.pyplot`, and are always drawn using the Agg backend.  If 
+    *pyplot* is true, the figures are instead created (and closed, when they 
+    are no longer needed) using pyplot, so that they can be shown in a GUI.
+    """
+
+    def __init__(self, maxsize=16, *, pyplot=False):
+        self._figures = OrderedDict()
+        self.maxsize = maxsize
+        self.pyplot = pyplot
+
+    def __len__(self):
+        return len(self._figures)
+
+    def __contains__(self, fig):
+        return any(fig is fig_i for fig_i, *_ in self._figures.values())
+
+    def get_figure(self, figsize, h_divs, v_divs, dims):
+        key = tuple(h_divs), tuple(v_divs), dims.i0, dims.j0, dims.shape
+
+        try:
+            fig, axes, locators = self._figures.pop(key)
+        except KeyError:
+            fig, axes, locators = self._make_figure(figsize, h_divs, v_divs)
+        else:
+            # Colorbars change the locators of their axes, so the original 
+            # locators have to be restored after clearing the old colorbars.
+            for ax, loc in zip(axes[:,-1], locators):
+                ax.cla()
+                ax.set_axes_locator(loc)
+
+        self._figures[key] = fig, axes, locators
+
+        while len(self._figures) > self.maxsize:
+            _, (fig_i, *_) = self._figures.popitem(last=False)
+            self._close(fig_i)
+
+        return fig, axes
+
+    def discard(self, fig):
+        """
+        Forget the given figure, e.g. because an error occurred while it was 
+        being drawn.
+        """
+        for key, (fig_i, *_) in list(self._figures.items()):
+            if fig_i is fig:
+                del self._figures[key]
+
+        self._close(fig)
+
+    def _make_figure(self, figsize, h_divs, v_divs):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        if self.pyplot:
+            fig = plt.figure(figsize=figsize)
+        else:
+            fig = Figure(figsize=figsize)
+            FigureCanvasAgg(fig)
+
+        axes = fig.subplots(
+                len(v_divs) // 2,
+                len(h_divs) // 2,
+                squeeze=False,
+        )
+        position_axes(fig, axes, h_divs, v_divs)
+        locators = [ax.get_axes_locator() for ax in axes[:,-1]]
+
+        return fig, axes, locators
+
+    def _close(self, fig):
+        if self.pyplot:
+            plt.close(fig)
+
+# The templates used by `render()`.  Each process keeps its own.
+_figure_templates = FigureTemplates()
+
+
+class LayoutWatcher:
+    """
+    Plot a layout, then plot it again whenever any of the files it depends on 
+    are modified.
+
+    The files are checked by comparing their modification times and sizes, 
+    so no special support from the operating system is needed.  Reloading a 
+    layout only re-parses the files that actually changed; unchanged included 
+    files are taken from `wellmap.include_cache`.  If the reloaded layout 
+    would look the same as before (e.g. because only a comment changed), the 
+    existing figure is kept as-is.  Otherwise the layout is plotted again, 
+    reusing the existing figure if the arrangement of the axes didn't change.
+    """
+
+    def __init__(self, toml_path, params=None, *, style=None, templates=None):
+        self.toml_path = Path(toml_path)
+        self.params = params
+        self.style = style
+        self.templates = templates
+        if templates is None:
+            self.templates = FigureTemplates(maxsize=1)
+        self.fig = None
+
+        self._paths = {self.toml_path.resolve()}
+        self._fingerprints = object()
+        self._plotted = None
+
+    def poll(self):
+        """
+        Plot the layout if this is the first call, or if any of the files it 
+        depends on have been modified since the last call.
+
+        Return True if the figure (available via the *fig* attribute) was 
+        updated.  Any errors encountered while loading or plotting the layout 
+        are raised, but the layout won't be loaded again until another file is 
+        modified.
+        """
+        from .file import get_fingerprints
+
+        fingerprints = get_fingerprints(self._paths)
+        if fingerprints == self._fingerprints:
+            return False
+
+        self._fingerprints = fingerprints
+
+        df, meta = wellmap.load(self.toml_path, meta=True)
+        style = Style.from_merge(self.style or Style(), meta.style)
+
+        self._paths = {self.toml_path.resolve(), *meta.dependencies}
+        self._fingerprints = get_fingerprints(self._paths)
+
+        if self._plotted is not None:
+            df_prev, style_prev = self._plotted
+            if df.equals(df_prev) and style == style_prev:
+                return False
+
+        try:
+            self.fig = figure_from_df(
+                    df, self.params,
+                    style=style,
+                    templates=self.templates,
+            )
+        except:
+            # Figures can't be reused if an error occurred while drawing them.
+            if self.fig not in self.templates:
+                self.fig = None
+                self._plotted = None
+            raise
+
+        self._plotted = df, style
+        return True
+
+
 class Dimensions:
 
     def __init__(self, df):
@@ -936,10 +1433,74 @@ class Colors:
         self.ticks = np.fromiter(self.map.values(), dtype=int, count=n)
         self.ticklabels = list(self.map.keys())
 
-    def transform(self, x):
-        def is_nan(x):
-            return isinstance(x, float) and np.isnan(x)
-        return self.map[x] if not is_nan(x) else np.nan
+    def transform(self, xs):
+        # Only look up each distinct value once.  Missing values get a code of 
+        # -1, which picks out the NaN at the end of the lookup table.
+        codes, uniques = pd.factorize(xs)
+        lookup = np.array([*map(self.map.__getitem__, uniques), np.nan])
+        return lookup[codes]
+
+
+class SuperimposedValues(Artist):
+    """
+    Draw a text label in each of the given positions, using a single artist.
+
+    Superimposing values on a 1536-well plate would otherwise require 
+    thousands of `matplotlib.text.Text` artists per axes, each of which is 
+    expensive to create, lay out, and export.  Instead, this artist keeps a 
+    single `Text` object and moves it to each position in turn while drawing.  
+    The result looks exactly the same as it would with separate artists.
+    """
+
+    def __init__(self, ax, xs, ys, texts, colors, **kwargs):
+        from matplotlib.text import Text
+
+        super().__init__()
+        self.set_zorder(Text.zorder)
+
+        self._xs = xs
+        self._ys = ys
+        self._texts = texts
+        self._colors = colors
+
+        # Any color specified by the user takes precedence.
+        if 'color' in kwargs or 'c' in kwargs:
+            self._colors = itertools.repeat(None)
+
+        self._text = Text(**kwargs)
+        self._text.set_figure(ax.figure)
+        self._text.axes = ax
+        self._text.set_transform(ax.transData)
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+
+        for x, y, text in self._iter_labels():
+            text.draw(renderer)
+
+        self.stale = False
+
+    def get_window_extent(self, renderer=None):
+        from matplotlib.transforms import Bbox
+
+        bboxes = [
+                text.get_window_extent(renderer)
+                for x, y, text in self._iter_labels()
+        ]
+        return Bbox.union(bboxes) if bboxes else Bbox.null()
+
+    def _iter_labels(self):
+        text = self._text
+
+        for x, y, s, color in zip(
+                self._xs, self._ys, self._texts, self._colors):
+            text.set_position((x, y))
+            text.set_text(s)
+            if color is not None:
+                text.set_color(color)
+
+            yield x, y, text
 
 
 class UsageError(Exception):
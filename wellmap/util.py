@@ -4,6 +4,8 @@ import re
 import string
 import functools
 import contextlib
+import numpy as np
+import pandas as pd
 
 from difflib import get_close_matches
 from copy import deepcopy
@@ -20,22 +22,16 @@ def require_well_locations(df):
     if 'row_i' in df:
         rows_i = df['row_i']
     elif 'row' in df:
-        rows_i = df['row'].map(i_from_row)
+        rows_i = i_from_rows(df['row'])
 
     if 'col_j' in df:
         cols_j = df['col_j']
     elif 'col' in df:
-        cols_j = df['col'].map(j_from_col)
+        cols_j = j_from_cols(df['col'])
 
     for well in ['well', 'well0']:
         if well in df and still_missing_locs():
-            ij = df.apply(
-                    lambda x: ij_from_well(x[well]),
-                    axis=1,
-                    result_type='expand',
-            )
-            rows_i = ij[0]
-            cols_j = ij[1]
+            rows_i, cols_j = ij_from_wells(df[well])
 
     if still_missing_locs():
         raise LayoutError(f"Can't find well locations.\nData frame must have 1-2 of the following columns: 'well', 'well0', 'row', 'col', 'row_i', 'col_j'\nColumns found: {quoted_join(df.columns)}")
@@ -63,6 +59,20 @@ def require_well_locations(df):
     return df
 
 
+# Every row name with one or two letters, i.e. rows 'A' to 'ZZ'.  This is far 
+# more than any real plate has (a 3456-well plate has 48 rows), so nearly every 
+# row conversion can be a simple table lookup.
+ROW_NAMES = tuple(
+        a + b
+        for a in ['', *string.ascii_uppercase]
+        for b in string.ascii_uppercase
+)
+ROW_INDICES = {
+        **{row: i for i, row in enumerate(ROW_NAMES)},
+        **{row.lower(): i for i, row in enumerate(ROW_NAMES)},
+}
+WELL_PATTERN = re.compile('([A-Za-z]+)([0-9]+)')
+
 def well_from_row_col(row, col):
     """
     Create a well name from the given row and column names.
@@ -138,6 +148,9 @@ def row_from_i(i):
     if i < 0:
         raise LayoutError("Cannot reference negative rows")
 
+    if i < len(ROW_NAMES):
+        return ROW_NAMES[i]
+
     row = ''
     N = len(string.ascii_uppercase)
 
@@ -178,6 +191,7 @@ def row_col_from_ij(i, j):
     """
     return row_from_i(i), col_from_j(j)
 
+@functools.lru_cache(maxsize=4096)
 def row_col_from_well(well):
     """
     Split row and column names out of the given well name.
@@ -191,7 +205,7 @@ def row_col_from_well(well):
 
     See also: :doc:`/well_formats`
     """
-    m = re.match('([A-Za-z]+)([0-9]+)', well)
+    m = WELL_PATTERN.match(well)
     if not m:
         raise LayoutError(f"Cannot parse well '{well}', expected 'A1', 'B2', etc.")
 
@@ -209,6 +223,11 @@ def i_from_row(row):
 
     See also: :doc:`/well_formats`
     """
+    try:
+        return ROW_INDICES[row]
+    except (KeyError, TypeError):
+        pass
+
     if not row.isalpha():
         raise LayoutError(f"Cannot parse row '{row}', expected letter(s) e.g. 'A', 'B', etc.")
 
@@ -243,6 +262,7 @@ def j_from_col(col):
 
     return int(col) - 1
 
+@functools.lru_cache(maxsize=4096)
 def ij_from_well(well):
     """
     Convert the given well name into row and column indices.
@@ -278,6 +298,286 @@ def ij_from_row_col(row, col):
     return i_from_row(row), j_from_col(col)
 
 
+def wells_from_row_cols(rows, cols):
+    """
+    Create well names from the given arrays of row and column names.
+
+    This is the array version of `well_from_row_col()`.  If *rows* is a pandas 
+    Series, the result will be too (with the same index).  Otherwise the 
+    result will be a numpy array.
+
+    Example::
+
+        >>> wells_from_row_cols(['A', 'B'], ['2', '02'])
+        array(['A2', 'B2'], dtype=object)
+
+    See also: :doc:`/well_formats`
+    """
+    cols = map_each(lambda col: str(int(col)), cols)
+    return series_like(rows, map_each(str, rows) + cols)
+
+def wells_from_ij(i, j):
+    """
+    Create well names from the given arrays of row and column indices.
+
+    This is the array version of `well_from_ij()`.  If *i* is a pandas Series, 
+    the result will be too (with the same index).  Otherwise the result will 
+    be a numpy array.
+
+    Example::
+
+        >>> wells_from_ij([0, 1], [1, 1])
+        array(['A2', 'B2'], dtype=object)
+
+    See also: :doc:`/well_formats`
+    """
+    return series_like(i, map_each(row_from_i, i) + map_each(col_from_j, j))
+
+def well0s_from_wells(wells, digits=2):
+    """
+    Create zero-padded well names from the given array of well names.
+
+    This is the array version of `well0_from_well()`.  If *wells* is a pandas 
+    Series, the result will be too (with the same index).  Otherwise the 
+    result will be a numpy array.
+
+    Example::
+
+        >>> well0s_from_wells(['A2', 'B02'])
+        array(['A02', 'B02'], dtype=object)
+
+    See also: :doc:`/well_formats`
+    """
+    well0s = map_each(lambda well: well0_from_well(well, digits), wells)
+    return series_like(wells, well0s)
+
+def well0s_from_row_cols(rows, cols, digits=2):
+    """
+    Create zero-padded well names from the given arrays of row and column 
+    names.
+
+    This is the array version of `well0_from_row_col()`.  If *rows* is a 
+    pandas Series, the result will be too (with the same index).  Otherwise 
+    the result will be a numpy array.
+
+    Example::
+
+        >>> well0s_from_row_cols(['A', 'B'], ['2', '02'])
+        array(['A02', 'B02'], dtype=object)
+
+    See also: :doc:`/well_formats`
+    """
+    cols = map_each(lambda col: f'{int(col):0{digits}}', cols)
+    return series_like(rows, map_each(str, rows) + cols)
+
+def well0s_from_ij(i, j, digits=2):
+    """
+    Create zero-padded well names from the given arrays of row and column 
+    indices.
+
+    There is no scalar version of this function; use 
+    ``well0_from_well(well_from_ij(i, j))`` instead.  If *i* is a pandas 
+    Series, the result will be too (with the same index).  Otherwise the 
+    result will be a numpy array.
+
+    Example::
+
+        >>> well0s_from_ij([0, 1], [1, 1])
+        array(['A02', 'B02'], dtype=object)
+
+    See also: :doc:`/well_formats`
+    """
+    return well0s_from_row_cols(*row_cols_from_ij(i, j), digits=digits)
+
+def rows_from_i(i):
+    """
+    Convert the given array of indices into row names.
+
+    This is the array version of `row_from_i()`.  If *i* is a pandas Series, 
+    the result will be too (with the same index).  Otherwise the result will 
+    be a numpy array.
+
+    Example::
+
+        >>> rows_from_i([0, 26])
+        array(['A', 'AA'], dtype=object)
+
+    See also: :doc:`/well_formats`
+    """
+    return series_like(i, map_each(row_from_i, i))
+
+def cols_from_j(j):
+    """
+    Convert the given array of indices into column names.
+
+    This is the array version of `col_from_j()`.  If *j* is a pandas Series, 
+    the result will be too (with the same index).  Otherwise the result will 
+    be a numpy array.
+
+    Example::
+
+        >>> cols_from_j([0, 1])
+        array(['1', '2'], dtype=object)
+
+    See also: :doc:`/well_formats`
+    """
+    return series_like(j, map_each(col_from_j, j))
+
+def row_cols_from_ij(i, j):
+    """
+    Convert the given arrays of indices into arrays of row and column names.
+
+    This is the array version of `row_col_from_ij()`.  If *i* and *j* are 
+    pandas Series, the results will be too (with the same indices).  Otherwise 
+    the results will be numpy arrays.
+
+    Example::
+
+        >>> row_cols_from_ij([0, 1], [1, 1])
+        (array(['A', 'B'], dtype=object), array(['2', '2'], dtype=object))
+
+    See also: :doc:`/well_formats`
+    """
+    return rows_from_i(i), cols_from_j(j)
+
+def row_cols_from_wells(wells):
+    """
+    Split arrays of row and column names out of the given array of well names.
+
+    This is the array version of `row_col_from_well()`.  If *wells* is a 
+    pandas Series, the results will be too (with the same index).  Otherwise 
+    the results will be numpy arrays.
+
+    Example::
+
+        >>> row_cols_from_wells(['A2', 'B02'])
+        (array(['A', 'B'], dtype=object), array(['2', '2'], dtype=object))
+
+    See also: :doc:`/well_formats`
+    """
+    codes, row_cols = map_distinct(row_col_from_well, wells)
+    rows = object_array([row for row, col in row_cols])
+    cols = object_array([col for row, col in row_cols])
+    return series_like(wells, rows[codes]), series_like(wells, cols[codes])
+
+def i_from_rows(rows):
+    """
+    Convert the given array of row names into indices.
+
+    This is the array version of `i_from_row()`.  If *rows* is a pandas 
+    Series, the result will be too (with the same index).  Otherwise the 
+    result will be a numpy array.
+
+    Example::
+
+        >>> i_from_rows(['A', 'B', 'A'])
+        array([0, 1, 0])
+
+    See also: :doc:`/well_formats`
+    """
+    codes, i = map_distinct(i_from_row, rows)
+    return series_like(rows, np.array(i, dtype=int)[codes])
+
+def j_from_cols(cols):
+    """
+    Convert the given array of column names into indices.
+
+    This is the array version of `j_from_col()`.  If *cols* is a pandas 
+    Series, the result will be too (with the same index).  Otherwise the 
+    result will be a numpy array.
+
+    Example::
+
+        >>> j_from_cols(['1', '02', '1'])
+        array([0, 1, 0])
+
+    See also: :doc:`/well_formats`
+    """
+    codes, j = map_distinct(j_from_col, cols)
+    return series_like(cols, np.array(j, dtype=int)[codes])
+
+def ij_from_wells(wells):
+    """
+    Convert the given array of well names into arrays of row and column 
+    indices.
+
+    This is the array version of `ij_from_well()`.  If *wells* is a pandas 
+    Series, the results will be too (with the same index).  Otherwise the 
+    results will be numpy arrays.
+
+    Example::
+
+        >>> ij_from_wells(['A1', 'A02', 'B1'])
+        (array([0, 0, 1]), array([0, 1, 0]))
+
+    See also: :doc:`/well_formats`
+    """
+    codes, ij = map_distinct(ij_from_well, wells)
+    ij = np.array(ij, dtype=int).reshape(-1, 2)
+    return series_like(wells, ij[codes, 0]), series_like(wells, ij[codes, 1])
+
+def ij_from_row_cols(rows, cols):
+    """
+    Convert the given arrays of row and column names into arrays of indices.
+
+    This is the array version of `ij_from_row_col()`.  If *rows* and *cols* 
+    are pandas Series, the results will be too (with the same indices).  
+    Otherwise the results will be numpy arrays.
+
+    Example::
+
+        >>> ij_from_row_cols(['A', 'B'], ['2', '02'])
+        (array([0, 1]), array([1, 1]))
+
+    See also: :doc:`/well_formats`
+    """
+    return i_from_rows(rows), j_from_cols(cols)
+
+def map_distinct(f, values):
+    """
+    Call the given function once for each distinct value.
+
+    Return an array with the position of each value in the list of distinct 
+    values, and a list of the function's return values.  Missing values (e.g.  
+    None, NaN) are passed to the function like any other value.
+    """
+    values = np.asarray(values, dtype=object)
+    codes, uniques = pd.factorize(values)
+    results = [f(x) for x in uniques]
+
+    is_missing = codes < 0
+    if is_missing.any():
+        results.append(f(values[is_missing][0]))
+        codes[is_missing] = len(uniques)
+
+    return codes, results
+
+def map_each(f, values):
+    """
+    Call the given function on each value, but only once for each distinct 
+    value.  Return an object array of the results.
+    """
+    codes, results = map_distinct(f, values)
+    return object_array(results)[codes]
+
+def object_array(xs):
+    # Fill in the array by hand, so numpy doesn't try to interpret any tuple 
+    # or list values as extra dimensions.
+    array = np.empty(len(xs), dtype=object)
+    for i, x in enumerate(xs):
+        array[i] = x
+    return array
+
+def series_like(template, values):
+    """
+    Wrap the given array in a pandas Series, if the template is one.
+    """
+    if isinstance(template, pd.Series):
+        return pd.Series(values, index=template.index)
+    else:
+        return values
+
+
 def interleave(a, b):
     """
     Convert the given coordinates between "real" and "interleaved" space.
@@ -446,6 +746,84 @@ def iter_well_indices(pattern):
 
     yield from iter_indices(pattern, ij_from_well, ijs_from_range)
 
+@functools.lru_cache(maxsize=4096)
+def row_indices_from_pattern(pattern):
+    """
+    Return a tuple of all the row indices in the given pattern.
+
+    This gives the same indices as `iter_row_indices()`, but the result is 
+    cached, so parsing the same pattern again (e.g. from a file that is 
+    included by many layouts) is just a dictionary lookup.
+
+    Example::
+
+        >>> row_indices_from_pattern('A,C,...,G')
+        (0, 2, 4, 6)
+
+    See also: :doc:`/well_formats`
+    """
+    if isinstance(pattern, ShiftedPattern):
+        # If the original pattern is invalid, parse the shifted pattern so 
+        # that the error message refers to the pattern as it was shifted.
+        with contextlib.suppress(LayoutError):
+            indices = row_indices_from_pattern(pattern.pattern)
+            di, dj = pattern.shift
+            return tuple(i + di for i in indices)
+
+    return tuple(iter_row_indices(pattern))
+
+@functools.lru_cache(maxsize=4096)
+def col_indices_from_pattern(pattern):
+    """
+    Return a tuple of all the column indices in the given pattern.
+
+    This gives the same indices as `iter_col_indices()`, but the result is 
+    cached, so parsing the same pattern again (e.g. from a file that is 
+    included by many layouts) is just a dictionary lookup.
+
+    Example::
+
+        >>> col_indices_from_pattern('1,3,...,7')
+        (0, 2, 4, 6)
+
+    See also: :doc:`/well_formats`
+    """
+    if isinstance(pattern, ShiftedPattern):
+        # If the original pattern is invalid, parse the shifted pattern so 
+        # that the error message refers to the pattern as it was shifted.
+        with contextlib.suppress(LayoutError):
+            indices = col_indices_from_pattern(pattern.pattern)
+            di, dj = pattern.shift
+            return tuple(j + dj for j in indices)
+
+    return tuple(iter_col_indices(pattern))
+
+@functools.lru_cache(maxsize=4096)
+def well_indices_from_pattern(pattern):
+    """
+    Return a tuple of all the well indices in the given pattern.
+
+    This gives the same indices as `iter_well_indices()`, but the result is 
+    cached, so parsing the same pattern again (e.g. from a file that is 
+    included by many layouts) is just a dictionary lookup.
+
+    Example::
+
+        >>> well_indices_from_pattern('A1-B2')
+        ((0, 0), (0, 1), (1, 0), (1, 1))
+
+    See also: :doc:`/well_formats`
+    """
+    if isinstance(pattern, ShiftedPattern):
+        # If the original pattern is invalid, parse the shifted pattern so 
+        # that the error message refers to the pattern as it was shifted.
+        with contextlib.suppress(LayoutError):
+            indices = well_indices_from_pattern(pattern.pattern)
+            di, dj = pattern.shift
+            return tuple((i + di, j + dj) for i, j in indices)
+
+    return tuple(iter_well_indices(pattern))
+
 
 def check_range(x0, x1, xn, single_step_ok=False):
     """
@@ -531,6 +909,7 @@ def shift_row_col(row_col, shift):
 
     assert False
 
+@functools.lru_cache(maxsize=4096)
 def shift_pattern(pattern, shift):
     """
     Shift the given row/column/well/pattern by the given amount.
@@ -550,6 +929,36 @@ def shift_pattern(pattern, shift):
             for x in pattern.split(',')
     )
 
+class ShiftedPattern(str):
+    """
+    A pattern that has been shifted by `shift_pattern()`, and that remembers 
+    the original pattern and shift.
+
+    This compares equal to the shifted pattern string, so it can be used as a 
+    key anywhere the shifted pattern could be (e.g. when included layouts are 
+    merged).  But the indices of the pattern can be found by shifting the 
+    (cached) indices of the original pattern, rather than by parsing the 
+    shifted pattern from scratch.
+
+    The shifted text itself is still needed.  Included layouts are merged 
+    into the layouts that include them key-by-key, and a shifted key has to 
+    hash and compare equal to the same pattern written directly in the 
+    including layout (e.g. ``[well.A1]`` shifted by one row and column has to 
+    merge with ``[well.B2]``), otherwise the wrong values would take 
+    precedence.  The text is also what error messages refer to.  It's only 
+    built once for each pattern and shift (see `shift_pattern()`), and it's 
+    never parsed again.
+    """
+
+    def __new__(cls, pattern, shift):
+        self = super().__new__(cls, shift_pattern(pattern, shift))
+        self.pattern = str(pattern)
+        self.shift = shift
+        return self
+
+    def __getnewargs__(self):
+        return self.pattern, self.shift
+
 def add_shifts(a, b):
     (a1, a2), (b1, b2) = a, b
     return a1 + b1, a2 + b2